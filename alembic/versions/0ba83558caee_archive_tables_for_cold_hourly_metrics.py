@@ -0,0 +1,74 @@
+"""archive tables for cold hourly metrics
+
+Revision ID: 0ba83558caee
+Revises: 3aae3a279598
+Create Date: 2026-10-19 18:31:27.604118
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0ba83558caee'
+down_revision: Union[str, Sequence[str], None] = '3aae3a279598'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Value columns of each hourly table with their array element type
+HOURLY_TABLES = {
+    "activity_steps": [("steps", sa.Integer)],
+    "activity_miles": [("miles", sa.Float), ("activity_type", sa.String)],
+    "body_heartrate": [
+        ("heart_rate", sa.Integer),
+        ("min_hr", sa.Integer),
+        ("avg_hr", sa.Float),
+        ("max_hr", sa.Integer),
+        ("resting_hr", sa.Integer),
+        ("heart_rate_variability", sa.Float),
+    ],
+    "calories_active": [("calories_burned", sa.Float)],
+    "calories_baseline": [("baseline_calories", sa.Float), ("bmr", sa.Float)],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One row per user, UTC day and source; app/db/archive.py fills them
+    for table, values in HOURLY_TABLES.items():
+        op.create_table(
+            f"{table}_archive",
+            sa.Column("user_key", sa.BigInteger(), nullable=False),
+            sa.Column("date_day", sa.Date(), nullable=False),
+            sa.Column("source", postgresql.ENUM(name="datasource", create_type=False), nullable=False),
+            sa.Column("hour_mask", sa.Integer(), nullable=False),
+            *[sa.Column(name, postgresql.ARRAY(type_()), nullable=False) for name, type_ in values],
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(
+                ["user_key"], ["auth_users.user_key"], name=f"fk_{table}_archive_user_key"
+            ),
+            sa.PrimaryKeyConstraint("user_key", "date_day", "source", name=f"{table}_archive_pkey"),
+            sa.UniqueConstraint("id", name=f"uq_{table}_archive_id"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived hours go back to the hourly tables, keeping their "<day id>.<HH>" ids
+    for table, values in HOURLY_TABLES.items():
+        columns = ", ".join(name for name, _ in values)
+        unpacked = ", ".join(f"a.{name}[h + 1]" for name, _ in values)
+        op.execute(
+            f"INSERT INTO {table} (user_key, date_hour, source, {columns}, id, created_at, updated_at) "
+            f"SELECT a.user_key, (a.date_day + make_interval(hours => h)) AT TIME ZONE 'UTC', a.source, "
+            f"{unpacked}, a.id || '.' || lpad(h::text, 2, '0'), a.created_at, a.updated_at "
+            f"FROM {table}_archive a CROSS JOIN generate_series(0, 23) AS h "
+            f"WHERE a.hour_mask & (1 << h) <> 0 "
+            f"ON CONFLICT (user_key, date_hour, source) DO NOTHING"
+        )
+        op.drop_table(f"{table}_archive")
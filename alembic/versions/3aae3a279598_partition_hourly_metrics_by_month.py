@@ -0,0 +1,138 @@
+"""partition hourly metrics by month
+
+Revision ID: 3aae3a279598
+Revises: 87777169b4d2
+Create Date: 2026-10-19 17:48:12.530917
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3aae3a279598'
+down_revision: Union[str, Sequence[str], None] = '87777169b4d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Value columns of each hourly table, between source and id
+HOURLY_TABLES = {
+    "activity_steps": [("steps", sa.Integer)],
+    "activity_miles": [("miles", sa.Numeric), ("activity_type", sa.String)],
+    "body_heartrate": [
+        ("heart_rate", sa.Integer),
+        ("min_hr", sa.Integer),
+        ("avg_hr", sa.Numeric),
+        ("max_hr", sa.Integer),
+        ("resting_hr", sa.Integer),
+        ("heart_rate_variability", sa.Numeric),
+    ],
+    "calories_active": [("calories_burned", sa.Numeric)],
+    "calories_baseline": [("baseline_calories", sa.Numeric), ("bmr", sa.Numeric)],
+}
+
+# Partitions created past the current month; the app's maintainer keeps extending them
+MONTHS_AHEAD = 3
+
+
+def _datasource() -> postgresql.ENUM:
+    return postgresql.ENUM(name="datasource", create_type=False)
+
+
+def _columns(values: list) -> list:
+    return [
+        sa.Column("pk", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("user_key", sa.BigInteger(), nullable=False),
+        sa.Column("date_hour", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("source", _datasource(), nullable=False),
+        *[sa.Column(name, type_(), nullable=True) for name, type_ in values],
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _copy(source: str, table: str, values: list) -> None:
+    columns = ", ".join(["pk", "user_key", "date_hour", "source", *(name for name, _ in values), "id"])
+    op.execute(
+        f"INSERT INTO {table} ({columns}, created_at, updated_at) "
+        f"SELECT {columns}, created_at, updated_at FROM {source} ORDER BY user_key, date_hour"
+    )
+    # Rows keep their pk, so move the identity past them
+    op.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'pk'), coalesce(max(pk), 0) + 1, false) FROM {table}"
+    )
+
+
+def _constrain(table: str, values: list, primary_key: list) -> None:
+    op.create_primary_key(f"{table}_pkey", table, primary_key)
+    op.create_unique_constraint(
+        f"uq_{table}_user_key_date_hour_source", table, ["user_key", "date_hour", "source"]
+    )
+    op.create_foreign_key(f"fk_{table}_user_key", table, "auth_users", ["user_key"], ["user_key"])
+    op.create_index(
+        f"ix_{table}_user_key_date_hour",
+        table,
+        ["user_key", sa.text("date_hour DESC")],
+        postgresql_include=["source", *(name for name, _ in values)],
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Copy-and-swap like d34716e78283: each table is loaded into a parent
+    # partitioned by month on date_hour and constrained after the load. It holds
+    # an exclusive lock throughout, so run it in a maintenance window. Every
+    # unique constraint has to include the partition key, so the primary key
+    # becomes (pk, date_hour) and id is indexed but no longer unique-constrained;
+    # RIDs are unique by construction.
+    bind = op.get_bind()
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    for table, values in HOURLY_TABLES.items():
+        op.rename_table(table, f"{table}_old")
+        op.execute(f"ALTER SEQUENCE {table}_pk_seq RENAME TO {table}_old_pk_seq")
+        op.create_table(table, *_columns(values), postgresql_partition_by="RANGE (date_hour)")
+
+        first = bind.execute(sa.text(f"SELECT min(date_hour) FROM {table}_old")).scalar()
+        month = first.astimezone(timezone.utc).date().replace(day=1) if first else current
+        while month <= _add_months(current, MONTHS_AHEAD):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_months(month, 1))})"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        _copy(f"{table}_old", table, values)
+        op.drop_table(f"{table}_old")
+        _constrain(table, values, ["pk", "date_hour"])
+        op.create_index(f"ix_{table}_id", table, ["id"], unique=False)
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only rows in attached partitions come back; partitions detached for
+    # retention stay behind as standalone tables.
+    for table, values in HOURLY_TABLES.items():
+        op.rename_table(table, f"{table}_partitioned")
+        op.execute(f"ALTER SEQUENCE {table}_pk_seq RENAME TO {table}_partitioned_pk_seq")
+        op.create_table(table, *_columns(values))
+        _copy(f"{table}_partitioned", table, values)
+        op.drop_table(f"{table}_partitioned")
+        _constrain(table, values, ["pk"])
+        op.create_unique_constraint(f"uq_{table}_id", table, ["id"])
+        op.execute(f"ANALYZE {table}")
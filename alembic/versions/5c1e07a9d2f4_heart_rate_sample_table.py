@@ -0,0 +1,44 @@
+"""heart rate sample table
+
+Revision ID: 5c1e07a9d2f4
+Revises: 0ba83558caee
+Create Date: 2026-10-19 20:12:48.331906
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e07a9d2f4'
+down_revision: Union[str, Sequence[str], None] = '0ba83558caee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One row per user, hour and source holding delta-encoded raw readings
+    op.create_table(
+        "body_heartrate_samples",
+        sa.Column("user_key", sa.BigInteger(), nullable=False),
+        sa.Column("date_hour", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("source", postgresql.ENUM(name="datasource", create_type=False), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("offset_deltas", postgresql.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column("bpm_deltas", postgresql.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_key"], ["auth_users.user_key"], name="fk_body_heartrate_samples_user_key"
+        ),
+        sa.PrimaryKeyConstraint("user_key", "date_hour", "source", name="body_heartrate_samples_pkey"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("body_heartrate_samples")
@@ -0,0 +1,110 @@
+"""covering indexes for metric range reads
+
+Revision ID: 87777169b4d2
+Revises: d34716e78283
+Create Date: 2026-10-19 17:05:43.902215
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '87777169b4d2'
+down_revision: Union[str, Sequence[str], None] = 'd34716e78283'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, owner column, time column, included value columns)
+COVERING_INDEXES = [
+    ("ix_activity_steps_user_key_date_hour", "activity_steps", "user_key", "date_hour", ["source", "steps"]),
+    (
+        "ix_activity_miles_user_key_date_hour",
+        "activity_miles",
+        "user_key",
+        "date_hour",
+        ["source", "miles", "activity_type"],
+    ),
+    (
+        "ix_body_heartrate_user_key_date_hour",
+        "body_heartrate",
+        "user_key",
+        "date_hour",
+        ["source", "heart_rate", "min_hr", "avg_hr", "max_hr", "resting_hr", "heart_rate_variability"],
+    ),
+    (
+        "ix_calories_active_user_key_date_hour",
+        "calories_active",
+        "user_key",
+        "date_hour",
+        ["source", "calories_burned"],
+    ),
+    (
+        "ix_calories_baseline_user_key_date_hour",
+        "calories_baseline",
+        "user_key",
+        "date_hour",
+        ["source", "baseline_calories", "bmr"],
+    ),
+    (
+        "ix_body_composition_user_date_hour",
+        "body_composition",
+        "user_id",
+        "date_hour",
+        ["source", "weight", "body_fat_percentage", "muscle_mass_percentage"],
+    ),
+    (
+        "ix_sleep_daily_user_date_day",
+        "sleep_daily",
+        "user_id",
+        "date_day",
+        [
+            "source",
+            "total_sleep_minutes",
+            "deep_sleep_minutes",
+            "light_sleep_minutes",
+            "rem_sleep_minutes",
+            "sleep_efficiency",
+        ],
+    ),
+    (
+        "ix_activity_workouts_user_date",
+        "activity_workouts",
+        "user_id",
+        "date",
+        ["source", "workout_type", "duration_minutes", "calories_burned"],
+    ),
+]
+
+# Plain indexes on id that only duplicate the primary key
+REDUNDANT_ID_INDEXES = ["body_composition", "sleep_daily", "activity_workouts"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so ingestion is not blocked on large tables. Index-only
+    # scans also need the visibility map, which autovacuum keeps current.
+    with op.get_context().autocommit_block():
+        for name, table, owner, time_column, include in COVERING_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [owner, sa.text(f"{time_column} DESC")],
+                postgresql_include=include,
+                postgresql_concurrently=True,
+            )
+        for table in REDUNDANT_ID_INDEXES:
+            op.drop_index(op.f(f"ix_{table}_id"), table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in REDUNDANT_ID_INDEXES:
+            op.create_index(
+                op.f(f"ix_{table}_id"), table, ["id"], unique=False, postgresql_concurrently=True
+            )
+        for name, table, *_ in reversed(COVERING_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
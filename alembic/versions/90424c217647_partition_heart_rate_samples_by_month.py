@@ -0,0 +1,93 @@
+"""partition heart rate samples by month
+
+Revision ID: 90424c217647
+Revises: 5c1e07a9d2f4
+Create Date: 2026-10-19 23:41:07.214518
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90424c217647'
+down_revision: Union[str, Sequence[str], None] = '5c1e07a9d2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "body_heartrate_samples"
+COLUMNS = "user_key, date_hour, source, sample_count, offset_deltas, bpm_deltas, created_at, updated_at"
+
+# Partitions created past the current month; the app's maintainer keeps extending them
+MONTHS_AHEAD = 3
+
+
+def _columns() -> list:
+    return [
+        sa.Column("user_key", sa.BigInteger(), nullable=False),
+        sa.Column("date_hour", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("source", postgresql.ENUM(name="datasource", create_type=False), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("offset_deltas", postgresql.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column("bpm_deltas", postgresql.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _swap(old: str) -> None:
+    op.execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {old} ORDER BY user_key, date_hour")
+    op.drop_table(old)
+    op.create_primary_key(f"{TABLE}_pkey", TABLE, ["user_key", "date_hour", "source"])
+    op.create_foreign_key(f"fk_{TABLE}_user_key", TABLE, "auth_users", ["user_key"], ["user_key"])
+    op.execute(f"ANALYZE {TABLE}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Copy-and-swap like 3aae3a279598, so METRIC_RETENTION_MONTHS detaches old
+    # months of raw samples along with the hourly tables. The primary key
+    # already includes date_hour, so it carries over unchanged.
+    bind = op.get_bind()
+    op.rename_table(TABLE, f"{TABLE}_old")
+    op.execute(f"ALTER TABLE {TABLE}_old RENAME CONSTRAINT {TABLE}_pkey TO {TABLE}_old_pkey")
+    op.execute(f"ALTER TABLE {TABLE}_old RENAME CONSTRAINT fk_{TABLE}_user_key TO fk_{TABLE}_old_user_key")
+    op.create_table(TABLE, *_columns(), postgresql_partition_by="RANGE (date_hour)")
+
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    first = bind.execute(sa.text(f"SELECT min(date_hour) FROM {TABLE}_old")).scalar()
+    month = first.astimezone(timezone.utc).date().replace(day=1) if first else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_months(month, 1))})"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    _swap(f"{TABLE}_old")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only rows in attached partitions come back; partitions detached for
+    # retention stay behind as standalone tables.
+    op.rename_table(TABLE, f"{TABLE}_partitioned")
+    op.execute(f"ALTER TABLE {TABLE}_partitioned RENAME CONSTRAINT {TABLE}_pkey TO {TABLE}_partitioned_pkey")
+    op.execute(
+        f"ALTER TABLE {TABLE}_partitioned RENAME CONSTRAINT fk_{TABLE}_user_key TO fk_{TABLE}_partitioned_user_key"
+    )
+    op.create_table(TABLE, *_columns())
+    _swap(f"{TABLE}_partitioned")
@@ -0,0 +1,44 @@
+"""keep original ids of archived hours
+
+Revision ID: cf8fdd36d33a
+Revises: 90424c217647
+Create Date: 2026-10-20 00:12:48.530917
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cf8fdd36d33a'
+down_revision: Union[str, Sequence[str], None] = '90424c217647'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ARCHIVE_TABLES = [
+    "activity_steps_archive",
+    "activity_miles_archive",
+    "body_heartrate_archive",
+    "calories_active_archive",
+    "calories_baseline_archive",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Id each hour had before archiving, so it keeps resolving. Days archived
+    # before this revision have no record of them and stay NULL: their hours
+    # keep the "<day id>.<HH>" ids they were already exposed under.
+    for table in ARCHIVE_TABLES:
+        op.add_column(table, sa.Column("hour_ids", postgresql.ARRAY(sa.String()), nullable=True))
+        op.create_index(f"ix_{table}_hour_ids", table, ["hour_ids"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ARCHIVE_TABLES:
+        op.drop_index(f"ix_{table}_hour_ids", table_name=table)
+        op.drop_column(table, "hour_ids")
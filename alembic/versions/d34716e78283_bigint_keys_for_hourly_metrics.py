@@ -0,0 +1,126 @@
+"""bigint keys for hourly metrics
+
+Revision ID: d34716e78283
+Revises: e83f6e983d1d
+Create Date: 2026-10-19 16:20:05.114372
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd34716e78283'
+down_revision: Union[str, Sequence[str], None] = 'e83f6e983d1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Value columns of each hourly table, between date_hour and source
+HOURLY_TABLES = {
+    "activity_steps": [("steps", sa.Integer)],
+    "activity_miles": [("miles", sa.Numeric), ("activity_type", sa.String)],
+    "body_heartrate": [
+        ("heart_rate", sa.Integer),
+        ("min_hr", sa.Integer),
+        ("avg_hr", sa.Numeric),
+        ("max_hr", sa.Integer),
+        ("resting_hr", sa.Integer),
+        ("heart_rate_variability", sa.Numeric),
+    ],
+    "calories_active": [("calories_burned", sa.Numeric)],
+    "calories_baseline": [("baseline_calories", sa.Numeric), ("bmr", sa.Numeric)],
+}
+
+# activity_steps lost its redundant id index in d4f654223e61
+TABLES_WITH_ID_INDEX = {"activity_miles", "body_heartrate", "calories_active", "calories_baseline"}
+
+
+def _datasource() -> postgresql.ENUM:
+    return postgresql.ENUM(name="datasource", create_type=False)
+
+
+def _timestamps() -> list:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Identity columns are filled for existing rows when added
+    op.add_column(
+        "auth_users",
+        sa.Column("user_key", sa.BigInteger(), sa.Identity(), nullable=False),
+    )
+    op.create_unique_constraint("uq_auth_users_user_key", "auth_users", ["user_key"])
+
+    # Each table is copied into its new layout in (user_key, date_hour) order and
+    # constrained after the load: much faster than rewriting it in place several
+    # times and leaves no bloat, but it holds an exclusive lock throughout, so
+    # run it in a maintenance window. The fixed-width columns come first to
+    # avoid alignment padding.
+    for table, values in HOURLY_TABLES.items():
+        op.rename_table(table, f"{table}_old")
+        op.create_table(
+            table,
+            sa.Column("pk", sa.BigInteger(), sa.Identity(), nullable=False),
+            sa.Column("user_key", sa.BigInteger(), nullable=False),
+            sa.Column("date_hour", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("source", _datasource(), nullable=False),
+            *[sa.Column(name, type_(), nullable=True) for name, type_ in values],
+            sa.Column("id", sa.String(), nullable=False),
+            *_timestamps(),
+        )
+        columns = ", ".join(name for name, _ in values)
+        old_columns = ", ".join(f"o.{name}" for name, _ in values)
+        op.execute(
+            f"INSERT INTO {table} (user_key, date_hour, source, {columns}, id, created_at, updated_at) "
+            f"SELECT u.user_key, o.date_hour, o.source, {old_columns}, o.id, o.created_at, o.updated_at "
+            f"FROM {table}_old o JOIN auth_users u ON u.id = o.user_id "
+            f"ORDER BY u.user_key, o.date_hour"
+        )
+        op.drop_table(f"{table}_old")
+        op.create_primary_key(f"{table}_pkey", table, ["pk"])
+        op.create_unique_constraint(f"uq_{table}_id", table, ["id"])
+        op.create_unique_constraint(
+            f"uq_{table}_user_key_date_hour_source", table, ["user_key", "date_hour", "source"]
+        )
+        op.create_foreign_key(f"fk_{table}_user_key", table, "auth_users", ["user_key"], ["user_key"])
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, values in HOURLY_TABLES.items():
+        op.rename_table(table, f"{table}_new")
+        op.create_table(
+            table,
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("date_hour", sa.DateTime(timezone=True), nullable=False),
+            *[sa.Column(name, type_(), nullable=True) for name, type_ in values],
+            sa.Column("source", _datasource(), nullable=False),
+            *_timestamps(),
+        )
+        columns = ", ".join(name for name, _ in values)
+        new_columns = ", ".join(f"n.{name}" for name, _ in values)
+        op.execute(
+            f"INSERT INTO {table} (id, user_id, date_hour, {columns}, source, created_at, updated_at) "
+            f"SELECT n.id, u.id, n.date_hour, {new_columns}, n.source, n.created_at, n.updated_at "
+            f"FROM {table}_new n JOIN auth_users u ON u.user_key = n.user_key"
+        )
+        op.drop_table(f"{table}_new")
+        op.create_primary_key(f"{table}_pkey", table, ["id"])
+        op.create_unique_constraint(
+            f"{table}_user_id_date_hour_source_key", table, ["user_id", "date_hour", "source"]
+        )
+        op.create_foreign_key(f"{table}_user_id_fkey", table, "auth_users", ["user_id"], ["id"])
+        if table in TABLES_WITH_ID_INDEX:
+            op.create_index(op.f(f"ix_{table}_id"), table, ["id"], unique=False)
+
+    op.drop_constraint("uq_auth_users_user_key", "auth_users", type_="unique")
+    op.drop_column("auth_users", "user_key")
@@ -0,0 +1,63 @@
+"""add chat message full text search
+
+Revision ID: da7fdea3ec32
+Revises: ed2fa8a61aa1
+Create Date: 2026-10-19 10:03:17.552190
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'da7fdea3ec32'
+down_revision: Union[str, Sequence[str], None] = 'ed2fa8a61aa1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites chat_messages once; run off-peak on large tables
+    op.add_column(
+        "chat_messages",
+        sa.Column(
+            "content_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', content)", persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_messages_content_tsv",
+            "chat_messages",
+            ["content_tsv"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_chat_messages_user_id",
+            "chat_messages",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_chat_messages_user_id",
+            table_name="chat_messages",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_chat_messages_content_tsv",
+            table_name="chat_messages",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("chat_messages", "content_tsv")
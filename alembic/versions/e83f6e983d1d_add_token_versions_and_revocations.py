@@ -0,0 +1,57 @@
+"""add token versions and revocations
+
+Revision ID: e83f6e983d1d
+Revises: 766fce2103ce
+Create Date: 2026-10-19 14:02:41.318207
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83f6e983d1d'
+down_revision: Union[str, Sequence[str], None] = '766fce2103ce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "auth_users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "auth_token_revocations",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("token_version", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "token_version", name="uq_auth_token_revocations_user_version"
+        ),
+    )
+    op.create_index(
+        "ix_auth_token_revocations_expires_at",
+        "auth_token_revocations",
+        ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_auth_token_revocations_expires_at", table_name="auth_token_revocations"
+    )
+    op.drop_table("auth_token_revocations")
+    op.drop_column("auth_users", "token_version")
@@ -0,0 +1,51 @@
+"""add chat sidebar indexes
+
+Revision ID: ed2fa8a61aa1
+Revises: e520ac8236d9
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed2fa8a61aa1'
+down_revision: Union[str, Sequence[str], None] = 'e520ac8236d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so existing chat traffic is not blocked on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_messages_conversation_created",
+            "chat_messages",
+            ["conversation_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_conversations_user_created",
+            "conversations",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_conversations_user_created",
+            table_name="conversations",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_chat_messages_conversation_created",
+            table_name="chat_messages",
+            postgresql_concurrently=True,
+        )
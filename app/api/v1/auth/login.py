@@ -1,14 +1,14 @@
 import logging
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
 from app.schemas.auth.user import (
     AuthEnvelopeOut,
+    AuthPrincipal,
     Token,
     UserCreate,
     UserLogin,
@@ -17,6 +17,9 @@ from app.schemas.auth.user import (
 from app.services.auth_service import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     AuthService,
+    build_token_claims,
+    enforce_login_rate_limit,
+    get_client_ip,
     get_current_active_user,
 )
 
@@ -34,17 +37,26 @@ router = APIRouter(prefix="", tags=["auth-login"])
         400: {"description": "Invalid input"},
         401: {"description": "Incorrect email or password"},
         422: {"description": "Validation error"},
-        500: {"description": "Internal server error"}
+        429: {"description": "Too many login attempts"},
+        500: {"description": "Internal server error"},
+        503: {"description": "Authentication overloaded, retry later"}
     }
 )
 async def login(
     payload: UserLogin,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     logger.info(f"Attempting login for user: {payload.email}")
+    client_ip = get_client_ip(request)
+    try:
+        enforce_login_rate_limit(client_ip, payload.email)
+    except HTTPException:
+        logger.warning(f"Login throttled for user: {payload.email} from {client_ip}")
+        raise
     auth_service = AuthService(db)
     try:
-        user = auth_service.authenticate_user(payload.email, payload.password)
+        user = await auth_service.authenticate_user(payload.email, payload.password)
         if not user:
             logger.warning(f"Failed login attempt for user: {payload.email}")
             raise HTTPException(
@@ -54,7 +66,7 @@ async def login(
             )
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = auth_service.create_access_token(
-            data={"sub": user.id}, expires_delta=access_token_expires
+            data=build_token_claims(user), expires_delta=access_token_expires
         )
         logger.info(f"Successful login for user: {user.email}")
         return {"access_token": access_token, "token_type": "bearer", "user": user}
@@ -89,7 +101,8 @@ async def login(
         201: {"description": "User account created successfully"},
         400: {"description": "Email already registered or invalid input"},
         422: {"description": "Validation error"},
-        500: {"description": "Internal server error"}
+        500: {"description": "Internal server error"},
+        503: {"description": "Authentication overloaded, retry later"}
     }
 )
 async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
@@ -105,17 +118,19 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
-        user = auth_service.create_user(
+        user = await auth_service.create_user(
             email=user_data.email,
             password=user_data.password,
             full_name=user_data.full_name
         )
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = auth_service.create_access_token(
-            data={"sub": user.id}, expires_delta=access_token_expires
+            data=build_token_claims(user), expires_delta=access_token_expires
         )
         logger.info(f"Successful signup for user: {user.email}")
         return {"access_token": access_token, "token_type": "bearer", "user": user}
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Value error during signup: {str(e)}")
         raise HTTPException(
@@ -149,16 +164,26 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     }
 )
 async def refresh_access_token(
-    current_user: AuthUser = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    current_user: AuthPrincipal = Depends(get_current_active_user), db: Session = Depends(get_db)):
     logger.info(f"Token refresh requested for user: {current_user.email}")
     auth_service = AuthService(db)
     try:
+        # Re-read the user so the new token carries current claims, not the old token's
+        user = auth_service.get_user_by_id(current_user.id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = auth_service.create_access_token(
-            data={"sub": current_user.email}, expires_delta=access_token_expires
+            data=build_token_claims(user), expires_delta=access_token_expires
         )
         logger.info(f"Token refreshed successfully for user: {current_user.email}")
         return {"access_token": access_token, "token_type": "bearer"}
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Value error during token refresh: {str(e)}")
         raise HTTPException(
@@ -177,3 +202,29 @@ async def refresh_access_token(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error refreshing token",
         )
+
+
+@router.post("/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Revoke access tokens endpoint",
+    description="Revoke every access token issued to the current user",
+    responses={
+        204: {"description": "Tokens revoked"},
+        401: {"description": "Unauthorized"},
+        500: {"description": "Internal server error"}
+    }
+)
+async def logout(
+    current_user: AuthPrincipal = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    logger.info(f"Token revocation requested for user: {current_user.email}")
+    auth_service = AuthService(db)
+    try:
+        auth_service.revoke_tokens(current_user.id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during token revocation: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error revoking tokens",
+        )
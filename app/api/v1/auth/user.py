@@ -1,11 +1,10 @@
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
-from app.schemas.auth.user import UserResponse, UserUpdate, UserDeleteResponse
+from app.schemas.auth.user import AuthPrincipal, UserResponse, UserUpdate, UserDeleteResponse
 from app.services.auth_service import AuthService, get_current_active_user
 
 logger = logging.getLogger(__name__)
@@ -26,10 +25,15 @@ router = APIRouter(prefix="/user", tags=["auth-user"])
     }
 )
 async def get_current_user_profile(
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
     logger.info(f"User profile requested for: {current_user.email}")
-    return current_user
+    # Token claims can lag a profile edit, so read the stored profile
+    user = AuthService(db).get_user_by_id(current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
 
 
 @router.put("/",
@@ -45,7 +49,7 @@ async def get_current_user_profile(
 )
 async def update_user_profile(
     update_data: UserUpdate,
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     logger.info(f"User profile update requested for: {current_user.email}")
@@ -65,7 +69,7 @@ async def update_user_profile(
     }
 )
 async def delete_user_account(
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),    
 ):
     logger.info(f"User account deletion requested for: {current_user.email}")
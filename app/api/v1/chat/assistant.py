@@ -1,15 +1,24 @@
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, status, Depends
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
-from app.schemas.chat.assistant import ChatRequest, ChatResponse, ConversationResponse, MessageResponse
+from app.schemas.auth.user import AuthPrincipal
+from app.schemas.chat.assistant import (
+    ChatRequest,
+    ChatResponse,
+    ConversationListResponse,
+    MessageResponse,
+    MessageSearchResponse,
+)
 from app.services.openai_service import get_chat_completion
 from app.services.chat_service import ChatService
-from app.services.auth_service import get_current_user
+from app.services.health_digest_service import HealthDigestService
+from app.services.usage_service import QuotaStatus, usage_meter
+from app.services.auth_service import get_current_active_user, get_current_user
 
 
 logger = logging.getLogger(__name__)
@@ -24,22 +33,67 @@ SYSTEM_PROMPT = (
 router = APIRouter(prefix="/assistant", tags=["chat-assistant"])
 
 @router.get("/conversations",
-    response_model=list[ConversationResponse],
+    response_model=ConversationListResponse,
     summary="Get all conversations endpoint",
-    description="Get all conversations",
+    description="Get the user's conversations newest first, with the latest message preview and message count. "
+    "Pass `next_cursor` from the previous page as `cursor` to continue.",
     responses={
         200: {"description": "Conversations retrieved successfully"},
+        400: {"description": "Invalid cursor"},
         500: {"description": "Internal server error"},
     }
 )
 async def get_conversations(
+    limit: int = Query(
+        default=20, ge=1, le=100, description="Maximum number of conversations to return (default: 20, max: 100)"
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="Opaque cursor returned as next_cursor by the previous page"
+    ),
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_user),
 ):
     """Get all conversations"""
     chat_service = ChatService(db)
-    conversations = chat_service.get_all_conversations(current_user.id)
-    return conversations
+    try:
+        records, next_cursor = chat_service.list_conversation_summaries(current_user.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return ConversationListResponse(records=records, next_cursor=next_cursor)
+
+
+@router.get("/search",
+    response_model=MessageSearchResponse,
+    summary="Search chat history endpoint",
+    description="Full-text search over the user's chat messages, ranked by relevance with highlighted excerpts. "
+    "Supports web-search syntax: quoted phrases, OR and -exclusions.",
+    responses={
+        200: {"description": "Search results retrieved successfully"},
+        500: {"description": "Internal server error"},
+    }
+)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(
+        default=20, ge=1, le=50, description="Maximum number of results to return (default: 20, max: 50)"
+    ),
+    offset: int = Query(
+        default=0, ge=0, le=1000, description="Number of results to skip (default: 0)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user),
+):
+    """Search chat history"""
+    chat_service = ChatService(db)
+    try:
+        records, has_more = chat_service.search_messages(current_user.id, q, limit, offset)
+    except Exception as e:
+        logger.error(f"Error searching chat history for user {current_user.id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching chat history",
+        )
+    return MessageSearchResponse(query=q, records=records, has_more=has_more)
 
 
 @router.get("/conversations/{conversation_id}/messages",
@@ -54,7 +108,7 @@ async def get_conversations(
 async def get_messages(
     conversation_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_user),
 ):
     """Get all messages"""
     chat_service = ChatService(db)
@@ -68,19 +122,20 @@ async def get_messages(
     description="Chat with the AI assistant",
     responses={
         200: {"description": "Chat successful"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Inactive user"},
+        429: {"description": "Daily usage limit reached"},
         500: {"description": "Internal server error"},
     }
 )
 async def chat(
     request: ChatRequest,
     db: Session = Depends(get_db),
-    # current_user: AuthUser = Depends(get_current_user)
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> ChatResponse:
-
-
-    user_id = "123"
-    
     """Handle chat messages"""
+    user_id = current_user.id
+
     # Log the incoming chat request with timestamp
     timestamp = datetime.now(timezone.utc).isoformat()
     logger.info(
@@ -90,8 +145,14 @@ async def chat(
         f"[{timestamp}] Chat message content: {request.message[:100]}{'...' if len(request.message) > 100 else ''}"
     )
 
+    # Enforce token quotas before storing the message or calling the model
+    if usage_meter.check_quota(db, user_id) == QuotaStatus.HARD_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Daily assistant usage limit reached. Please try again later.",
+        )
+
     chat_service = ChatService(db)
-    # conversation = chat_service.get_or_create_conversation(current_user.id)
     conversation = chat_service.get_or_create_conversation(user_id)
 
     chat_service.add_message(
@@ -99,7 +160,6 @@ async def chat(
         content=request.message,
         role="user",
         user_id=user_id
-        # user_id=current_user.id
     )
 
 
@@ -107,11 +167,18 @@ async def chat(
         messages = chat_service.get_conversation_context(conversation.id)
         messages.insert(0, {"role": "system", "content": SYSTEM_PROMPT})
 
+        # Ground the reply in the user's own data; a single cache lookup on warm paths
+        health_digest = HealthDigestService(db).get_digest_text(user_id)
+        if health_digest:
+            messages.insert(1, {"role": "system", "content": health_digest})
+
 
         # Log that we're calling OpenAI
         logger.info(f"[{timestamp}] Calling OpenAI API for chat completion")
 
-        response = await get_chat_completion(messages)
+        response = await get_chat_completion(
+            messages, user_id=user_id, conversation_id=conversation.id
+        )
 
         # Log successful response
         if response is not None:
@@ -120,7 +187,6 @@ async def chat(
                 content=response,
                 role="assistant",
                 user_id=user_id
-                # user_id=current_user.id
             )            
             
             logger.info(
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.core.rid import generate_rid
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.models.goal.general import GoalGeneral
 from app.schemas.goal.general import (
     GoalGeneralBulkCreate,
@@ -35,7 +35,7 @@ router = APIRouter(prefix="/general", tags=["goal-general"])
 )
 async def get_general_goal(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get current user's general goal"""
     try:
@@ -76,7 +76,7 @@ async def get_general_goal(
 async def create_or_update_multiple_general_goals(
     bulk_data: GoalGeneralBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple general goals (bulk upsert)"""
     try:
@@ -109,7 +109,7 @@ async def create_or_update_multiple_general_goals(
 )
 async def delete_general_goal(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete current user's general goal"""
 
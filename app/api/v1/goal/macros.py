@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.models.goal.macros import GoalMacros
 from app.schemas.goal.macros import (
     GoalMacrosCreate,
@@ -36,7 +36,7 @@ router = APIRouter(prefix="/macros", tags=["goal-macros"])
 )
 async def get_macro_goal(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get macro goal for the user"""
     try:
@@ -75,7 +75,7 @@ async def get_macro_goal(
 async def create_or_update_macro_goal(
     goal_data: GoalMacrosCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update a macro goal"""
     try:
@@ -108,7 +108,7 @@ async def create_or_update_macro_goal(
 )
 async def delete_macro_goal(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete a specific macro goal"""
 
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.goal.user_goals import UserGoalCreateRequest, UserGoalRead
 from app.services.auth_service import get_current_active_user
 from app.services.user_goals_service import UserGoalService
@@ -28,7 +28,7 @@ router = APIRouter(prefix="/user-goals", tags=["user-goals"])
 )
 async def get_active_goal(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     goal_service = UserGoalService(db)
     goal = goal_service.get_active_goal(current_user.id)
@@ -50,7 +50,7 @@ async def get_active_goal(
 )
 async def list_goals(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     goal_service = UserGoalService(db)
     return goal_service.list_goals(current_user.id)
@@ -72,7 +72,7 @@ async def list_goals(
 async def create_goal(
     payload: UserGoalCreateRequest,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     goal_service = UserGoalService(db)
     try:
@@ -96,7 +96,7 @@ async def create_goal(
 async def delete_goal(
     goal_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     goal_service = UserGoalService(db)
     goal = goal_service.repository.get_by_id(goal_id)
@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+
+from app.api.v1.insights import trends
+
+# Create the insights router
+router = APIRouter(prefix="/insights")
+
+# Include all insights sub-routers
+router.include_router(trends.router)
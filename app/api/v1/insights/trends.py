@@ -0,0 +1,52 @@
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.schemas.auth.user import AuthPrincipal
+from app.schemas.insights.trends import MetricTrend, TrendMetric, TrendsResponse
+from app.services.auth_service import get_current_active_user
+from app.services.trend_service import TrendService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/trends", tags=["insights-trends"])
+
+
+@router.get("/",
+    response_model=TrendsResponse,
+    summary="Get metric trends endpoint",
+    description="Get rolling means, EWMA trends, z-score deviations and percentiles of daily metric series",
+    responses={
+        200: {"description": "Metric trends retrieved successfully"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Inactive user"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def get_trends(
+    metrics: Optional[List[TrendMetric]] = Query(None, description="Metrics to include (default: all)"),
+    days: int = Query(30, ge=1, le=365, description="Days of points to return"),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Get metric trends"""
+    try:
+        trend_service = TrendService(db)
+        trends = trend_service.get_trends(
+            current_user.id, [metric.value for metric in metrics] if metrics else None, days
+        )
+
+        return TrendsResponse(
+            user_id=str(current_user.id),
+            metrics=[MetricTrend.model_validate(trend) for trend in trends],
+        )
+
+    except Exception as e:
+        logger.error(f"Error retrieving metric trends: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve metric trends",
+        )
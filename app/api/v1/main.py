@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from app.api.v1.auth.main import router as auth_router
 from app.api.v1.chat.main import router as chat_router
 from app.api.v1.goal.main import router as goal_router
+from app.api.v1.insights.main import router as insights_router
 from app.api.v1.profile.main import router as profile_router
 from app.api.v1.metric.main import router as metric_router
 from app.api.v1.nutrition.main import router as nutrition_router
@@ -19,3 +20,4 @@ router.include_router(metric_router)
 router.include_router(nutrition_router)
 router.include_router(system_router)
 router.include_router(profile_router)
+router.include_router(insights_router)
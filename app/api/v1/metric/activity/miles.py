@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.rid import generate_rid
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.models.metric.activity.miles import ActivityMiles
 from app.schemas.metric.activity.miles import (
     ActivityMilesBulkCreate,
@@ -34,11 +34,11 @@ router = APIRouter(prefix="/miles", tags=["metric-miles"])
         500: {"description": "Internal server error"},
     }
 )
-async def get_activity_miles(
+def get_activity_miles(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get activity miles data"""
     try:
@@ -73,7 +73,7 @@ async def get_activity_miles(
 async def get_activity_mile_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get a specific activity miles record by ID"""
     try:
@@ -116,7 +116,7 @@ async def get_activity_mile_record(
 async def create_or_update_multiple_activity_miles_records(
     bulk_data: ActivityMilesBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple activity miles records (bulk upsert)"""
     try:
@@ -155,7 +155,7 @@ async def create_or_update_multiple_activity_miles_records(
 async def delete_activity_miles_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete an activity miles record"""
     try:
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.rid import generate_rid
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.models.metric.activity.steps import ActivitySteps
 from app.schemas.metric.activity.steps import (
     ActivityStepsBulkCreate,
@@ -17,6 +17,7 @@ from app.schemas.metric.activity.steps import (
     ActivityStepsResponse,
 )
 from app.services.auth_service import get_current_active_user
+from app.services.metrics_service import MetricsService
 
 logger = logging.getLogger(__name__)
 
@@ -35,10 +36,10 @@ router = APIRouter(prefix="/steps", tags=["metric-steps"])
         500: {"description": "Internal server error"},
     }
 )
-async def get_steps_data(
+def get_steps_data(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get steps data"""
@@ -87,7 +88,7 @@ async def get_steps_data(
 async def create_or_update_multiple_steps_records(
     bulk_data: ActivityStepsBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple steps records (bulk upsert)"""
     try:
@@ -137,7 +138,7 @@ async def create_or_update_multiple_steps_records(
 async def get_steps_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get a specific steps record by ID"""
     try:
@@ -179,7 +180,7 @@ async def get_steps_record(
 async def delete_steps_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete a steps record"""
     try:
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.rid import generate_rid
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.models.metric.activity.workouts import ActivityWorkouts
 from app.schemas.metric.activity.workouts import (
     ActivityWorkoutsBulkCreate,
@@ -16,6 +16,7 @@ from app.schemas.metric.activity.workouts import (
     ActivityWorkoutsResponse,
 )
 from app.services.auth_service import get_current_active_user
+from app.services.metrics_service import MetricsService
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +34,11 @@ router = APIRouter(prefix="/workouts", tags=["metric-workouts"])
         404: {"description": "Activity workouts data not found"},
     },
 )
-async def get_activity_workouts(
+def get_activity_workouts(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get activity workouts data"""
     try:
@@ -79,7 +80,7 @@ async def get_activity_workouts(
 async def get_activity_workout_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get a specific activity workout record by ID"""
     try:
@@ -123,7 +124,7 @@ async def get_activity_workout_record(
 async def create_or_update_multiple_workout_records(
     bulk_data: ActivityWorkoutsBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple workout records (bulk upsert)"""
     try:
@@ -174,7 +175,7 @@ async def create_or_update_multiple_workout_records(
 async def delete_activity_workout_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete an activity workout record"""
     try:
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.metric.body.composition import (
     BodyCompositionCreate,
     BodyCompositionCreateResponse,
@@ -35,10 +35,10 @@ router = APIRouter(prefix="/composition", tags=["metric-body-composition"])
     500: {"description": "Internal server error"},
     },
 )
-async def get_body_composition(
+def get_body_composition(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get body composition data (weight, body fat, muscle mass)"""
@@ -78,7 +78,7 @@ async def get_body_composition(
 async def create_body_composition_record(
     composition_data: BodyCompositionCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create a single body composition record"""
     try:
@@ -111,7 +111,7 @@ async def create_body_composition_record(
 async def create_or_update_multiple_body_composition_records(
     bulk_data: BodyCompositionBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple body composition records (bulk upsert)"""
     try:
@@ -159,7 +159,7 @@ async def create_or_update_multiple_body_composition_records(
 )
 async def delete_body_composition_record(
     weight_id: str,
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Delete a body composition measurement record"""
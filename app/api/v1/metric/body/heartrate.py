@@ -6,7 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.models.enums import DataSource
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.metric.body.heartrate import (
     HeartRateBulkCreate,
     HeartRateBulkCreateResponse,
@@ -14,8 +15,16 @@ from app.schemas.metric.body.heartrate import (
     HeartRateExportRecord,
     HeartRateExportResponse,
     HeartRateResponse,
+    HeartRateSamplesIngestResponse,
+    HeartRateSamplesResponse,
+    HeartRateSamplesUpload,
+    HeartRateZone,
+    HeartRateZoneDay,
+    HeartRateZonesResponse,
 )
 from app.services.auth_service import get_current_active_user
+from app.services.heart_rate_sample_service import HeartRateSampleService
+from app.services.heart_rate_zone_service import ZONE_NAMES, HeartRateZoneService
 from app.services.metrics_service import MetricsService
 
 logger = logging.getLogger(__name__)
@@ -34,10 +43,10 @@ router = APIRouter(prefix="/heartrate", tags=["metric-body-heartrate"])
         500: {"description": "Internal server error"},
     },
 )
-async def get_heart_rate_data(
+def get_heart_rate_data(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get heart rate data"""
@@ -78,7 +87,7 @@ async def get_heart_rate_data(
 async def create_or_update_multiple_heart_rate_records(
     bulk_data: HeartRateBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple heart rate records (bulk upsert)"""
     try:
@@ -114,6 +123,166 @@ async def create_or_update_multiple_heart_rate_records(
         )
 
 
+@router.post("/samples",
+    response_model=HeartRateSamplesIngestResponse,
+    summary="Upload raw heart rate samples endpoint",
+    description="Store raw heart rate samples and recompute the hourly summaries of the hours they fall in",
+    responses={
+        200: {"description": "Heart rate samples stored successfully"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Inactive user"},
+        422: {"description": "Validation error"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def upload_heart_rate_samples(
+    upload: HeartRateSamplesUpload,
+    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
+):
+    """Upload raw heart rate samples"""
+    try:
+        sample_service = HeartRateSampleService(db)
+        records, samples_received = sample_service.ingest_samples(current_user.id, upload)
+
+        logger.info(
+            f"Stored {samples_received} heart rate samples for {current_user.id} "
+            f"across {len(records)} hours"
+        )
+
+        return HeartRateSamplesIngestResponse(
+            message=f"Stored {samples_received} samples across {len(records)} hours",
+            samples_received=samples_received,
+            hours_updated=len(records),
+            records=[HeartRateResponse.model_validate(record) for record in records],
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Error storing heart rate samples: {str(e)}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error storing samples: {str(e)}",
+        )
+
+
+@router.get("/samples",
+    response_model=HeartRateSamplesResponse,
+    summary="Get raw heart rate samples endpoint",
+    description="Get the raw heart rate samples of one source over a window of up to 7 days (default: the last day)",
+    responses={
+        200: {"description": "Heart rate samples retrieved successfully"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Inactive user"},
+        422: {"description": "Validation error"},
+        500: {"description": "Internal server error"},
+    },
+)
+def get_heart_rate_samples(
+    source: DataSource,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: AuthPrincipal = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Get raw heart rate samples"""
+    try:
+        sample_service = HeartRateSampleService(db)
+        start, offsets, bpm = sample_service.get_samples(current_user.id, source, start_date, end_date)
+
+        return HeartRateSamplesResponse(
+            user_id=str(current_user.id),
+            source=source,
+            start=start,
+            offsets=offsets,
+            bpm=bpm,
+            total_count=len(bpm),
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving heart rate samples: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve heart rate samples",
+        )
+
+
+@router.get("/zones",
+    response_model=HeartRateZonesResponse,
+    summary="Get time in heart rate zones endpoint",
+    description="Get time spent in each heart rate zone per day and per workout, with zones from age and resting heart rate",
+    responses={
+        200: {"description": "Time in heart rate zones retrieved successfully"},
+        401: {"description": "Unauthorized"},
+        403: {"description": "Inactive user"},
+        404: {"description": "User profile not found"},
+        422: {"description": "Validation error"},
+        500: {"description": "Internal server error"},
+    },
+)
+def get_heart_rate_zones(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: AuthPrincipal = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Get time in heart rate zones"""
+    try:
+        zone_service = HeartRateZoneService(db)
+        report = zone_service.get_time_in_zones(current_user.id, start_date, end_date)
+
+        if not report:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User profile not found; a birth date is needed for heart rate zones",
+            )
+
+        starts = (None,) + report.edges
+        zones = [
+            HeartRateZone(
+                zone=zone,
+                name=name,
+                min_bpm=starts[zone],
+                max_bpm=report.edges[zone] - 1 if zone < len(report.edges) else None,
+            )
+            for zone, name in enumerate(ZONE_NAMES)
+        ]
+        days = [HeartRateZoneDay.model_validate(day) for day in report.days]
+
+        return HeartRateZonesResponse(
+            user_id=str(current_user.id),
+            max_hr=report.max_hr,
+            resting_hr=report.resting_hr,
+            zones=zones,
+            days=days,
+            total_seconds_in_zone=[sum(seconds) for seconds in zip(*(day.seconds_in_zone for day in days))],
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving heart rate zones: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve heart rate zones",
+        )
+
+
 @router.get("/{record_id}",
     response_model=HeartRateResponse,
     summary="Get a specific heart rate record by ID endpoint",
@@ -128,7 +297,7 @@ async def create_or_update_multiple_heart_rate_records(
 async def get_heart_rate_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get a specific heart rate record by ID"""
     try:
@@ -168,7 +337,7 @@ async def get_heart_rate_record(
 async def delete_heart_rate_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete a heart rate record"""
     try:
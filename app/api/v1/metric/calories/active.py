@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.metric.calories.active import (
     ActiveCaloriesExportRecord,
     ActiveCaloriesExportResponse,
@@ -34,10 +34,10 @@ router = APIRouter(prefix="/active", tags=["metric-calories-active"])
         500: {"description": "Internal server error"},
     },
 )
-async def get_active_calories_burn(
+def get_active_calories_burn(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get active calories burn data"""
@@ -93,7 +93,7 @@ async def get_active_calories_burn(
 async def create_or_update_multiple_active_calories_records(
     bulk_data: CaloriesActiveBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple active calories records (bulk upsert)"""
     try:
@@ -143,7 +143,7 @@ async def create_or_update_multiple_active_calories_records(
 async def get_active_calories_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get a specific active calories record by ID"""
     try:
@@ -187,7 +187,7 @@ async def get_active_calories_record(
 async def delete_active_calories_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete an active calories record"""
     try:
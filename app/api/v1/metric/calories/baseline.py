@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.metric.calories.baseline import (
     CaloriesBaselineBulkCreate,
     CaloriesBaselineBulkCreateResponse,
@@ -35,11 +35,11 @@ router = APIRouter(
         500: {"description": "Internal server error"},
     },
 )
-async def get_calories_baseline(
+def get_calories_baseline(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get calories baseline data"""
     try:
@@ -77,7 +77,7 @@ async def get_calories_baseline(
 async def create_or_update_multiple_baseline_calories_records(
     bulk_data: CaloriesBaselineBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple baseline calories records (bulk upsert)"""
     try:
@@ -126,7 +126,7 @@ async def create_or_update_multiple_baseline_calories_records(
 async def get_calories_baseline_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get a specific calories baseline record by ID"""
     try:
@@ -170,7 +170,7 @@ async def get_calories_baseline_record(
 async def delete_calories_baseline_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete a calories baseline record"""
     try:
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.metric.sleep.daily import (
     SleepDailyBulkCreate,
     SleepDailyBulkCreateResponse,
@@ -22,11 +22,11 @@ router = APIRouter(prefix="/daily", tags=["daily-sleep"])
 
 
 @router.get("/", response_model=list[SleepDailyResponse])
-async def get_sleep_daily(
+def get_sleep_daily(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get sleep daily data"""
     try:
@@ -52,7 +52,7 @@ async def get_sleep_daily(
 async def create_or_update_multiple_sleep_records(
     bulk_data: SleepDailyBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple sleep records (bulk upsert)"""
     try:
@@ -91,7 +91,7 @@ async def create_or_update_multiple_sleep_records(
 async def get_sleep_daily_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get a specific sleep daily record by ID"""
     try:
@@ -121,7 +121,7 @@ async def get_sleep_daily_record(
 async def delete_sleep_daily_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete a sleep daily record"""
     try:
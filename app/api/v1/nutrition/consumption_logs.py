@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.core.datetime_utils import parse_iso_datetime
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.nutrition.consumption_logs import (
     ConsumptionLogCreate,
     ConsumptionLogCreateResponse,
@@ -52,7 +52,7 @@ async def list_consumption_logs(
         default=0, ge=0, description="Number of logs to skip (default: 0)"
     ),
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> ConsumptionLogListResponse:
     """Return the user's consumption logs with optional date filters."""
     try:
@@ -106,7 +106,7 @@ async def list_consumption_logs(
 async def create_consumption_log(
     log_data: ConsumptionLogCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> ConsumptionLogCreateResponse:
     """Create a new log for the current user."""
     try:
@@ -149,7 +149,7 @@ async def create_consumption_log(
 async def get_consumption_log(
     log_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> ConsumptionLogResponse:
     """Fetch a single consumption log."""
     try:
@@ -190,7 +190,7 @@ async def update_consumption_log(
     log_id: str,
     log_data: ConsumptionLogUpdate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> ConsumptionLogResponse:
     """Update a consumption log."""
     try:
@@ -233,7 +233,7 @@ async def update_consumption_log(
 async def delete_consumption_log(
     log_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> ConsumptionLogDeleteResponse:
     """Delete a consumption log."""
     try:
@@ -277,7 +277,7 @@ async def delete_consumption_log(
 async def get_daily_consumption_log_records(
     date: str,  # Format: ISO datetime string with timezone (e.g., 2025-11-06T22:23:22Z or 2025-11-06T14:23:22-08:00)                                          
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get all consumption log records for a specific day. Requires ISO datetime string with timezone. Returns zero values if no records exist."""                                                      
     try:
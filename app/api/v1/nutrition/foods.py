@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.nutrition.foods import (
     FoodCreate,
     FoodCreateResponse,
@@ -45,7 +45,7 @@ async def list_foods(
         default=0, ge=0, description="Number of foods to skip (default: 0)"
     ),
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> FoodListResponse:
     """Return foods filtered by optional search criteria."""
     try:
@@ -83,7 +83,7 @@ async def list_foods(
 async def create_food(
     food_data: FoodCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> FoodCreateResponse:
     """Create a new food entry."""
     try:
@@ -118,7 +118,7 @@ async def create_food(
 async def get_food(
     food_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> FoodResponse:
     """Get a single food definition."""
     try:
@@ -156,7 +156,7 @@ async def update_food(
     food_id: str,
     food_data: FoodUpdate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> FoodResponse:
     """Update an existing food."""
     try:
@@ -196,7 +196,7 @@ async def update_food(
 async def delete_food(
     food_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> FoodDeleteResponse:
     """Delete a food entry."""
     try:
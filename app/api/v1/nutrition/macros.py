@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.nutrition.macros import (
     DailyAggregation,
     DailyAggregationResponse,
@@ -41,7 +41,7 @@ async def get_macros_data(
     end_date: Optional[datetime] = None,
     food_name: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get macro records with optional filtering"""
     try:
@@ -86,7 +86,7 @@ async def get_macros_data(
 async def create_macro_record(
     record_data: NutritionMacrosRecordCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create a macro record"""
     try:
@@ -116,7 +116,7 @@ async def create_macro_record(
 async def create_or_update_multiple_macro_records(
     bulk_data: NutritionMacrosBulkCreate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Create or update multiple macro records (bulk upsert)"""
     try:
@@ -154,7 +154,7 @@ async def create_or_update_multiple_macro_records(
 async def get_macro_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user)
+    current_user: AuthPrincipal = Depends(get_current_active_user)
 ):
     """Get a specific macro record by ID"""
     try:
@@ -196,7 +196,7 @@ async def get_macro_record(
 async def delete_macro_record(
     record_id: str,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Delete a macro record by ID"""
     try:
@@ -239,7 +239,7 @@ async def delete_macro_record(
 async def get_daily_macro_records(
     date: str,  # Format: ISO datetime string with timezone (e.g., 2025-11-06T22:23:22Z or 2025-11-06T14:23:22-08:00)                                          
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get all macro records for a specific day. Requires ISO datetime string with timezone. Returns zero values if no records exist."""                                                                
     try:
@@ -282,11 +282,11 @@ async def get_daily_macro_records(
         500: {"description": "Internal server error"},
     }
 )
-async def get_macro_aggregations(
+def get_macro_aggregations(
     start_date: Optional[str] = None,  # Format: YYYY-MM-DD
     end_date: Optional[str] = None,  # Format: YYYY-MM-DD
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ):
     """Get aggregated macro records by day"""
     try:
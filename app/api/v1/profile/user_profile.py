@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.auth.user import AuthUser
+from app.schemas.auth.user import AuthPrincipal
 from app.schemas.profile.user_profile import (
     UserProfileBase,
     UserProfileDeleteResponse,
@@ -33,7 +33,7 @@ router = APIRouter(prefix="/user/profile", tags=["user-profile"])
 )
 async def get_user_profile(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> UserProfileRead:
     service = UserProfileService(db)
     profile = service.get_profile(current_user.id)
@@ -62,7 +62,7 @@ async def get_user_profile(
 async def create_user_profile(
     payload: UserProfileBase,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> UserProfileRead:
     service = UserProfileService(db)
     existing = service.get_profile(current_user.id)
@@ -92,7 +92,7 @@ async def create_user_profile(
 async def update_user_profile(
     payload: UserProfileUpdate,
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> UserProfileRead:
     service = UserProfileService(db)
     profile = service.get_profile(current_user.id)
@@ -137,7 +137,7 @@ async def update_user_profile(
 )
 async def delete_user_profile(
     db: Session = Depends(get_db),
-    current_user: AuthUser = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_user),
 ) -> UserProfileDeleteResponse:
     service = UserProfileService(db)
     deleted = service.delete_profile(current_user.id)
@@ -2,6 +2,10 @@ import logging
 
 from fastapi import APIRouter
 
+from app.db.admission import admission_controller
+from app.db.session import get_pool_status
+from app.services.password_service import password_pool
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="", tags=["system"])
@@ -11,3 +15,21 @@ router = APIRouter(prefix="", tags=["system"])
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "version": "1.0.0"}
+
+
+@router.get("/health/db-pool")
+async def db_pool_status():
+    """Current database connection pool usage"""
+    return get_pool_status()
+
+
+@router.get("/health/password-pool")
+async def password_pool_status():
+    """Password hashing pool load, including the number of queued jobs"""
+    return password_pool.status()
+
+
+@router.get("/health/admission")
+async def admission_status():
+    """In-flight and shed request counts per route class, plus pool wait pressure"""
+    return admission_controller.status()
@@ -0,0 +1,139 @@
+"""
+Token-bucket rate limiting.
+
+Buckets live in memory per worker by default, in a bounded LRU so an attacker
+cycling through keys cannot grow memory past `max_keys`. For multi-worker
+deployments a Redis backend keeps the buckets shared; it needs the optional
+`redis` package and is only imported when selected.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+
+class InMemoryBucketBackend:
+    """
+    Per-process token buckets with O(1) take and LRU eviction of idle keys.
+
+    Args:
+        max_keys: Buckets kept before the least recently used one is dropped.
+            A dropped bucket is simply full again the next time its key shows up.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens, last refill timestamp)
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: Hashable, capacity: int, refill_per_second: float) -> float:
+        """Take one token; return 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is None:
+                tokens = float(capacity)
+            else:
+                tokens, updated = entry
+                tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+                self._buckets.move_to_end(key)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                wait = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (1 - tokens) / refill_per_second
+
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Refill and take atomically; keys expire once the bucket would be full again
+_REDIS_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1])
+local updated = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+end
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBucketBackend:
+    """Token buckets shared by every worker through Redis."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis rate limit backend requires the 'redis' package"
+            ) from e
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE_SCRIPT)
+
+    def take(self, key: Hashable, capacity: int, refill_per_second: float) -> float:
+        wait = self._take(
+            keys=[f"{self.prefix}{key}"],
+            args=[capacity, refill_per_second, time.time()],
+        )
+        return float(wait)
+
+
+class TokenBucketLimiter:
+    """
+    A named family of token buckets sharing one capacity and refill rate.
+
+    Args:
+        name: Prefix separating this limiter's keys from others on the same backend
+        capacity: Burst size, i.e. tokens in a full bucket
+        refill_per_minute: Tokens added back per minute
+        backend: InMemoryBucketBackend or RedisBucketBackend
+    """
+
+    def __init__(self, name: str, capacity: int, refill_per_minute: float, backend):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_minute / 60
+        self.backend = backend
+
+    def hit(self, key: str) -> Optional[int]:
+        """Consume a token for key; return None if allowed, else whole seconds to wait."""
+        if self.capacity <= 0:
+            return None
+        wait = self.backend.take(f"{self.name}:{key}", self.capacity, self.refill_per_second)
+        if wait <= 0:
+            return None
+        return max(math.ceil(wait), 1)
+
+
+def build_bucket_backend(kind: str, redis_url: str = "", max_keys: int = 100000):
+    """Build the configured bucket backend ("memory" or "redis")."""
+    if kind == "memory":
+        return InMemoryBucketBackend(max_keys=max_keys)
+    if kind == "redis":
+        return RedisBucketBackend(redis_url)
+    raise ValueError(f"Unknown rate limit backend: {kind}")
@@ -1,11 +1,26 @@
 """
 RID (Resource ID) utilities for generating and parsing resource identifiers.
 Format: <high-level-type>..<type>.<random-string>
+
+Sortable RIDs keep that format but use a ULID-style suffix: a millisecond
+timestamp followed by random bits, so new ids land at the right edge of the
+primary key index instead of all over it.
 """
 
+import base64
 import secrets
 import string
-from typing import Optional
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# Sortable suffix: 48-bit millisecond timestamp + 72 random bits, as 24 base32hex characters
+_TIMESTAMP_BYTES = 6
+_RANDOM_BYTES = 9
+_SORTABLE_LENGTH = (_TIMESTAMP_BYTES + _RANDOM_BYTES) * 8 // 5
+
+# base32hex (0-9a-v) sorts in the same order as the bytes it encodes, unlike standard base32
+_TO_BASE32HEX = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", b"0123456789abcdefghijklmnopqrstuv")
 
 
 def generate_rid(high_level_type: str, resource_type: str, length: int = 12) -> str:
@@ -26,6 +41,70 @@ def generate_rid(high_level_type: str, resource_type: str, length: int = 12) ->
     return f"{high_level_type}..{resource_type}.{random_string}"
 
 
+def generate_sortable_rids(
+    high_level_type: str, resource_type: str, count: int, timestamp_ms: Optional[int] = None
+) -> List[str]:
+    """
+    Generate `count` time-sortable RIDs at once.
+
+    The ids share one timestamp and are returned in ascending order; the random
+    bits for the whole batch come from a single call and are encoded in one pass.
+
+    Args:
+        high_level_type: The high-level category (e.g., 'auth', 'metric', 'goal', 'nutrition')
+        resource_type: The specific resource type (e.g., 'user', 'diet', 'weight')
+        count: Number of ids to generate
+        timestamp_ms: Milliseconds since the epoch (default: now)
+
+    Returns:
+        RIDs in format: <high-level-type>..<type>.<timestamp><random-string>
+    """
+    if count <= 0:
+        return []
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    prefix = timestamp_ms.to_bytes(_TIMESTAMP_BYTES, "big")
+    random_bytes = secrets.token_bytes(_RANDOM_BYTES * count)
+    tails = sorted(random_bytes[i:i + _RANDOM_BYTES] for i in range(0, len(random_bytes), _RANDOM_BYTES))
+    encoded = base64.b32encode(b"".join(prefix + tail for tail in tails)).translate(_TO_BASE32HEX).decode("ascii")
+    head = f"{high_level_type}..{resource_type}."
+    return [head + encoded[i:i + _SORTABLE_LENGTH] for i in range(0, len(encoded), _SORTABLE_LENGTH)]
+
+
+def generate_sortable_rid(high_level_type: str, resource_type: str) -> str:
+    """
+    Generate a time-sortable RID for a given resource type.
+
+    Args:
+        high_level_type: The high-level category (e.g., 'auth', 'metric', 'goal', 'nutrition')
+        resource_type: The specific resource type (e.g., 'user', 'diet', 'weight')
+
+    Returns:
+        RID in format: <high-level-type>..<type>.<timestamp><random-string>
+    """
+    return generate_sortable_rids(high_level_type, resource_type, 1)[0]
+
+
+def rid_timestamp(rid: str) -> Optional[datetime]:
+    """
+    Creation time embedded in a sortable RID.
+
+    Args:
+        rid: The RID to inspect
+
+    Returns:
+        UTC datetime, or None if the RID is not a sortable RID
+    """
+    parsed = parse_rid(rid)
+    if not parsed or len(parsed[2]) != _SORTABLE_LENGTH:
+        return None
+    try:
+        value = int(parsed[2], 32)
+    except ValueError:
+        return None
+    return datetime.fromtimestamp((value >> (_RANDOM_BYTES * 8)) / 1000, tz=timezone.utc)
+
+
 def parse_rid(rid: str) -> Optional[tuple[str, str, str]]:
     """
     Parse a RID into its components.
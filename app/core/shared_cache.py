@@ -0,0 +1,333 @@
+"""
+Host-wide cache shared by every worker process through a memory-mapped file.
+
+Each named cache is one file under SHARED_CACHE_DIR (/dev/shm by default, so it
+never touches disk) holding a fixed number of fixed-size slots. File names carry
+a deployment namespace (SHARED_CACHE_NAMESPACE, or a hash of DATABASE_URL), so
+two deployments on one host never read each other's entries. Values are
+encoded compactly by a codec and stored next to their key; a slot that cannot
+hold an entry is simply not cached.
+
+Layout:
+    header      magic, slot count, slot size, ways, codec hash, epoch
+    generations one uint32 counter per key-hash cell
+    slots       seq, generation, epoch, key hash, expiry, key length,
+                value length, key bytes, value bytes
+
+Invalidation never has to find the entry: `pop` bumps the generation counter of
+the key's cell and `clear` bumps the epoch, so every worker sees stale entries as
+misses on their next read. Readers take no lock and use the per-slot sequence
+number (odd while a write is in progress) to detect torn reads; writers
+serialise on a flock of the backing file.
+"""
+
+import fcntl
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Generic, Iterator, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+M = TypeVar("M", bound=BaseModel)
+
+_MAGIC = b"SHC1"
+_HEADER = struct.Struct("<4sIIIQQ")  # magic, slots, slot size, ways, codec hash, epoch
+_EPOCH_OFFSET = 4 + 4 + 4 + 4 + 8
+_GENERATION_CELLS = 65536
+_GENERATION = struct.Struct("<I")
+_SLOT = struct.Struct("<IIIQdHI")  # seq, generation, epoch, key hash, expires, key len, value len
+_READ_RETRIES = 3
+_NAMESPACE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def _hash_key(key: bytes) -> int:
+    # Stable across processes, unlike the built-in hash()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class ModelCodec(Generic[M]):
+    """
+    Encode a Pydantic model as a marshalled tuple of its JSON-mode field values.
+
+    Field names are not stored per entry; they are folded into the codec id so a
+    change to the model invalidates files written by an older deploy.
+    """
+
+    def __init__(self, model: Type[M]):
+        self.model = model
+        self.fields = tuple(model.model_fields)
+        self.id = f"{model.__module__}.{model.__qualname__}:{','.join(self.fields)}"
+
+    def encode(self, value: M) -> bytes:
+        dumped = value.model_dump(mode="json")
+        return marshal.dumps(tuple(dumped[name] for name in self.fields))
+
+    def decode(self, data: bytes) -> M:
+        return self.model.model_validate(dict(zip(self.fields, marshal.loads(data))))
+
+
+class MarshalCodec:
+    """Encode plain values (numbers, strings, bools, tuples, lists, dicts) with marshal."""
+
+    id = "marshal"
+
+    def encode(self, value: Any) -> bytes:
+        return marshal.dumps(value)
+
+    def decode(self, data: bytes) -> Any:
+        return marshal.loads(data)
+
+
+class SharedMemoryCache(Generic[V]):
+    """
+    Fixed-size, set-associative cache in shared memory with the TTLCache interface.
+
+    Args:
+        name: Cache name; every process using the same name and layout shares entries
+        slots: Number of slots (rounded up to a multiple of `ways`)
+        slot_size: Bytes per slot, including the slot header and the key
+        codec: Object with encode(value) -> bytes, decode(bytes) -> value and an `id` string
+        ttl_seconds: Seconds an entry stays valid after it is set (None disables expiry)
+        ways: Slots a key may occupy; the entry closest to expiry is replaced when all are taken
+        directory: Where the backing file lives (should be a tmpfs such as /dev/shm)
+        namespace: Deployment the file belongs to; only processes with the same namespace share it
+    """
+
+    def __init__(
+        self,
+        name: str,
+        slots: int,
+        slot_size: int,
+        codec: Any,
+        ttl_seconds: Optional[float] = None,
+        ways: int = 4,
+        directory: str = "/dev/shm",
+        namespace: str = "default",
+    ):
+        if slot_size <= _SLOT.size:
+            raise ValueError(f"slot_size must be larger than the {_SLOT.size}-byte slot header")
+        if not _NAMESPACE.match(namespace):
+            raise ValueError(f"Invalid shared cache namespace {namespace!r}: use letters, digits, '.', '_' or '-'")
+        self.name = name
+        self.ways = ways
+        self.slots = -(-slots // ways) * ways
+        self.slot_size = slot_size
+        self.codec = codec
+        self.ttl_seconds = ttl_seconds
+        self._codec_hash = _hash_key(codec.id.encode())
+        # The layout is part of the file name, so a deploy that changes it gets a fresh
+        # file instead of resizing one that older workers still have mapped
+        layout = _hash_key(f"{self._codec_hash}:{self.slots}:{slot_size}:{ways}".encode())
+        self.path = os.path.join(directory, f"supahealth-{namespace}-{name}-{layout:016x}.cache")
+        self._generations_offset = _HEADER.size
+        self._slots_offset = self._generations_offset + _GENERATION_CELLS * _GENERATION.size
+        self._size = self._slots_offset + self.slots * slot_size
+        self._write_lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            self._ensure_layout()
+        self._mmap = mmap.mmap(self._fd, self._size)
+
+    """File management"""
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # flock excludes other processes; the thread lock covers threads sharing our fd
+        with self._write_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _ensure_layout(self) -> None:
+        """Initialise the file if this is the first process to open it."""
+        expected = (_MAGIC, self.slots, self.slot_size, self.ways, self._codec_hash)
+        if os.fstat(self._fd).st_size == self._size:
+            header = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+            if header[:5] == expected:
+                return
+        logger.info(f"Initialising shared cache {self.path} ({self._size} bytes)")
+        os.ftruncate(self._fd, 0)
+        os.ftruncate(self._fd, self._size)
+        os.pwrite(self._fd, _HEADER.pack(*expected, 0), 0)
+
+    def close(self) -> None:
+        self._mmap.close()
+        os.close(self._fd)
+
+    """Slot access"""
+
+    def _epoch(self) -> int:
+        return struct.unpack_from("<Q", self._mmap, _EPOCH_OFFSET)[0]
+
+    def _generation_offset(self, key_hash: int) -> int:
+        return self._generations_offset + (key_hash % _GENERATION_CELLS) * _GENERATION.size
+
+    def _generation(self, key_hash: int) -> int:
+        return _GENERATION.unpack_from(self._mmap, self._generation_offset(key_hash))[0]
+
+    def _bucket(self, key_hash: int) -> range:
+        first = ((key_hash >> 16) % (self.slots // self.ways)) * self.ways
+        return range(first, first + self.ways)
+
+    def _slot_offset(self, slot: int) -> int:
+        return self._slots_offset + slot * self.slot_size
+
+    def _read_slot(self, slot: int, key: bytes, key_hash: int) -> Optional[bytes]:
+        """Return the slot's value bytes if it holds key, retrying reads torn by a writer."""
+        offset = self._slot_offset(slot)
+        for _ in range(_READ_RETRIES):
+            seq, generation, epoch, slot_hash, expires, key_len, value_len = _SLOT.unpack_from(
+                self._mmap, offset
+            )
+            if seq & 1:
+                continue
+            if slot_hash != key_hash or key_len != len(key):
+                return None
+            data_offset = offset + _SLOT.size
+            slot_key = self._mmap[data_offset:data_offset + key_len]
+            value = self._mmap[data_offset + key_len:data_offset + key_len + value_len]
+            if _SLOT.unpack_from(self._mmap, offset)[0] != seq:
+                continue
+            if slot_key != key:
+                return None
+            if (
+                generation != self._generation(key_hash)
+                or epoch != self._epoch()
+                or (expires and expires <= time.time())
+            ):
+                return None
+            return value
+        return None
+
+    def _is_live(self, slot: int, now: float, epoch: int) -> bool:
+        _, generation, slot_epoch, slot_hash, expires, key_len, _ = _SLOT.unpack_from(
+            self._mmap, self._slot_offset(slot)
+        )
+        return (
+            key_len > 0
+            and slot_epoch == epoch
+            and generation == self._generation(slot_hash)
+            and not (expires and expires <= now)
+        )
+
+    """Cache interface"""
+
+    def get(self, key: str) -> Optional[V]:
+        """Return the cached value for key, or None if missing, invalidated or expired."""
+        key_bytes = key.encode()
+        key_hash = _hash_key(key_bytes)
+        for slot in self._bucket(key_hash):
+            value = self._read_slot(slot, key_bytes, key_hash)
+            if value is not None:
+                return self.codec.decode(value)
+        return None
+
+    def set(self, key: str, value: V) -> None:
+        key_bytes = key.encode()
+        data = self.codec.encode(value)
+        if _SLOT.size + len(key_bytes) + len(data) > self.slot_size:
+            logger.debug(f"Entry for {key} does not fit a {self.name} slot; not cached")
+            return
+        key_hash = _hash_key(key_bytes)
+        now = time.time()
+        expires = now + self.ttl_seconds if self.ttl_seconds else 0.0
+
+        with self._locked():
+            epoch = self._epoch()
+            bucket = self._bucket(key_hash)
+            target = None
+            for slot in bucket:
+                if _SLOT.unpack_from(self._mmap, self._slot_offset(slot))[3] == key_hash:
+                    target = slot
+                    break
+            if target is None:
+                target = next((slot for slot in bucket if not self._is_live(slot, now, epoch)), None)
+            if target is None:
+                # Every way is live: replace the entry closest to expiry
+                target = min(bucket, key=lambda slot: _SLOT.unpack_from(self._mmap, self._slot_offset(slot))[4])
+
+            offset = self._slot_offset(target)
+            seq = _SLOT.unpack_from(self._mmap, offset)[0]
+            struct.pack_into("<I", self._mmap, offset, seq + 1)
+            data_offset = offset + _SLOT.size
+            self._mmap[data_offset:data_offset + len(key_bytes)] = key_bytes
+            self._mmap[data_offset + len(key_bytes):data_offset + len(key_bytes) + len(data)] = data
+            _SLOT.pack_into(
+                self._mmap,
+                offset,
+                seq + 1,
+                self._generation(key_hash),
+                epoch,
+                key_hash,
+                expires,
+                len(key_bytes),
+                len(data),
+            )
+            struct.pack_into("<I", self._mmap, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def pop(self, key: str) -> None:
+        """Invalidate key in every process by bumping its generation cell."""
+        offset = self._generation_offset(_hash_key(key.encode()))
+        with self._locked():
+            generation = _GENERATION.unpack_from(self._mmap, offset)[0]
+            _GENERATION.pack_into(self._mmap, offset, (generation + 1) & 0xFFFFFFFF)
+
+    def clear(self) -> None:
+        """Invalidate every entry in every process."""
+        with self._locked():
+            struct.pack_into("<Q", self._mmap, _EPOCH_OFFSET, self._epoch() + 1)
+
+    def __len__(self) -> int:
+        now = time.time()
+        epoch = self._epoch()
+        return sum(1 for slot in range(self.slots) if self._is_live(slot, now, epoch))
+
+
+def shared_cache_namespace() -> str:
+    """SHARED_CACHE_NAMESPACE, or a hash of DATABASE_URL so each database gets its own files."""
+    if settings.SHARED_CACHE_NAMESPACE:
+        return settings.SHARED_CACHE_NAMESPACE
+    return f"{_hash_key(settings.DATABASE_URL.encode()):016x}"
+
+
+def build_cache(
+    name: str,
+    maxsize: int,
+    ttl_seconds: Optional[float],
+    codec: Any,
+    slot_size: int,
+):
+    """
+    Return a SharedMemoryCache when SHARED_CACHE_ENABLED is set and the directory
+    exists, otherwise a per-process TTLCache with the same interface.
+    """
+    directory = settings.SHARED_CACHE_DIR
+    if settings.SHARED_CACHE_ENABLED:
+        if os.path.isdir(directory):
+            return SharedMemoryCache(
+                name,
+                slots=maxsize,
+                slot_size=slot_size,
+                codec=codec,
+                ttl_seconds=ttl_seconds,
+                directory=directory,
+                namespace=shared_cache_namespace(),
+            )
+        logger.warning(f"Shared cache directory {directory} not found; {name} cache is per process")
+    return TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
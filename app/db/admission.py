@@ -0,0 +1,232 @@
+"""
+Admission control in front of the database pool.
+
+Requests that would only queue for a connection are turned away up front
+instead of waiting up to pool_timeout. AdmissionControlMiddleware counts
+in-flight requests per route class (see app.db.timeouts) and reads the pool's
+recent checkout wait from TimedQueuePool:
+
+- export (bulk reads, aggregates) is capped on its own, and shed first, as
+  soon as connections are being waited for
+- interactive is shed once checkout waits get long
+- ingest and auth have a reserved slice of the in-flight budget that the other
+  classes cannot use, and are only refused at the hard ceiling
+
+Rejections carry Retry-After: 429 when a class is over its own cap, 503 when
+the database as a whole is saturated.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.timeouts import AUTH, EXPORT, INGEST, INTERACTIVE, classify_route, current_queries
+
+logger = logging.getLogger(__name__)
+
+_RESERVED_CLASSES = (INGEST, AUTH)
+_EXEMPT_PREFIXES = ("/api/v1/system/", "/metrics")
+
+
+class PoolPressure:
+    """
+    Process-wide view of how long pool checkouts are taking.
+
+    The recent wait is an exponentially decaying average over time, not over
+    checkouts, so it relaxes on its own once shedding has stopped the traffic
+    that was driving it up.
+    """
+
+    def __init__(self, decay_seconds: float = 5.0):
+        self.decay_seconds = decay_seconds
+        self.waiting = 0
+        self.timeouts = 0
+        self._wait = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _decayed(self, now: float) -> float:
+        return self._wait * math.exp(-(now - self._updated) / self.decay_seconds)
+
+    def record_wait(self, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            # Blend towards the new sample, keeping spikes visible
+            self._wait = max(seconds, 0.8 * self._decayed(now) + 0.2 * seconds)
+            self._updated = now
+
+    def recent_wait_ms(self) -> float:
+        with self._lock:
+            return self._decayed(time.monotonic()) * 1000
+
+
+pool_pressure = PoolPressure()
+_checkout_depth = threading.local()
+
+checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pool connection", ["pool"]
+)
+checkout_timeouts_total = registry.counter(
+    "db_pool_checkout_timeouts_total", "Pool checkouts that gave up after pool_timeout", ["pool"]
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports checkout waits and timeouts to pool_pressure and /metrics."""
+
+    # Set by app.db.session to "primary" or "replica-<n>"
+    metrics_name = "primary"
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+    def _do_get(self):
+        # QueuePool._do_get recurses; only the outermost call is timed
+        depth = getattr(_checkout_depth, "value", 0)
+        if depth:
+            return super()._do_get()
+
+        _checkout_depth.value = 1
+        with pool_pressure._lock:
+            pool_pressure.waiting += 1
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_pressure.timeouts += 1
+            checkout_timeouts_total.inc(self.metrics_name)
+            queries = current_queries()
+            if queries is not None:
+                queries.pool_exhausted = True
+            raise
+        finally:
+            _checkout_depth.value = 0
+            with pool_pressure._lock:
+                pool_pressure.waiting -= 1
+            waited = time.perf_counter() - started
+            pool_pressure.record_wait(waited)
+            checkout_wait_seconds.observe(waited, self.metrics_name)
+
+
+class AdmissionController:
+    """In-flight accounting and the admit/reject decision per route class."""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        reserved_in_flight: int,
+        export_max_in_flight: int,
+        export_max_wait_ms: float,
+        interactive_max_wait_ms: float,
+        retry_after: int,
+    ):
+        self.max_in_flight = max_in_flight
+        self.reserved_in_flight = reserved_in_flight
+        self.export_max_in_flight = export_max_in_flight
+        self.export_max_wait_ms = export_max_wait_ms
+        self.interactive_max_wait_ms = interactive_max_wait_ms
+        self.retry_after = retry_after
+        self.in_flight: Dict[str, int] = {INTERACTIVE: 0, EXPORT: 0, INGEST: 0, AUTH: 0}
+        self.rejected: Dict[str, int] = {INTERACTIVE: 0, EXPORT: 0, INGEST: 0, AUTH: 0}
+        self._lock = threading.Lock()
+
+    def try_admit(self, route_class: str) -> Optional[int]:
+        """Count the request in and return None, or return the status code to reject with."""
+        wait_ms = pool_pressure.recent_wait_ms()
+        with self._lock:
+            total = sum(self.in_flight.values())
+            shared_limit = self.max_in_flight - self.reserved_in_flight
+            status_code = None
+            if route_class in _RESERVED_CLASSES:
+                if total >= self.max_in_flight:
+                    status_code = 503
+            elif route_class == EXPORT and self.in_flight[EXPORT] >= self.export_max_in_flight:
+                status_code = 429
+            elif route_class == EXPORT and (pool_pressure.waiting or wait_ms > self.export_max_wait_ms):
+                status_code = 503
+            elif route_class == INTERACTIVE and wait_ms > self.interactive_max_wait_ms:
+                status_code = 503
+            elif total >= shared_limit:
+                status_code = 503
+
+            if status_code is None:
+                self.in_flight[route_class] += 1
+            else:
+                self.rejected[route_class] += 1
+            return status_code
+
+    def release(self, route_class: str) -> None:
+        with self._lock:
+            self.in_flight[route_class] -= 1
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": dict(self.in_flight),
+                "rejected": dict(self.rejected),
+                "max_in_flight": self.max_in_flight,
+                "reserved_in_flight": self.reserved_in_flight,
+                "pool_waiting": pool_pressure.waiting,
+                "pool_timeouts": pool_pressure.timeouts,
+                "pool_recent_wait_ms": round(pool_pressure.recent_wait_ms(), 1),
+            }
+
+
+admission_controller = AdmissionController(
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    reserved_in_flight=settings.ADMISSION_RESERVED_IN_FLIGHT,
+    export_max_in_flight=settings.ADMISSION_EXPORT_MAX_IN_FLIGHT,
+    export_max_wait_ms=settings.ADMISSION_EXPORT_MAX_POOL_WAIT_MS,
+    interactive_max_wait_ms=settings.ADMISSION_INTERACTIVE_MAX_POOL_WAIT_MS,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying admission_controller to every API request."""
+
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(_EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_route(Request(scope))
+        status_code = self.controller.try_admit(route_class)
+        if status_code is not None:
+            logger.warning(f"Shedding {route_class} request {scope['method']} {scope['path']} with {status_code}")
+            payload = json.dumps({
+                "detail": "Server is busy, please retry later",
+                "error": "overloaded",
+                "route_class": route_class,
+            }).encode()
+            await send({
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode()),
+                    (b"retry-after", str(self.controller.retry_after).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
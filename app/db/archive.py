@@ -0,0 +1,412 @@
+"""
+Compaction of cold hourly metrics into per-day arrays.
+
+Hourly rows from whole months older than METRIC_ARCHIVE_AFTER_MONTHS are packed
+into <table>_archive: one row per user, UTC day and source, holding each value
+column as a 24-element array plus a bitmask of the hours present. The per-row
+overhead (tuple header, RID, timestamps, index entries) is then paid once per
+day instead of once per hour.
+
+Archiving works on the monthly partitions (app/db/partitions.py): each expired
+partition is packed with one INSERT ... SELECT, merged into any days already
+archived, and truncated, with writes to that month held off meanwhile. Late rows
+for an archived month land in that (now empty) partition or the default one and
+are packed on the next run; an hour present in both takes the newer value.
+
+MetricsRepository unpacks archived days into hourly model instances for reads
+that reach past archive_horizon(). Those instances are never added to a
+session. Each archived hour keeps the id it had as an hourly row (hour_ids;
+days archived before that was kept fall back to "<day id>.<HH>"), and deleting
+it clears its bit and values from the day, or the whole day with its last hour.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, time, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import String, text, type_coerce
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.partitions import add_months, list_partitions, month_start, retention_cutoff
+from app.db.session import Base, engine
+from app.models.metric.activity.miles import ActivityMiles, ActivityMilesArchive
+from app.models.metric.activity.steps import ActivitySteps, ActivityStepsArchive
+from app.models.metric.body.heartrate import BodyHeartRate, BodyHeartRateArchive
+from app.models.metric.calories.active import CaloriesActive, CaloriesActiveArchive
+from app.models.metric.calories.baseline import CaloriesBaseline, CaloriesBaselineArchive
+
+logger = logging.getLogger(__name__)
+
+# hourly model -> (archive model, value columns, RID resource type of archived days)
+ARCHIVES = {
+    ActivitySteps: (ActivityStepsArchive, ("steps",), "activity_steps"),
+    ActivityMiles: (ActivityMilesArchive, ("miles", "activity_type"), "activity_miles"),
+    BodyHeartRate: (
+        BodyHeartRateArchive,
+        ("heart_rate", "min_hr", "avg_hr", "max_hr", "resting_hr", "heart_rate_variability"),
+        "body_heartrate",
+    ),
+    CaloriesActive: (CaloriesActiveArchive, ("calories_burned",), "active_calories"),
+    CaloriesBaseline: (CaloriesBaselineArchive, ("baseline_calories", "bmr"), "calories_baseline"),
+}
+
+_ADVISORY_LOCK_KEY = 470_001
+_LOCK_TIMEOUT = "5s"
+
+
+def to_utc(moment: datetime) -> datetime:
+    """Naive datetimes are taken to be UTC"""
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def archive_horizon(now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest month kept hourly; everything archived is older."""
+    month = add_months(month_start(now or datetime.now(timezone.utc)), -settings.METRIC_ARCHIVE_AFTER_MONTHS)
+    return datetime.combine(month, time(), tzinfo=timezone.utc)
+
+
+def reaches_archive(start_date: Optional[datetime]) -> bool:
+    return start_date is None or to_utc(start_date) < archive_horizon()
+
+
+# Reads
+
+
+def _hour_id(day: Base, hour: int) -> str:
+    """The hour's id from before archiving if it was kept, else "<day id>.<HH>"."""
+    kept = day.hour_ids[hour] if day.hour_ids else None
+    return kept or f"{day.id}.{hour:02d}"
+
+
+def _unpack(model: type, day: Base, values: Tuple[str, ...], hour: int) -> Base:
+    return model(
+        id=_hour_id(day, hour),
+        user_key=day.user_key,
+        date_hour=datetime.combine(day.date_day, time(hour), tzinfo=timezone.utc),
+        source=day.source,
+        created_at=day.created_at,
+        updated_at=day.updated_at,
+        **{column: getattr(day, column)[hour] for column in values},
+    )
+
+
+def archived_records(
+    db: Session,
+    model: type,
+    user_key: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[Base]:
+    """
+    Archived hours of a user between two instants, unpacked into hourly model instances.
+
+    Args:
+        db: Database session
+        model: Hourly model (a key of ARCHIVES)
+        user_key: The user's internal key
+        start_date: Earliest date_hour included
+        end_date: Latest date_hour included
+
+    Returns:
+        Transient model instances, newest first
+    """
+    archive, values, _ = ARCHIVES[model]
+    start = to_utc(start_date) if start_date else None
+    end = to_utc(end_date) if end_date else None
+    query = db.query(archive).filter(archive.user_key == user_key)
+    if start:
+        query = query.filter(archive.date_day >= start.date())
+    if end:
+        query = query.filter(archive.date_day <= end.date())
+
+    records = []
+    for day in query.all():
+        for hour in range(24):
+            if day.hour_mask & (1 << hour):
+                record = _unpack(model, day, values, hour)
+                if (start is None or record.date_hour >= start) and (end is None or record.date_hour <= end):
+                    records.append(record)
+    records.sort(key=lambda record: record.date_hour, reverse=True)
+    return records
+
+
+def with_archived(
+    db: Session,
+    model: type,
+    records: List[Base],
+    user_key: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[Base]:
+    """
+    Hourly rows of a range read plus the archived hours they do not already cover.
+
+    Args:
+        db: Database session
+        model: Hourly model (a key of ARCHIVES)
+        records: Hourly rows read for the range, newest first
+        user_key: The user's internal key
+        start_date: Start of the range read
+        end_date: End of the range read
+
+    Returns:
+        All records in the range, newest first
+    """
+    if not reaches_archive(start_date):
+        return records
+    covered = {(record.date_hour, record.source) for record in records}
+    archived = [
+        record
+        for record in archived_records(db, model, user_key, start_date, end_date)
+        if (record.date_hour, record.source) not in covered
+    ]
+    if not archived:
+        return records
+    return sorted(records + archived, key=lambda record: record.date_hour, reverse=True)
+
+
+def _find_hour(
+    db: Session, archive: type, user_key: int, record_id: str, for_update: bool = False
+) -> Optional[Tuple[Base, int]]:
+    """The archived day and hour a record id refers to, either form of id."""
+    query = db.query(archive).filter(archive.user_key == user_key)
+    if for_update:
+        query = query.with_for_update()
+    day_id, _, hour = record_id.rpartition(".")
+    if len(hour) == 2 and hour.isdigit() and int(hour) <= 23:
+        day = query.filter(archive.id == day_id).one_or_none()
+        if day is not None and _hour_id(day, int(hour)) == record_id and day.hour_mask & (1 << int(hour)):
+            return day, int(hour)
+    # An id kept from before archiving; hour_ids has a GIN index for this
+    kept = type_coerce(archive.hour_ids, postgresql.ARRAY(String))
+    day = query.filter(kept.contains([record_id])).first()
+    if day is None:
+        return None
+    hour = day.hour_ids.index(record_id)
+    return (day, hour) if day.hour_mask & (1 << hour) else None
+
+
+def archived_record(db: Session, model: type, user_key: int, record_id: str) -> Optional[Base]:
+    """
+    An archived hour by its id, as read from a range.
+
+    Args:
+        db: Database session
+        model: Hourly model (a key of ARCHIVES)
+        user_key: The user's internal key
+        record_id: Id of the archived hour
+
+    Returns:
+        Transient model instance, or None if there is no such archived hour
+    """
+    archive, values, _ = ARCHIVES[model]
+    found = _find_hour(db, archive, user_key, record_id)
+    if found is None:
+        return None
+    day, hour = found
+    return _unpack(model, day, values, hour)
+
+
+def delete_archived_record(db: Session, model: type, user_key: int, record_id: str) -> Optional[Base]:
+    """
+    Delete an archived hour by its id, and its day once no hour is left.
+
+    Args:
+        db: Database session
+        model: Hourly model (a key of ARCHIVES)
+        user_key: The user's internal key
+        record_id: Id of the archived hour
+
+    Returns:
+        Transient model instance of the deleted hour, or None if there is no such archived hour
+    """
+    archive, values, _ = ARCHIVES[model]
+    # Locked so a concurrent archiving run cannot merge into the day in between
+    found = _find_hour(db, archive, user_key, record_id, for_update=True)
+    if found is None:
+        return None
+    day, hour = found
+    record = _unpack(model, day, values, hour)
+    day.hour_mask &= ~(1 << hour)
+    if not day.hour_mask:
+        db.delete(day)
+    else:
+        for column in values + (("hour_ids",) if day.hour_ids else ()):
+            # A new list, so the ORM sees the change
+            entries = list(getattr(day, column))
+            entries[hour] = None
+            setattr(day, column, entries)
+    db.commit()
+    return record
+
+
+# Archiving
+
+
+def _pack_sql(model: type, relation: str, with_clause: str = "") -> str:
+    """INSERT ... SELECT packing the hourly rows of relation into the archive, merging existing days."""
+    archive, values, rid_type = ARCHIVES[model]
+    # archive array column -> hourly column packed into it
+    sources = {**{column: column for column in values}, "hour_ids": "id"}
+    element_types = {
+        column: archive.__table__.c[column].type.item_type.compile(dialect=postgresql.dialect())
+        for column in sources
+    }
+    packed = ", ".join(
+        "ARRAY["
+        + ", ".join(
+            f"CAST(max({source}) FILTER (WHERE h = {hour}) AS {element_types[column]})" for hour in range(24)
+        )
+        + "]"
+        for column, source in sources.items()
+    )
+    merged = ", ".join(
+        f"{column} = ARRAY["
+        + ", ".join(
+            f"CASE WHEN EXCLUDED.hour_mask & {1 << hour} <> 0 "
+            f"THEN EXCLUDED.{column}[{hour + 1}] ELSE a.{column}[{hour + 1}] END"
+            for hour in range(24)
+        )
+        + "]"
+        for column in sources
+    )
+    return (
+        f"{with_clause}"
+        f"INSERT INTO {archive.__tablename__} AS a "
+        f"(user_key, date_day, source, hour_mask, {', '.join(sources)}, id, created_at, updated_at) "
+        f"SELECT user_key, day, source, bit_or(1 << h), {packed}, "
+        f"'metric..{rid_type}.' || left(md5(concat_ws(':', user_key, day, source)), 24), "
+        f"min(created_at), max(coalesce(updated_at, created_at)) "
+        f"FROM (SELECT *, CAST(date_hour AT TIME ZONE 'UTC' AS date) AS day, "
+        f"CAST(extract(hour FROM date_hour AT TIME ZONE 'UTC') AS integer) AS h FROM {relation}) hourly "
+        f"GROUP BY user_key, day, source "
+        f"ON CONFLICT (user_key, date_day, source) DO UPDATE SET "
+        f"hour_mask = a.hour_mask | EXCLUDED.hour_mask, {merged}, updated_at = now()"
+    )
+
+
+def archive_partition(connection: Connection, model: type, partition: str) -> int:
+    """
+    Pack one monthly partition into the archive and empty it.
+
+    Args:
+        connection: Connection inside a transaction
+        model: Hourly model the partition belongs to
+        partition: Partition name
+
+    Returns:
+        Number of user-days written
+    """
+    # Blocks writes to this month only; reads of it continue until the truncate
+    connection.execute(text(f"LOCK TABLE {partition} IN SHARE ROW EXCLUSIVE MODE"))
+    days = connection.execute(text(_pack_sql(model, partition))).rowcount
+    connection.execute(text(f"TRUNCATE {partition}"))
+    return days
+
+
+def archive_default_partition(connection: Connection, model: type, horizon: datetime) -> int:
+    """Move rows older than horizon out of the default partition into the archive."""
+    table = model.__tablename__
+    moved = f"WITH moved AS (DELETE FROM {table}_default WHERE date_hour < :horizon RETURNING *) "
+    return connection.execute(text(_pack_sql(model, "moved", moved)), {"horizon": horizon}).rowcount
+
+
+class MetricArchiver:
+    """
+    Periodically archives hourly metrics older than the archive horizon.
+
+    Args:
+        interval: Seconds between runs
+        retain_months: Whole months kept before the current one (0 keeps everything);
+            pass the partition maintainer's value so both expire data at one cutoff
+    """
+
+    def __init__(self, interval: float, retain_months: int = 0):
+        self.interval = interval
+        self.retain_months = retain_months
+        self._task: Optional[asyncio.Task] = None
+
+    def _archive(self, connection: Connection) -> Dict[str, int]:
+        horizon = archive_horizon()
+        # The cutoff the partition maintainer detaches at (None: keep everything)
+        cutoff = retention_cutoff(self.retain_months) if self.retain_months > 0 else None
+        archived: Dict[str, int] = {}
+        for model in ARCHIVES:
+            table = model.__tablename__
+            days = 0
+            with connection.begin():
+                partitions = list_partitions(connection, table)
+            for name, month in partitions:
+                if add_months(month, 1) > horizon.date():
+                    continue
+                if cutoff is not None and add_months(month, 1) <= cutoff:
+                    # Expired: left for the partition maintainer to detach, not packed
+                    continue
+                with connection.begin():
+                    connection.execute(text(f"SET LOCAL lock_timeout = '{_LOCK_TIMEOUT}'"))
+                    if connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+                        days += archive_partition(connection, model, name)
+            with connection.begin():
+                days += archive_default_partition(connection, model, horizon)
+            if cutoff is not None:
+                # Archived days live outside the partitions, where detaching cannot expire them
+                with connection.begin():
+                    connection.execute(
+                        text(f"DELETE FROM {ARCHIVES[model][0].__tablename__} WHERE date_day < :cutoff"),
+                        {"cutoff": cutoff},
+                    )
+            if days:
+                archived[table] = days
+        return archived
+
+    def run_once(self) -> Dict[str, int]:
+        """Returns user-days archived per table; empty if another worker holds the lock."""
+        with engine.connect() as connection:
+            locked = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            ).scalar()
+            connection.commit()
+            if not locked:
+                return {}
+            try:
+                archived = self._archive(connection)
+            finally:
+                connection.rollback()
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+                connection.commit()
+        for table, days in archived.items():
+            logger.info(f"Archived {days} user-days of {table}")
+        return archived
+
+    async def _run(self) -> None:
+        # The first run may archive months of backlog, so it does not hold up startup
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Metric archiving failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Process-wide archiver started with the app
+metric_archiver = MetricArchiver(
+    interval=settings.METRIC_ARCHIVE_INTERVAL_SECONDS,
+    retain_months=settings.METRIC_RETENTION_MONTHS,
+)
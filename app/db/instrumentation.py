@@ -0,0 +1,196 @@
+"""
+Query and request instrumentation exported at /metrics.
+
+Engine events time every statement. Statement counts and time are added up per
+request, and per-route latency is recorded, by RequestMetricsMiddleware. Pool
+gauges are read from the engines when /metrics is scraped. Statements slower
+than SLOW_QUERY_MS are logged with their route and the shape of their
+parameters (types and sizes, never the values).
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.admission import admission_controller, pool_pressure
+from app.db.query_budget import normalize_statement, warn_if_over_budget
+from app.db.session import get_pool_status
+from app.db.timeouts import route_template
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+_SLOW_STATEMENT_MAX_CHARS = 2000
+_WHITESPACE = re.compile(r"\s+")
+
+request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route template", ["method", "route", "status"]
+)
+request_statements = registry.histogram(
+    "db_request_statements",
+    "SQL statements executed per request",
+    ["route"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+request_statement_seconds = registry.histogram(
+    "db_request_statement_seconds", "Time spent in SQL statements per request", ["route"]
+)
+statement_duration_seconds = registry.histogram(
+    "db_statement_duration_seconds", "Duration of individual SQL statements"
+)
+slow_statements_total = registry.counter(
+    "db_slow_statements_total", "Statements slower than SLOW_QUERY_MS", ["route"]
+)
+
+
+class RequestStats:
+    """Statements executed on behalf of one request."""
+
+    def __init__(self, scope, record_statements: bool = False):
+        self.scope = scope
+        self.statements = 0
+        self.statement_seconds = 0.0
+        # Per-statement counts, kept only when query budget warnings are on
+        self.statement_counts: Optional[Counter] = Counter() if record_statements else None
+
+    @property
+    def route(self) -> str:
+        # Templates rather than raw paths keep label cardinality bounded
+        return route_template(self.scope) or UNMATCHED_ROUTE
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """The RequestStats of the request being served, if any."""
+    return _current_stats.get()
+
+
+def _value_shape(value: Any) -> str:
+    name = type(value).__name__
+    if isinstance(value, (str, bytes, list, tuple, dict)):
+        return f"{name}[{len(value)}]"
+    return name
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by type and size without revealing their values."""
+    if executemany and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_value_shape(value)}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_value_shape(value) for value in parameters) + ")"
+    return "()"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._instrumentation_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_instrumentation_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    statement_duration_seconds.observe(elapsed)
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.statement_seconds += elapsed
+        if stats.statement_counts is not None:
+            stats.statement_counts[normalize_statement(statement)] += 1
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        route = stats.route if stats is not None else UNMATCHED_ROUTE
+        slow_statements_total.inc(route)
+        text = _WHITESPACE.sub(" ", statement).strip()[:_SLOW_STATEMENT_MAX_CHARS]
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f}ms) on {route}: {text} "
+            f"params={parameter_shape(parameters, executemany)}"
+        )
+
+
+def _pool_samples() -> Iterable[Tuple[Tuple[str, ...], float]]:
+    status = get_pool_status()
+    pools = [("primary", status)] + [
+        (f"replica-{index}", replica) for index, replica in enumerate(status.get("replicas", []))
+    ]
+    for name, snapshot in pools:
+        for state in ("size", "checked_in", "checked_out", "overflow"):
+            yield (name, state), snapshot[state]
+
+
+registry.gauge(
+    "db_pool_connections",
+    "Pool connections by state (size, checked_in, checked_out, overflow)",
+    ["pool", "state"],
+    _pool_samples,
+)
+registry.gauge(
+    "db_pool_checkouts_waiting",
+    "Checkouts currently waiting for a connection",
+    [],
+    lambda: [((), pool_pressure.waiting)],
+)
+registry.gauge(
+    "admission_in_flight",
+    "Requests admitted and still running, by route class",
+    ["route_class"],
+    lambda: [
+        ((route_class,), count)
+        for route_class, count in admission_controller.status()["in_flight"].items()
+    ],
+)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording latency and statement totals per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope, record_statements=settings.QUERY_BUDGET_WARNINGS)
+        token = _current_stats.set(stats)
+        status_code = 500
+
+        async def recording_send(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            _current_stats.reset(token)
+            route = stats.route
+            request_duration_seconds.observe(
+                time.perf_counter() - started, scope["method"], route, str(status_code)
+            )
+            if route != UNMATCHED_ROUTE:
+                request_statements.observe(stats.statements, route)
+                request_statement_seconds.observe(stats.statement_seconds, route)
+                if settings.QUERY_BUDGET_WARNINGS:
+                    warn_if_over_budget(
+                        scope["method"], route, stats.statements, stats.statement_counts
+                    )
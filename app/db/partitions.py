@@ -0,0 +1,248 @@
+"""
+Monthly range partitions of the hourly metric tables.
+
+Each table in HOURLY_PARTITIONED_TABLES is partitioned on date_hour into
+<table>_pYYYYMM partitions covering one UTC calendar month, plus
+<table>_default for anything outside them. The maintainer keeps partitions
+PARTITION_MONTHS_AHEAD months ahead of now so the default partition stays empty
+and, when METRIC_RETENTION_MONTHS is set, detaches partitions that ended before
+the retention window. A detached partition is an ordinary table again, ready to
+archive or drop; nothing is deleted row by row. Rows that reached the default
+partition before their month existed (far-future timestamps) move into the new
+partition, and every partition is created or detached in its own savepoint, so
+one failure does not roll back the rest of a run.
+
+Every worker runs the maintainer. A transaction-level advisory lock makes
+concurrent runs skip instead of racing, and a lock timeout keeps partition DDL
+from queueing behind long queries on the parent.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+HOURLY_PARTITIONED_TABLES = (
+    "activity_steps",
+    "activity_miles",
+    "body_heartrate",
+    "body_heartrate_samples",
+    "calories_active",
+    "calories_baseline",
+)
+
+_ADVISORY_LOCK_KEY = 460_001
+_LOCK_TIMEOUT = "5s"
+
+
+def month_start(moment: date) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def retention_cutoff(retain_months: int, now: Optional[datetime] = None) -> date:
+    """First month kept under retain_months of retention; data before it is expired."""
+    return add_months(month_start(now or datetime.now(timezone.utc)), -retain_months)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _bound(month: date) -> str:
+    # Explicit UTC offset: a bare date would be read in the session's time zone
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def create_partition(connection: Connection, table: str, month: date) -> None:
+    """
+    Create the partition of one month, moving any rows the default partition holds for it.
+
+    PostgreSQL refuses to create a partition while the default one has rows in its
+    range, which happens once far-future timestamps are ingested; those rows are set
+    aside in a temporary table and re-inserted through the parent afterwards.
+    """
+    in_month = f"date_hour >= {_bound(month)} AND date_hour < {_bound(add_months(month, 1))}"
+    moved = connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {in_month})")).scalar()
+    if moved:
+        connection.execute(text(f"CREATE TEMPORARY TABLE {table}_moved (LIKE {table})"))
+        connection.execute(text(
+            f"WITH moved AS (DELETE FROM {table}_default WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {table}_moved SELECT * FROM moved"
+        ))
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+    ))
+    if moved:
+        connection.execute(text(f"INSERT INTO {table} SELECT * FROM {table}_moved"))
+        connection.execute(text(f"DROP TABLE {table}_moved"))
+
+
+def list_partitions(connection: Connection, table: str) -> List[Tuple[str, date]]:
+    """Monthly partitions of table as (name, month), oldest first; other partitions are ignored."""
+    names = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    ).scalars()
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    partitions = []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(
+    connection: Connection,
+    months_ahead: int,
+    since: Optional[date] = None,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """
+    Create any missing monthly partitions.
+
+    Each partition is created in its own savepoint, so one that cannot be created
+    (say, on a lock timeout) is logged and retried on the next run without
+    holding back the others.
+
+    Args:
+        connection: Connection inside a transaction
+        months_ahead: Months after the current one to cover
+        since: First month to cover (default: the current month)
+        now: Current time (default: now)
+
+    Returns:
+        Names of the partitions created
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    first = month_start(since) if since else current
+    created = []
+    for table in HOURLY_PARTITIONED_TABLES:
+        existing = {name for name, _ in list_partitions(connection, table)}
+        month = first
+        while month <= add_months(current, months_ahead):
+            name = partition_name(table, month)
+            if name not in existing:
+                try:
+                    with connection.begin_nested():
+                        create_partition(connection, table, month)
+                    created.append(name)
+                except Exception as e:
+                    logger.error(f"Failed to create partition {name}: {str(e)}")
+            month = add_months(month, 1)
+    return created
+
+
+def detach_expired_partitions(
+    connection: Connection, retain_months: int, now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Detach partitions that ended more than retain_months months before the current month.
+
+    Args:
+        connection: Connection inside a transaction
+        retain_months: Whole months kept before the current one
+        now: Current time (default: now)
+
+    Returns:
+        Names of the partitions detached
+    """
+    cutoff = retention_cutoff(retain_months, now)
+    detached = []
+    for table in HOURLY_PARTITIONED_TABLES:
+        for name, month in list_partitions(connection, table):
+            if add_months(month, 1) <= cutoff:
+                try:
+                    with connection.begin_nested():
+                        connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                    detached.append(name)
+                except Exception as e:
+                    logger.error(f"Failed to detach partition {name}: {str(e)}")
+    return detached
+
+
+class PartitionMaintainer:
+    """
+    Periodically creates future partitions and applies retention.
+
+    Args:
+        interval: Seconds between runs
+        months_ahead: Months of partitions kept ahead of the current one
+        retain_months: Whole months kept before the current one (0 keeps everything)
+    """
+
+    def __init__(self, interval: float, months_ahead: int, retain_months: int):
+        self.interval = interval
+        self.months_ahead = months_ahead
+        self.retain_months = retain_months
+        self._task: Optional[asyncio.Task] = None
+
+    def run_once(self) -> Tuple[List[str], List[str]]:
+        """Returns (created, detached) partition names; both empty if another worker holds the lock."""
+        with engine.begin() as connection:
+            if not connection.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            ).scalar():
+                return [], []
+            connection.execute(text(f"SET LOCAL lock_timeout = '{_LOCK_TIMEOUT}'"))
+            created = ensure_partitions(connection, self.months_ahead)
+            detached = (
+                detach_expired_partitions(connection, self.retain_months) if self.retain_months > 0 else []
+            )
+        if created:
+            logger.info(f"Created partitions: {', '.join(created)}")
+        if detached:
+            logger.info(f"Detached partitions past retention: {', '.join(detached)}")
+        return created, detached
+
+    async def run(self) -> None:
+        try:
+            await asyncio.to_thread(self.run_once)
+        except Exception as e:
+            # Partitions are created months ahead, so a failed run is retried long before it matters
+            logger.error(f"Partition maintenance failed: {str(e)}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run()
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self.run()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Process-wide maintainer started with the app
+partition_maintainer = PartitionMaintainer(
+    interval=settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+    months_ahead=settings.PARTITION_MONTHS_AHEAD,
+    retain_months=settings.METRIC_RETENTION_MONTHS,
+)
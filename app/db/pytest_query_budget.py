@@ -0,0 +1,40 @@
+"""
+pytest plugin for query budgets (see app.db.query_budget).
+
+Enable it with `-p app.db.pytest_query_budget`, or with
+`pytest_plugins = ["app.db.pytest_query_budget"]` in conftest.py. Then:
+
+    @pytest.mark.query_budget(3)
+    def test_bulk_steps_upsert(client, auth_headers):
+        client.post("/api/v1/metric/steps/bulk", json=rows(500), headers=auth_headers)
+
+fails if the test body (fixtures excluded) issues more than 3 statements on the
+primary engine. The `query_counter` fixture yields a QueryCounter for tests that
+assert on parts of their body instead.
+"""
+
+import pytest
+
+from app.db.query_budget import assert_max_queries, count_queries
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(n): fail if the test issues more than n SQL statements"
+    )
+
+
+@pytest.fixture
+def query_counter():
+    with count_queries() as counter:
+        yield counter
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    with assert_max_queries(marker.args[0]):
+        return (yield)
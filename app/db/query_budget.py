@@ -0,0 +1,141 @@
+"""
+Query budgets: statement-count limits that catch N+1 patterns.
+
+In tests, wrap a call in `count_queries()` to see the statements it issued, or
+in `assert_max_queries(n)` to fail when it issues more than n. The pytest plugin
+in app.db.pytest_query_budget adds a `query_budget` marker and fixture on top.
+
+At runtime, QUERY_BUDGETS declares the statements each route may issue per
+request (QUERY_BUDGET_DEFAULT for everything else). With QUERY_BUDGET_WARNINGS
+on (meant for staging), RequestMetricsMiddleware logs every request over its
+budget together with its most repeated statements.
+"""
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# (method, route template) -> statements per request, including SET LOCAL statement_timeout
+QUERY_BUDGETS = {
+    ("POST", "/api/v1/metric/steps/bulk"): 3,
+    ("POST", "/api/v1/metric/miles/bulk"): 3,
+    ("POST", "/api/v1/metric/heartrate/bulk"): 3,
+    ("POST", "/api/v1/metric/heartrate/samples"): 8,
+    ("POST", "/api/v1/metric/active/bulk"): 3,
+    ("POST", "/api/v1/metric/baseline/bulk"): 3,
+    ("POST", "/api/v1/metric/composition/bulk"): 3,
+    ("POST", "/api/v1/metric/daily/bulk"): 3,
+    ("POST", "/api/v1/metric/workouts/bulk"): 3,
+    # nutrition/macros/bulk and goal/general/bulk still upsert row by row (their
+    # tables have no unique key to conflict on), so they keep QUERY_BUDGET_DEFAULT
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def budget_for(method: str, route: str) -> int:
+    """Statement budget of one request to route."""
+    return QUERY_BUDGETS.get((method, route), settings.QUERY_BUDGET_DEFAULT)
+
+
+def normalize_statement(statement: str) -> str:
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def format_repeated(statement_counts: Counter, limit: int = 3) -> str:
+    """Most repeated statements, the usual signature of an N+1 loop."""
+    repeated = [
+        (statement, count) for statement, count in statement_counts.most_common(limit) if count > 1
+    ]
+    return "; ".join(f"{count}x {statement[:200]}" for statement, count in repeated) or "none"
+
+
+def warn_if_over_budget(
+    method: str, route: str, statements: int, statement_counts: Optional[Counter] = None
+) -> None:
+    budget = budget_for(method, route)
+    if statements <= budget:
+        return
+    repeated = format_repeated(statement_counts) if statement_counts else "not recorded"
+    logger.warning(
+        f"Query budget exceeded on {method} {route}: {statements} statements "
+        f"(budget {budget}). Most repeated: {repeated}"
+    )
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by assert_max_queries when a block issues more statements than allowed."""
+
+
+class QueryCounter:
+    """Statements seen on an engine while a count_queries block is open."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, minimum: int = 2) -> List[Tuple[str, int]]:
+        """Statements issued at least `minimum` times, most frequent first."""
+        counts = Counter(self.statements)
+        return [(statement, count) for statement, count in counts.most_common() if count >= minimum]
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements"]
+        lines.extend(
+            f"  {index + 1}. {statement}" for index, statement in enumerate(self.statements)
+        )
+        return "\n".join(lines)
+
+
+@contextmanager
+def count_queries(bind=None) -> Iterator[QueryCounter]:
+    """
+    Count the statements executed on bind while the block runs.
+
+    Args:
+        bind: Engine (or the Engine class, for every engine) to listen on;
+            defaults to the primary engine. Every statement on it is counted,
+            whichever thread runs it, so use it where one request is in flight.
+    """
+    bind = engine if bind is None else bind
+    counter = QueryCounter()
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        counter.statements.append(normalize_statement(statement))
+
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+
+@contextmanager
+def assert_max_queries(budget: int, bind=None) -> Iterator[QueryCounter]:
+    """
+    Fail with QueryBudgetExceeded if the block issues more than budget statements.
+
+    Example:
+        with assert_max_queries(3):
+            client.post("/api/v1/metric/steps/bulk", json=payload_with_500_rows)
+    """
+    with count_queries(bind) as counter:
+        yield counter
+    if counter.count > budget:
+        repeated = counter.repeated()
+        hint = f"\nRepeated: {repeated[0][1]}x {repeated[0][0]}" if repeated else ""
+        raise QueryBudgetExceeded(
+            f"Expected at most {budget} statements, got {counter.report()}{hint}"
+        )
@@ -1,25 +1,39 @@
+import itertools
 import logging
+from typing import Optional
 
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.expression import Select
 
 from app.core.config import settings
+from app.core.shared_cache import MarshalCodec, SharedMemoryCache, build_cache
+from app.db.admission import TimedQueuePool
+from app.db.timeouts import apply_request_limits, release_request_connections
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENGINE_OPTIONS = dict(
+    poolclass=TimedQueuePool,  # Reports checkout waits to admission control
+    pool_pre_ping=True,  # Enable connection health checks
+    pool_size=20,  # Increased pool size for better concurrency
+    max_overflow=30,  # Increased max overflow
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,  # Add timeout setting
+    pool_recycle=1800,  # Recycle connections every 30 minutes
+)
+
 try:
     # Create database engine
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,  # Enable connection health checks
-        pool_size=20,  # Increased pool size for better concurrency
-        max_overflow=30,  # Increased max overflow
-        pool_timeout=30,  # Add timeout setting
-        pool_recycle=1800,  # Recycle connections every 30 minutes
-    )
+    engine = create_engine(settings.DATABASE_URL, **ENGINE_OPTIONS)
+
+    # Read replicas for GET traffic (empty when DATABASE_REPLICA_URLS is unset)
+    replica_engines = [create_engine(url, **ENGINE_OPTIONS) for url in settings.database_replica_urls]
+    for index, replica_engine in enumerate(replica_engines):
+        replica_engine.pool.metrics_name = f"replica-{index}"
 
     # Create session factory
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -42,13 +56,118 @@ except Exception as e:
     raise
 
 
-def get_db():
+# Users who wrote recently, shared by the workers on this host. While a marker is
+# live the user's GETs read from the primary so they never miss their own writes.
+_recent_writers = (
+    build_cache(
+        "recent-writers",
+        maxsize=100000,
+        ttl_seconds=settings.READ_YOUR_WRITES_SECONDS,
+        codec=MarshalCodec(),
+        slot_size=96,
+    )
+    if replica_engines
+    else None
+)
+if replica_engines and not isinstance(_recent_writers, SharedMemoryCache):
+    # A per-process marker is invisible to the other workers, whose replica reads
+    # would then miss the user's own writes
+    logger.warning(
+        "Replica routing disabled: the recent-writers cache is per process "
+        "(SHARED_CACHE_ENABLED off or SHARED_CACHE_DIR missing); all reads go to the primary"
+    )
+    _recent_writers = None
+_replica_cycle = itertools.cycle(replica_engines) if _recent_writers is not None else None
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica when the request allows it and sends
+    everything else to the primary.
+
+    The choice is made on first use, after the request's dependencies (including
+    authentication) have run. Once the session writes, the rest of the request
+    stays on the primary, and on commit the user is marked as a recent writer.
+    """
+
+    def __init__(self, *args, request: Optional[Request] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.request = request
+        self._replica = None
+        self._decided = False
+        self._wrote = False
+
+    def _user_id(self) -> Optional[str]:
+        if self.request is None:
+            return None
+        return getattr(self.request.state, "user_id", None)
+
+    def _choose_replica(self):
+        if _replica_cycle is None or self.request is None or self.request.method != "GET":
+            return None
+        user_id = self._user_id()
+        if user_id is not None and _recent_writers is not None and _recent_writers.get(user_id):
+            return None
+        return next(_replica_cycle)
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or (clause is not None and not isinstance(clause, Select)):
+            # Flushes, DML and raw SQL of unknown intent all go to the primary
+            self._wrote = True
+        if self._wrote:
+            return engine
+        if not self._decided:
+            self._replica = self._choose_replica()
+            self._decided = True
+        return self._replica or engine
+
+    def commit(self) -> None:
+        super().commit()
+        user_id = self._user_id()
+        if self._wrote and user_id is not None and _recent_writers is not None:
+            _recent_writers.set(user_id, True)
+
+
+RoutingSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine
+)
+
+
+def get_db(request: Request):
     """
     Database session dependency.
     Yields a database session and ensures it's closed after use.
+    Statements run under the route class's timeout (see app.db.timeouts).
+    With replicas configured, GET requests read from a replica (see RoutingSession).
     """
-    db = SessionLocal()
+    if _replica_cycle is not None:
+        db = RoutingSessionLocal(request=request)
+    else:
+        db = SessionLocal()
+    apply_request_limits(db, request)
     try:
         yield db
     finally:
+        release_request_connections(db)
         db.close()
+
+
+def get_pool_status() -> dict:
+    """
+    Snapshot of the engine's connection pool.
+    Used by the system endpoints and load-test tooling to watch saturation.
+    """
+    status = _pool_snapshot(engine)
+    if replica_engines:
+        status["replicas"] = [_pool_snapshot(replica) for replica in replica_engines]
+    return status
+
+
+def _pool_snapshot(bound_engine) -> dict:
+    pool = bound_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
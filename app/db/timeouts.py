@@ -0,0 +1,273 @@
+"""
+Per-route-class statement timeouts and query cancellation.
+
+Every request is put in a route class (interactive, export, ingest or auth). get_db
+tags its session with the class, and each transaction the session begins runs
+`SET LOCAL statement_timeout` for that class, so a runaway query gives its pool
+connection back instead of holding it for minutes.
+
+StatementTimeoutMiddleware watches for the client going away and cancels any
+query the request still has in flight. It also turns a request that failed on a
+cancelled statement or a pool checkout timeout into a structured error (504
+for a statement timeout, 503 otherwise) instead of a generic 500.
+
+Cancellation only helps while the event loop is free to notice the disconnect,
+i.e. for queries run in a worker thread; a query issued inline from an async
+handler is bounded by its statement timeout alone. The export and aggregate
+handlers are therefore plain `def` functions, which FastAPI runs in its
+threadpool.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+from contextvars import ContextVar
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+EXPORT = "export"
+INGEST = "ingest"
+AUTH = "auth"
+
+# (methods, route path pattern, class); first match wins, anything else is interactive
+ROUTE_CLASS_RULES = (
+    ({"POST"}, re.compile(r"^/api/v1/auth/"), AUTH),
+    ({"POST", "PUT"}, re.compile(r"/bulk$"), INGEST),
+    ({"POST"}, re.compile(r"/samples$"), INGEST),
+    ({"GET"}, re.compile(r"/samples$"), EXPORT),
+    ({"GET"}, re.compile(r"/zones$"), EXPORT),
+    ({"GET"}, re.compile(r"^/api/v1/metric/.+/$"), EXPORT),
+    ({"GET"}, re.compile(r"/aggregate$"), EXPORT),
+)
+
+STATEMENT_TIMEOUTS_MS = {
+    INTERACTIVE: settings.STATEMENT_TIMEOUT_INTERACTIVE_MS,
+    EXPORT: settings.STATEMENT_TIMEOUT_EXPORT_MS,
+    INGEST: settings.STATEMENT_TIMEOUT_INGEST_MS,
+    AUTH: settings.STATEMENT_TIMEOUT_INTERACTIVE_MS,
+}
+
+_QUERY_CANCELED = "57014"  # SQLSTATE query_canceled
+
+
+def route_template(scope) -> Optional[str]:
+    """
+    Full path template of the route that matched the request (e.g.
+    /api/v1/metric/heartrate/{record_id}), or None before routing.
+
+    FastAPI keeps included routers nested, so scope["route"].path is only the
+    innermost router's part; the full template is on the effective route context.
+    """
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path_format", None)
+    if path:
+        return path
+    return getattr(scope.get("route"), "path", None)
+
+
+def classify_route(request: Request) -> str:
+    """Route class for the request, matched on the route's path template."""
+    path = route_template(request.scope) or request.url.path
+    for methods, pattern, route_class in ROUTE_CLASS_RULES:
+        if request.method in methods and pattern.search(path):
+            return route_class
+    return INTERACTIVE
+
+
+class RequestQueries:
+    """Database connections a request is using, and how its statements ended."""
+
+    def __init__(self):
+        self.route_class = INTERACTIVE
+        self.timed_out = False
+        self.cancelled = False
+        self.pool_exhausted = False
+        self._connections: List[object] = []
+        self._lock = threading.Lock()
+
+    @property
+    def failed(self) -> bool:
+        """Whether a statement was cancelled or a connection could not be had."""
+        return self.timed_out or self.cancelled or self.pool_exhausted
+
+    def track(self, dbapi_connection) -> None:
+        with self._lock:
+            self._connections.append(dbapi_connection)
+
+    def release(self) -> None:
+        # Must run before the connections go back to the pool, or a late cancel
+        # could hit whichever request checks them out next
+        with self._lock:
+            self._connections.clear()
+
+    def cancel(self) -> None:
+        with self._lock:
+            for dbapi_connection in self._connections:
+                try:
+                    dbapi_connection.cancel()
+                except Exception as e:
+                    logger.warning(f"Failed to cancel query: {str(e)}")
+
+
+_current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    """The RequestQueries of the request being served, if any."""
+    return _current_queries.get()
+
+
+def apply_request_limits(db: Session, request: Request) -> None:
+    """Tag a request session with its route class and statement timeout."""
+    route_class = classify_route(request)
+    db.info["statement_timeout_ms"] = STATEMENT_TIMEOUTS_MS[route_class]
+    queries = _current_queries.get()
+    if queries is not None:
+        queries.route_class = route_class
+        db.info["request_queries"] = queries
+
+
+def release_request_connections(db: Session) -> None:
+    queries = db.info.get("request_queries")
+    if queries is not None:
+        queries.release()
+
+
+@event.listens_for(Session, "after_begin")
+def _set_statement_timeout(session, transaction, connection) -> None:
+    timeout_ms = session.info.get("statement_timeout_ms")
+    if timeout_ms and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+    queries = session.info.get("request_queries")
+    if queries is not None:
+        queries.track(connection.connection.dbapi_connection)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _untrack_connections(session, transaction) -> None:
+    # The connection goes back to the pool when the outermost transaction ends
+    queries = session.info.get("request_queries")
+    if queries is not None and transaction.parent is None:
+        queries.release()
+
+
+@event.listens_for(Engine, "handle_error")
+def _record_cancellation(context) -> None:
+    if getattr(context.original_exception, "pgcode", None) != _QUERY_CANCELED:
+        return
+    queries = _current_queries.get()
+    if queries is None:
+        return
+    if "statement timeout" in str(context.original_exception):
+        queries.timed_out = True
+        logger.warning(
+            f"Statement timed out after {STATEMENT_TIMEOUTS_MS[queries.route_class]}ms "
+            f"({queries.route_class})"
+        )
+    else:
+        queries.cancelled = True
+
+
+def _error_body(queries: RequestQueries) -> tuple:
+    if queries.pool_exhausted:
+        return 503, {
+            "detail": "No database connection became available in time",
+            "error": "pool_exhausted",
+            "route_class": queries.route_class,
+        }
+    if queries.timed_out:
+        return 504, {
+            "detail": "The database query took too long",
+            "error": "statement_timeout",
+            "route_class": queries.route_class,
+            "timeout_ms": STATEMENT_TIMEOUTS_MS[queries.route_class],
+        }
+    return 503, {
+        "detail": "The database query was cancelled",
+        "error": "query_cancelled",
+        "route_class": queries.route_class,
+    }
+
+
+class StatementTimeoutMiddleware:
+    """ASGI middleware that cancels a disconnected client's queries and maps cancelled
+    statements to structured 503/504 responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current_queries.set(queries)
+        messages: asyncio.Queue = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def watch_client() -> None:
+            # Sole reader of the real receive channel; forwards messages to the app
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    queries.cancel()
+                    return
+
+        async def app_receive():
+            if disconnected.is_set() and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        replaced = False
+        response_started = False
+
+        async def guarded_send(message) -> None:
+            nonlocal replaced, response_started
+            if message["type"] == "http.response.start":
+                if message["status"] == 500 and queries.failed:
+                    replaced = True
+                    if not disconnected.is_set():
+                        await send_error()
+                    return
+                response_started = True
+            elif replaced:
+                return
+            await send(message)
+
+        async def send_error() -> None:
+            status_code, body = _error_body(queries)
+            payload = json.dumps(body).encode()
+            headers = [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+            ]
+            if status_code == 503:
+                headers.append((b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()))
+            await send({"type": "http.response.start", "status": status_code, "headers": headers})
+            await send({"type": "http.response.body", "body": payload})
+
+        watcher = asyncio.create_task(watch_client())
+        try:
+            await self.app(scope, app_receive, guarded_send)
+        except Exception:
+            if not queries.failed or response_started:
+                raise
+            if not disconnected.is_set():
+                await send_error()
+        finally:
+            watcher.cancel()
+            _current_queries.reset(token)
@@ -0,0 +1,60 @@
+"""
+Internal bigint user keys.
+
+The hot hourly metric tables store `auth_users.user_key` instead of the user's
+RID, which keeps their rows and every (user, time) index compact. The API still
+speaks RIDs, so the mapping is resolved here. A user's key is assigned once and
+never changes, so it is cached per process in both directions.
+"""
+
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.auth.user import AuthUser
+
+_keys_by_id: Dict[str, int] = {}
+_ids_by_key: Dict[int, str] = {}
+
+
+def _remember(user_id: str, user_key: int) -> None:
+    _keys_by_id[user_id] = user_key
+    _ids_by_key[user_key] = user_id
+
+
+def user_key_for(db: Session, user_id: str) -> Optional[int]:
+    """
+    Internal key of a user.
+
+    Args:
+        db: Session used on a cache miss
+        user_id: The user's RID
+
+    Returns:
+        The user's key, or None if there is no such user
+    """
+    user_key = _keys_by_id.get(user_id)
+    if user_key is None:
+        user_key = db.query(AuthUser.user_key).filter(AuthUser.id == user_id).scalar()
+        if user_key is not None:
+            _remember(user_id, user_key)
+    return user_key
+
+
+def user_id_for(db: Optional[Session], user_key: int) -> Optional[str]:
+    """
+    RID of the user with an internal key.
+
+    Args:
+        db: Session used on a cache miss (None to only consult the cache)
+        user_key: The user's internal key
+
+    Returns:
+        The user's RID, or None if it is unknown
+    """
+    user_id = _ids_by_key.get(user_key)
+    if user_id is None and db is not None:
+        user_id = db.query(AuthUser.id).filter(AuthUser.user_key == user_key).scalar()
+        if user_id is not None:
+            _remember(user_id, user_key)
+    return user_id
@@ -4,9 +4,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 
+from app.api.metrics import router as metrics_router
 from app.api.v1.main import router as v1_router
+from app.core.config import settings
 from app.db.init_db import create_first_superuser, init_db
+from app.db.admission import AdmissionControlMiddleware
+from app.db.archive import metric_archiver
+from app.db.instrumentation import RequestMetricsMiddleware
+from app.db.partitions import partition_maintainer
 from app.db.session import SessionLocal
+from app.db.timeouts import StatementTimeoutMiddleware
+from app.services.password_service import password_pool
+from app.services.token_service import revocation_list
+from app.services.usage_service import usage_meter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +29,8 @@ app = FastAPI(
 
 # Include API routers
 app.include_router(v1_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 
 
 # Initialize database and create first superuser
@@ -30,9 +42,37 @@ async def startup_event():
         create_first_superuser(db)
     finally:
         db.close()
+    await usage_meter.start()
+    await revocation_list.start()
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        await partition_maintainer.start()
+    if settings.METRIC_ARCHIVE_ENABLED:
+        await metric_archiver.start()
 
 
-# CORS middleware configuration
+# Flush buffered usage rows before the worker exits
+@app.on_event("shutdown")
+async def shutdown_event():
+    await usage_meter.stop()
+    await revocation_list.stop()
+    await partition_maintainer.stop()
+    await metric_archiver.stop()
+    password_pool.shutdown()
+
+
+# Cancel queries for disconnected clients; map statement timeouts to 503/504
+app.add_middleware(StatementTimeoutMiddleware)
+
+# Shed low-priority work before it queues on the connection pool
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
+# Outside the shedding and timeout middleware, so shed requests show up in the latency histograms too
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
+# CORS middleware configuration. Added last so it is outermost and the 429/503/504
+# responses produced by the middleware above carry CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, replace with specific origins
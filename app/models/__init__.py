@@ -1,19 +1,22 @@
 # Import all models explicitly
+from .auth.token_revocation import AuthTokenRevocation
 from .auth.user import AuthUser
 from .chat.conversation import ChatConversation
 from .chat.message import ChatMessage
+from .chat.usage import LlmUsage
 from .enums import DataSource
 from .goal.general import GoalGeneral
 from .goal.macros import GoalMacros
 from .goal.user_goals import UserGoal
 from .goal.templates import GoalTemplate
-from .metric.activity.miles import ActivityMiles
-from .metric.activity.steps import ActivitySteps
+from .metric.activity.miles import ActivityMiles, ActivityMilesArchive
+from .metric.activity.steps import ActivitySteps, ActivityStepsArchive
 from .metric.activity.workouts import ActivityWorkouts
 from .metric.body.composition import BodyComposition
-from .metric.body.heartrate import BodyHeartRate
-from .metric.calories.active import CaloriesActive
-from .metric.calories.baseline import CaloriesBaseline
+from .metric.body.heartrate import BodyHeartRate, BodyHeartRateArchive
+from .metric.body.heartrate_samples import BodyHeartRateSamples
+from .metric.calories.active import CaloriesActive, CaloriesActiveArchive
+from .metric.calories.baseline import CaloriesBaseline, CaloriesBaselineArchive
 from .metric.sleep.daily import SleepDaily
 from .nutrition.macros import NutritionMacros
 from .nutrition.foods import Food
@@ -21,9 +24,11 @@ from .nutrition.consumption_logs import ConsumptionLog
 from .profile.user_profile import UserProfile
 
 __all__ = [
+    "AuthTokenRevocation",
     "AuthUser",
     "ChatConversation",
     "ChatMessage",
+    "LlmUsage",
     "DataSource",
     "GoalGeneral",
     "GoalMacros",
@@ -31,11 +36,17 @@ __all__ = [
     "GoalTemplate",
     "BodyComposition",
     "BodyHeartRate",
+    "BodyHeartRateArchive",
+    "BodyHeartRateSamples",
     "ActivitySteps",
+    "ActivityStepsArchive",
     "ActivityMiles",
+    "ActivityMilesArchive",
     "ActivityWorkouts",
     "CaloriesBaseline",
+    "CaloriesBaselineArchive",
     "CaloriesActive",
+    "CaloriesActiveArchive",
     "SleepDaily",
     "NutritionMacros",
     "Food",
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class AuthTokenRevocation(Base):
+    """
+    Revoked token versions. A row revokes every token of the user whose version is
+    at or below token_version. Rows are pruned once expires_at passes, since by then
+    every token they cover has expired on its own.
+
+    No foreign key to auth_users: revocations must outlive a deleted account.
+    """
+
+    __tablename__ = "auth_token_revocations"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    token_version = Column(Integer, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "token_version", name="uq_auth_token_revocations_user_version"),
+        Index("ix_auth_token_revocations_expires_at", expires_at),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, String
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Identity, Integer, String, UniqueConstraint
 from sqlalchemy.sql import func
 
 from app.db.session import Base
@@ -8,10 +8,16 @@ class AuthUser(Base):
     __tablename__ = "auth_users"
 
     id = Column(String, primary_key=True, index=True)
+    # Compact internal key referenced by the hot metric tables (see app/db/user_keys.py)
+    user_key = Column(BigInteger, Identity(), nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    # Embedded in access tokens; bumped to revoke every token issued so far
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (UniqueConstraint("user_key", name="uq_auth_users_user_key"),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, String, ForeignKey
+from sqlalchemy import Column, DateTime, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -14,6 +14,11 @@ class ChatConversation(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     status = Column(String, default="active")
 
+    # Keyset pagination for a user's conversation list
+    __table_args__ = (
+        Index("ix_conversations_user_created", user_id, created_at.desc(), id.desc()),
+    )
+
     # Relationships
     user = relationship("AuthUser")
     chat_messages = relationship("ChatMessage", back_populates="conversation")
\ No newline at end of file
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, DateTime, String, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, DateTime, String, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
 
@@ -14,6 +15,17 @@ class ChatMessage(Base):
     user_id = Column(String, ForeignKey("auth_users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Maintained by Postgres; deferred so regular message loads don't fetch it
+    content_tsv = deferred(
+        Column(TSVECTOR, Computed("to_tsvector('english', content)", persisted=True))
+    )
+
+    __table_args__ = (
+        # Serves "latest message per conversation" lookups and ordered history reads
+        Index("ix_chat_messages_conversation_created", conversation_id, created_at.desc()),
+        Index("ix_chat_messages_user_id", user_id),
+        Index("ix_chat_messages_content_tsv", "content_tsv", postgresql_using="gin"),
+    )
 
     # Relationships
     user = relationship("AuthUser")
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class LlmUsage(Base):
+    """Append-only ledger of token usage per completion request."""
+
+    __tablename__ = "llm_usage"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, ForeignKey("auth_users.id", ondelete="CASCADE"), nullable=False)
+    conversation_id = Column(String, ForeignKey("conversations.id", ondelete="SET NULL"), nullable=True)
+    model = Column(String, nullable=False)
+    prompt_tokens = Column(Integer, nullable=False)
+    completion_tokens = Column(Integer, nullable=False)
+    total_tokens = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Per-user spend over a time range (quota seeding, billing reports)
+        Index("ix_llm_usage_user_created", user_id, created_at),
+    )
@@ -3,6 +3,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -18,7 +19,7 @@ from app.models.enums import DataSource
 class ActivityWorkouts(Base):
     __tablename__ = "activity_workouts"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("auth_users.id"), nullable=False)
     date = Column(DateTime(timezone=True), nullable=False)
     workout_name = Column(
@@ -41,7 +42,16 @@ class ActivityWorkouts(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Unique constraint to prevent duplicate workouts from same source
-    __table_args__ = (UniqueConstraint("user_id", "date", "source"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", "source"),
+        # Range reads newest first; the included values allow index-only scans
+        Index(
+            "ix_activity_workouts_user_date",
+            user_id,
+            date.desc(),
+            postgresql_include=["source", "workout_type", "duration_minutes", "calories_burned"],
+        ),
+    )
 
     # Relationships
     user = relationship("AuthUser")
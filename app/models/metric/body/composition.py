@@ -3,6 +3,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Numeric,
     String,
     UniqueConstraint,
@@ -17,7 +18,7 @@ from app.models.enums import DataSource
 class BodyComposition(Base):
     __tablename__ = "body_composition"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("auth_users.id"), nullable=False)
     date_hour = Column(DateTime(timezone=True), nullable=False)
     source = Column(
@@ -36,7 +37,21 @@ class BodyComposition(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Unique constraint to prevent duplicate measurements on same date
-    __table_args__ = (UniqueConstraint("user_id", "date_hour", "source"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "date_hour", "source"),
+        # Range reads newest first; the included values allow index-only scans
+        Index(
+            "ix_body_composition_user_date_hour",
+            user_id,
+            date_hour.desc(),
+            postgresql_include=[
+                "source",
+                "weight",
+                "body_fat_percentage",
+                "muscle_mass_percentage",
+            ],
+        ),
+    )
 
     # Relationships
     user = relationship("AuthUser")
@@ -1,27 +1,41 @@
 from sqlalchemy import (
+    ARRAY,
+    BigInteger,
     Column,
+    Date,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Identity,
+    Index,
     Integer,
     Numeric,
     String,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 from sqlalchemy.sql import func
 
 from app.db.session import Base
+from app.db.user_keys import user_id_for
 from app.models.enums import DataSource
 
 
 class BodyHeartRate(Base):
     __tablename__ = "body_heartrate"
 
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("auth_users.id"), nullable=False)
+    # Internal surrogate key; the RID in `id` is what the API exposes. The table
+    # is partitioned by month on date_hour, which the primary key must include.
+    pk = Column(BigInteger, Identity(), primary_key=True)
+    id = Column(String, nullable=False)
+    user_key = Column(
+        BigInteger,
+        ForeignKey("auth_users.user_key", name="fk_body_heartrate_user_key"),
+        nullable=False,
+    )
     date_hour = Column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), primary_key=True
     )  # Store full datetime for hourly data
     heart_rate = Column(Integer, nullable=True)  # Single heart rate reading
     min_hr = Column(Integer, nullable=True)  # Minimum heart rate in this hour
@@ -33,8 +47,73 @@ class BodyHeartRate(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Unique constraint and check constraints
-    __table_args__ = (UniqueConstraint("user_id", "date_hour", "source"),)
+    # One row per user per hour per source. A unique index on id alone is not
+    # possible on a partitioned table; RIDs are unique by construction.
+    __table_args__ = (
+        Index("ix_body_heartrate_id", id),
+        UniqueConstraint(
+            "user_key", "date_hour", "source", name="uq_body_heartrate_user_key_date_hour_source"
+        ),
+        # Range reads newest first; the included values allow index-only scans
+        Index(
+            "ix_body_heartrate_user_key_date_hour",
+            user_key,
+            date_hour.desc(),
+            postgresql_include=[
+                "source",
+                "heart_rate",
+                "min_hr",
+                "avg_hr",
+                "max_hr",
+                "resting_hr",
+                "heart_rate_variability",
+            ],
+        ),
+        # Monthly partitions are managed by app/db/partitions.py
+        {"postgresql_partition_by": "RANGE (date_hour)"},
+    )
 
     # Relationships
     user = relationship("AuthUser")
+
+    @property
+    def user_id(self) -> str:
+        """RID of the owning user"""
+        return user_id_for(object_session(self), self.user_key)
+
+
+class BodyHeartRateArchive(Base):
+    """
+    Archived body_heartrate rows, one per user, UTC day and source (see app/db/archive.py).
+
+    Each value column holds 24 entries, hour h at index h (PostgreSQL index h + 1),
+    NULL where the hour had no record; bit h of hour_mask is set when it had one.
+    """
+
+    __tablename__ = "body_heartrate_archive"
+
+    user_key = Column(
+        BigInteger,
+        ForeignKey("auth_users.user_key", name="fk_body_heartrate_archive_user_key"),
+        primary_key=True,
+    )
+    date_day = Column(Date, primary_key=True)
+    source = Column(Enum(DataSource), primary_key=True)
+    hour_mask = Column(Integer, nullable=False)
+    heart_rate = Column(ARRAY(Integer), nullable=False)
+    min_hr = Column(ARRAY(Integer), nullable=False)
+    avg_hr = Column(ARRAY(Float), nullable=False)
+    max_hr = Column(ARRAY(Integer), nullable=False)
+    resting_hr = Column(ARRAY(Integer), nullable=False)
+    heart_rate_variability = Column(ARRAY(Float), nullable=False)
+    id = Column(String, nullable=False)
+    # Id of each hour before archiving; NULL (whole array or entry) where none was kept,
+    # and that hour is exposed as "<id>.<HH>" instead
+    hour_ids = Column(ARRAY(String), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("id", name="uq_body_heartrate_archive_id"),
+        Index("ix_body_heartrate_archive_hour_ids", hour_ids, postgresql_using="gin"),
+    )
@@ -0,0 +1,50 @@
+import numpy as np
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    SmallInteger,
+)
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+from app.models.enums import DataSource
+
+
+class BodyHeartRateSamples(Base):
+    """
+    Raw heart rate samples of one user-hour from one source, delta-encoded.
+
+    offset_deltas[0] is the second within the hour of the first sample and each
+    later entry the seconds since the previous one; bpm_deltas[0] is the first
+    reading and each later entry the change from the previous one. Steady
+    sampling and slowly changing heart rates make long runs of small values,
+    which PostgreSQL compresses well. app/services/heart_rate_sample_service.py
+    encodes them.
+    """
+
+    __tablename__ = "body_heartrate_samples"
+
+    user_key = Column(
+        BigInteger,
+        ForeignKey("auth_users.user_key", name="fk_body_heartrate_samples_user_key"),
+        primary_key=True,
+    )
+    date_hour = Column(DateTime(timezone=True), primary_key=True)  # Start of the hour
+    source = Column(Enum(DataSource), primary_key=True)
+    sample_count = Column(Integer, nullable=False)
+    offset_deltas = Column(ARRAY(SmallInteger), nullable=False)
+    bpm_deltas = Column(ARRAY(SmallInteger), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def decode(self):
+        """Epoch seconds and readings of the hour as int64 arrays"""
+        base = int(self.date_hour.timestamp())
+        seconds = base + np.cumsum(np.asarray(self.offset_deltas, dtype=np.int64))
+        bpm = np.cumsum(np.asarray(self.bpm_deltas, dtype=np.int64))
+        return seconds, bpm
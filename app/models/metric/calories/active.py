@@ -1,26 +1,41 @@
 from sqlalchemy import (
+    ARRAY,
+    BigInteger,
     Column,
+    Date,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Identity,
+    Index,
+    Integer,
     Numeric,
     String,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 from sqlalchemy.sql import func
 
 from app.db.session import Base
+from app.db.user_keys import user_id_for
 from app.models.enums import DataSource
 
 
 class CaloriesActive(Base):
     __tablename__ = "calories_active"
 
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("auth_users.id"), nullable=False)
+    # Internal surrogate key; the RID in `id` is what the API exposes. The table
+    # is partitioned by month on date_hour, which the primary key must include.
+    pk = Column(BigInteger, Identity(), primary_key=True)
+    id = Column(String, nullable=False)
+    user_key = Column(
+        BigInteger,
+        ForeignKey("auth_users.user_key", name="fk_calories_active_user_key"),
+        nullable=False,
+    )
     date_hour = Column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), primary_key=True
     )  # Store full datetime for hourly data
     calories_burned = Column(Numeric, nullable=True)  # Calories burned in this hour
     source = Column(
@@ -29,8 +44,60 @@ class CaloriesActive(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Unique constraint to ensure one record per user per date per source
-    __table_args__ = (UniqueConstraint("user_id", "date_hour", "source"),)
+    # One row per user per hour per source. A unique index on id alone is not
+    # possible on a partitioned table; RIDs are unique by construction.
+    __table_args__ = (
+        Index("ix_calories_active_id", id),
+        UniqueConstraint(
+            "user_key", "date_hour", "source", name="uq_calories_active_user_key_date_hour_source"
+        ),
+        # Range reads newest first; the included values allow index-only scans
+        Index(
+            "ix_calories_active_user_key_date_hour",
+            user_key,
+            date_hour.desc(),
+            postgresql_include=["source", "calories_burned"],
+        ),
+        # Monthly partitions are managed by app/db/partitions.py
+        {"postgresql_partition_by": "RANGE (date_hour)"},
+    )
 
     # Relationships
     user = relationship("AuthUser")
+
+    @property
+    def user_id(self) -> str:
+        """RID of the owning user"""
+        return user_id_for(object_session(self), self.user_key)
+
+
+class CaloriesActiveArchive(Base):
+    """
+    Archived calories_active rows, one per user, UTC day and source (see app/db/archive.py).
+
+    Each value column holds 24 entries, hour h at index h (PostgreSQL index h + 1),
+    NULL where the hour had no record; bit h of hour_mask is set when it had one.
+    """
+
+    __tablename__ = "calories_active_archive"
+
+    user_key = Column(
+        BigInteger,
+        ForeignKey("auth_users.user_key", name="fk_calories_active_archive_user_key"),
+        primary_key=True,
+    )
+    date_day = Column(Date, primary_key=True)
+    source = Column(Enum(DataSource), primary_key=True)
+    hour_mask = Column(Integer, nullable=False)
+    calories_burned = Column(ARRAY(Float), nullable=False)
+    id = Column(String, nullable=False)
+    # Id of each hour before archiving; NULL (whole array or entry) where none was kept,
+    # and that hour is exposed as "<id>.<HH>" instead
+    hour_ids = Column(ARRAY(String), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("id", name="uq_calories_active_archive_id"),
+        Index("ix_calories_active_archive_hour_ids", hour_ids, postgresql_using="gin"),
+    )
@@ -3,6 +3,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -19,7 +20,7 @@ from app.models.enums import DataSource
 class SleepDaily(Base):
     __tablename__ = "sleep_daily"
 
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("auth_users.id"), nullable=False)
     date_day = Column(
         DateTime(timezone=True), nullable=False
@@ -47,7 +48,23 @@ class SleepDaily(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Unique constraint to ensure one record per user per sleep date per source
-    __table_args__ = (UniqueConstraint("user_id", "date_day", "source"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "date_day", "source"),
+        # Range reads newest first; the included values allow index-only scans
+        Index(
+            "ix_sleep_daily_user_date_day",
+            user_id,
+            date_day.desc(),
+            postgresql_include=[
+                "source",
+                "total_sleep_minutes",
+                "deep_sleep_minutes",
+                "light_sleep_minutes",
+                "rem_sleep_minutes",
+                "sleep_efficiency",
+            ],
+        ),
+    )
 
     # Relationships
     user = relationship("AuthUser")
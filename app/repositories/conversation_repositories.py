@@ -1,8 +1,14 @@
+from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import func, select, true, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.chat.conversation import ChatConversation
+from app.models.chat.message import ChatMessage
+
+# Characters of the latest message returned for sidebar previews
+PREVIEW_LENGTH = 200
 
 # TODO: Reconcile transaction boundaries (commit/rollback) between services and repositories.
 class ConversationRepository:
@@ -18,4 +24,48 @@ class ConversationRepository:
     def get_all(self, user_id: str) -> List[ChatConversation]:
         return self.db.query(ChatConversation).filter(
             ChatConversation.user_id == user_id
-        ).order_by(ChatConversation.created_at.desc()).all()
\ No newline at end of file
+        ).order_by(ChatConversation.created_at.desc()).all()
+
+    def list_with_preview(
+        self,
+        user_id: str,
+        limit: int,
+        before: Optional[tuple[datetime, str]] = None,
+    ) -> list:
+        """
+        One page of conversations, newest first, each with its latest message and message count.
+
+        A single LATERAL subquery per conversation walks ix_chat_messages_conversation_created
+        for the newest message; count(*) OVER () is evaluated before the LIMIT so it carries
+        the conversation's total. `before` is the (created_at, id) keyset of the previous page's last row.
+        """
+        last_message = (
+            select(
+                func.left(ChatMessage.content, PREVIEW_LENGTH).label("last_message_preview"),
+                ChatMessage.role.label("last_message_role"),
+                ChatMessage.created_at.label("last_message_at"),
+                func.count().over().label("message_count"),
+            )
+            .where(ChatMessage.conversation_id == ChatConversation.id)
+            .order_by(ChatMessage.created_at.desc())
+            .limit(1)
+            .lateral("last_message")
+        )
+        query = (
+            self.db.query(
+                ChatConversation,
+                last_message.c.last_message_preview,
+                last_message.c.last_message_role,
+                last_message.c.last_message_at,
+                func.coalesce(last_message.c.message_count, 0).label("message_count"),
+            )
+            .outerjoin(last_message, true())
+            .filter(ChatConversation.user_id == user_id)
+        )
+        if before is not None:
+            query = query.filter(tuple_(ChatConversation.created_at, ChatConversation.id) < before)
+        return (
+            query.order_by(ChatConversation.created_at.desc(), ChatConversation.id.desc())
+            .limit(limit)
+            .all()
+        )
@@ -1,7 +1,23 @@
+from html import escape
+from typing import Optional
+
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.models.chat.message import ChatMessage
 
+# Must match the configuration used by the chat_messages.content_tsv generated column
+SEARCH_CONFIG = "english"
+# ts_headline marks matches with control characters, which are stripped from the content first;
+# the headline is HTML-escaped before they become <mark> tags, so message text never renders as markup
+HEADLINE_START, HEADLINE_STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def render_headline(headline: str) -> str:
+    return escape(headline).replace(HEADLINE_START, "<mark>").replace(HEADLINE_STOP, "</mark>")
+
+
 # TODO: Reconcile transaction boundaries (commit/rollback) between services and repositories.
 class MessageRepository:
     def __init__(self, db: Session):
@@ -11,4 +27,35 @@ class MessageRepository:
         self.db.add(message)
         self.db.commit()
         self.db.refresh(message)
-        return message
\ No newline at end of file
+        return message
+
+    def search(self, user_id: str, query: str, limit: int, offset: Optional[int] = None) -> list:
+        """
+        Ranked full-text search over a user's messages.
+
+        Matching and ranking run against the GIN-indexed content_tsv column; ts_headline
+        re-parses message text, so it is applied only to the page that is returned.
+        Rows are (ChatMessage, rank, headline), the headline being escaped HTML.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(ChatMessage.content_tsv, ts_query).label("rank")
+        page = (
+            select(ChatMessage.id, rank)
+            .where(
+                ChatMessage.user_id == user_id,
+                ChatMessage.content_tsv.op("@@")(ts_query),
+            )
+            .order_by(rank.desc(), ChatMessage.created_at.desc())
+            .limit(limit)
+            .offset(offset or 0)
+            .subquery("page")
+        )
+        content = func.translate(ChatMessage.content, HEADLINE_START + HEADLINE_STOP, "")
+        headline = func.ts_headline(SEARCH_CONFIG, content, ts_query, HEADLINE_OPTIONS).label("headline")
+        rows = (
+            self.db.query(ChatMessage, page.c.rank, headline)
+            .join(page, ChatMessage.id == page.c.id)
+            .order_by(page.c.rank.desc(), ChatMessage.created_at.desc())
+            .all()
+        )
+        return [(message, rank, render_headline(headline)) for message, rank, headline in rows]
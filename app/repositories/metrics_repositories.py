@@ -1,22 +1,99 @@
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, List, Sequence, Tuple
 
 from app.models.metric.activity.miles import ActivityMiles
 from app.models.metric.activity.steps import ActivitySteps
 from app.models.metric.activity.workouts import ActivityWorkouts
 from app.models.metric.body.composition import BodyComposition
 from app.models.metric.body.heartrate import BodyHeartRate
+from app.models.metric.body.heartrate_samples import BodyHeartRateSamples
 from app.models.metric.calories.active import CaloriesActive
 from app.models.metric.calories.baseline import CaloriesBaseline
 from app.models.metric.sleep.daily import SleepDaily
 from app.models.enums import DataSource
+from app.db.archive import (
+    ARCHIVES,
+    archive_horizon,
+    archived_record,
+    archived_records,
+    delete_archived_record,
+    reaches_archive,
+    to_utc,
+    with_archived,
+)
+from app.db.user_keys import user_key_for
+
+# Trend metric -> (model, time column, value column, daily aggregate)
+DAILY_SERIES = {
+    "resting_hr": (BodyHeartRate, "date_hour", "resting_hr", "avg"),
+    "hrv": (BodyHeartRate, "date_hour", "heart_rate_variability", "avg"),
+    "weight": (BodyComposition, "date_hour", "weight", "avg"),
+    "sleep_minutes": (SleepDaily, "date_day", "total_sleep_minutes", "avg"),
+    "steps": (ActivitySteps, "date_hour", "steps", "sum"),
+}
 
 # TODO: Reconcile transaction boundaries (commit/rollback) between services and repositories.
 class MetricsRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def user_key(self, user_id: str) -> Optional[int]:
+        """Internal key the hourly metric tables store for a user"""
+        return user_key_for(self.db, user_id)
+
+    def upsert_records(self, model, key_columns: Sequence[str], rows: List[Dict[str, Any]]) -> Tuple[List[Any], int]:
+        """
+        Insert rows, or fill their non-null values into the records already at their
+        key, with one INSERT ... ON CONFLICT over all rows.
+
+        Rows with the same key are merged first, later non-null values winning, since
+        one statement cannot update a record twice. New records keep the row's id;
+        existing ones keep theirs, which is how created records are told apart.
+
+        Args:
+            model: Metric model with a unique constraint on key_columns
+            key_columns: Columns of that unique constraint
+            rows: Column values, every row with the same columns
+
+        Returns:
+            The upserted records, detached so they can be serialized after the
+            commit without being reloaded, and how many of them were created
+        """
+        merged: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            key = tuple(row[column] for column in key_columns)
+            if key in merged:
+                merged[key].update((column, value) for column, value in row.items() if value is not None and column != "id")
+            else:
+                merged[key] = dict(row)
+        if not merged:
+            return [], 0
+
+        statement = insert(model).values(list(merged.values()))
+        table = model.__table__
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                **{
+                    column: func.coalesce(statement.excluded[column], table.c[column])
+                    for column in rows[0]
+                    if column != "id" and column not in key_columns
+                },
+                "updated_at": func.now(),
+            },
+        ).returning(model)
+
+        records = list(self.db.scalars(statement))
+        for record in records:
+            self.db.expunge(record)
+        self.db.commit()
+        # A record that kept the id its row was given is one this statement created
+        new_ids = {row["id"] for row in merged.values()}
+        return records, sum(1 for record in records if record.id in new_ids)
+
 # Body Composition Repository
 
     def get_body_composition_data(self, user_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[BodyComposition]:
@@ -27,28 +104,12 @@ class MetricsRepository:
             query = query.filter(BodyComposition.date_hour <= end_date)
         return query.order_by(BodyComposition.date_hour.desc()).all()
 
-    def get_body_composition_by_date_source(self, user_id: str, date_hour: datetime, source: DataSource) -> Optional[BodyComposition]:
-        return (
-            self.db.query(BodyComposition)
-                .filter(
-                    BodyComposition.user_id == user_id,
-                    BodyComposition.date_hour == date_hour,
-                    BodyComposition.source == source,
-                )
-                .one_or_none()
-        )
-
     def create_body_composition_record(self, record: BodyComposition) -> BodyComposition:
         self.db.add(record)
         self.db.commit()
         self.db.refresh(record)
         return record
 
-    def update_body_composition_record(self, record: BodyComposition) -> BodyComposition:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
     def get_body_composition_record(self, user_id: str, record_id: str) -> Optional[BodyComposition]:
         return (
             self.db.query(BodyComposition)
@@ -70,152 +131,139 @@ class MetricsRepository:
 # Heart Rate Repository
 
     def get_heart_rate_data(self, user_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[BodyHeartRate]:
-        query = self.db.query(BodyHeartRate).filter(BodyHeartRate.user_id == user_id)
+        query = self.db.query(BodyHeartRate).filter(BodyHeartRate.user_key == self.user_key(user_id))
         if start_date:
             query = query.filter(BodyHeartRate.date_hour >= start_date)
         if end_date:
             query = query.filter(BodyHeartRate.date_hour <= end_date)
-        return query.order_by(BodyHeartRate.date_hour.desc()).all()
+        records = query.order_by(BodyHeartRate.date_hour.desc()).all()
+        return with_archived(self.db, BodyHeartRate, records, self.user_key(user_id), start_date, end_date)
 
-    def get_heart_rate_by_date_source(self, user_id: str, date_hour: datetime, source: DataSource) -> Optional[BodyHeartRate]:
+    def get_heart_rate_record(self, user_id: str, record_id: str) -> Optional[BodyHeartRate]:
+        record = self._get_heart_rate_record(user_id, record_id)
+        return record or archived_record(self.db, BodyHeartRate, self.user_key(user_id), record_id)
+
+    def _get_heart_rate_record(self, user_id: str, record_id: str) -> Optional[BodyHeartRate]:
         return (
             self.db.query(BodyHeartRate)
             .filter(
-                BodyHeartRate.user_id == user_id,
-                BodyHeartRate.date_hour == date_hour,
-                BodyHeartRate.source == source,
+                BodyHeartRate.id == record_id,
+                BodyHeartRate.user_key == self.user_key(user_id),
             )
             .one_or_none()
         )
 
-    def get_heart_rate_record(self, user_id: str, record_id: str) -> Optional[BodyHeartRate]:
+    def delete_heart_rate_record(self, user_id: str, record_id: str) -> Optional[BodyHeartRate]:
+        record = self._get_heart_rate_record(user_id, record_id)
+        if record:
+            self.db.delete(record)
+            self.db.commit()
+            return record
+        return delete_archived_record(self.db, BodyHeartRate, self.user_key(user_id), record_id)
+
+    def get_heart_rate_by_hours(self, user_id: str, source: DataSource, hours: List[datetime]) -> List[BodyHeartRate]:
         return (
             self.db.query(BodyHeartRate)
             .filter(
-                BodyHeartRate.id == record_id,
-                BodyHeartRate.user_id == user_id,
+                BodyHeartRate.user_key == self.user_key(user_id),
+                BodyHeartRate.source == source,
+                BodyHeartRate.date_hour.in_(hours),
             )
-            .one_or_none()
+            .all()
         )
 
-    def create_heart_rate_record(self, record: BodyHeartRate) -> BodyHeartRate:
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
+    def get_heart_rate_sample_hours(self, user_id: str, source: DataSource, hours: List[datetime]) -> List[BodyHeartRateSamples]:
+        return (
+            self.db.query(BodyHeartRateSamples)
+            .filter(
+                BodyHeartRateSamples.user_key == self.user_key(user_id),
+                BodyHeartRateSamples.source == source,
+                BodyHeartRateSamples.date_hour.in_(hours),
+            )
+            .all()
+        )
 
-    def update_heart_rate_record(self, record: BodyHeartRate) -> BodyHeartRate:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
+    def get_heart_rate_samples(self, user_id: str, source: Optional[DataSource] = None, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[BodyHeartRateSamples]:
+        """Sample hours overlapping the window, oldest first; all sources unless one is given"""
+        query = self.db.query(BodyHeartRateSamples).filter(BodyHeartRateSamples.user_key == self.user_key(user_id))
+        if source:
+            query = query.filter(BodyHeartRateSamples.source == source)
+        if start_date:
+            query = query.filter(BodyHeartRateSamples.date_hour > start_date - timedelta(hours=1))
+        if end_date:
+            query = query.filter(BodyHeartRateSamples.date_hour <= end_date)
+        return query.order_by(BodyHeartRateSamples.date_hour).all()
 
-    def delete_heart_rate_record(self, user_id: str, record_id: str) -> Optional[BodyHeartRate]:
-        record = self.get_heart_rate_record(user_id, record_id)
-        if record:
-            self.db.delete(record)
-            self.db.commit()
-            return record
-        return None
+    def save_heart_rate_samples(self, records: list) -> None:
+        """Add new sample hours and hourly rows and commit them with any changes to loaded ones"""
+        self.db.add_all(records)
+        self.db.commit()
 
 # Active Calories Repository
 
     def get_active_calories_data(self, user_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[CaloriesActive]:
-        query = self.db.query(CaloriesActive).filter(CaloriesActive.user_id == user_id)
+        query = self.db.query(CaloriesActive).filter(CaloriesActive.user_key == self.user_key(user_id))
         if start_date:
             query = query.filter(CaloriesActive.date_hour >= start_date)
         if end_date:
             query = query.filter(CaloriesActive.date_hour <= end_date)
-        return query.order_by(CaloriesActive.date_hour.desc()).all()
-
-    def get_active_calories_by_date_source(self, user_id: str, date_hour: datetime, source: DataSource) -> Optional[CaloriesActive]:
-        return (
-            self.db.query(CaloriesActive)
-            .filter(
-                CaloriesActive.user_id == user_id,
-                CaloriesActive.date_hour == date_hour,
-                CaloriesActive.source == source,
-            )
-            .one_or_none()
-        )
+        records = query.order_by(CaloriesActive.date_hour.desc()).all()
+        return with_archived(self.db, CaloriesActive, records, self.user_key(user_id), start_date, end_date)
 
     def get_active_calories_record(self, user_id: str, record_id: str) -> Optional[CaloriesActive]:
+        record = self._get_active_calories_record(user_id, record_id)
+        return record or archived_record(self.db, CaloriesActive, self.user_key(user_id), record_id)
+
+    def _get_active_calories_record(self, user_id: str, record_id: str) -> Optional[CaloriesActive]:
         return (
             self.db.query(CaloriesActive)
             .filter(
                 CaloriesActive.id == record_id,
-                CaloriesActive.user_id == user_id,
+                CaloriesActive.user_key == self.user_key(user_id),
             )
             .one_or_none()
         )
 
-    def create_active_calories_record(self, record: CaloriesActive) -> CaloriesActive:
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
-    def update_active_calories_record(self, record: CaloriesActive) -> CaloriesActive:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
     def delete_active_calories_record(self, user_id: str, record_id: str) -> Optional[CaloriesActive]:
-        record = self.get_active_calories_record(user_id, record_id)
+        record = self._get_active_calories_record(user_id, record_id)
         if record:
             self.db.delete(record)
             self.db.commit()
             return record
-        return None
+        return delete_archived_record(self.db, CaloriesActive, self.user_key(user_id), record_id)
 
 # Baseline Calories Repository
 
     def get_baseline_calories_data(self, user_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[CaloriesBaseline]:
-        query = self.db.query(CaloriesBaseline).filter(CaloriesBaseline.user_id == user_id)
+        query = self.db.query(CaloriesBaseline).filter(CaloriesBaseline.user_key == self.user_key(user_id))
         if start_date:
             query = query.filter(CaloriesBaseline.date_hour >= start_date)
         if end_date:
             query = query.filter(CaloriesBaseline.date_hour <= end_date)
-        return query.order_by(CaloriesBaseline.date_hour.desc()).all()
-
-    def get_baseline_calories_by_date_source(self, user_id: str, date_hour: datetime, source: DataSource) -> Optional[CaloriesBaseline]:
-        return (
-            self.db.query(CaloriesBaseline)
-            .filter(
-                CaloriesBaseline.user_id == user_id,
-                CaloriesBaseline.date_hour == date_hour,
-                CaloriesBaseline.source == source,
-            )
-            .one_or_none()
-        )
+        records = query.order_by(CaloriesBaseline.date_hour.desc()).all()
+        return with_archived(self.db, CaloriesBaseline, records, self.user_key(user_id), start_date, end_date)
 
     def get_baseline_calories_record(self, user_id: str, record_id: str) -> Optional[CaloriesBaseline]:
+        record = self._get_baseline_calories_record(user_id, record_id)
+        return record or archived_record(self.db, CaloriesBaseline, self.user_key(user_id), record_id)
+
+    def _get_baseline_calories_record(self, user_id: str, record_id: str) -> Optional[CaloriesBaseline]:
         return (
             self.db.query(CaloriesBaseline)
             .filter(
                 CaloriesBaseline.id == record_id,
-                CaloriesBaseline.user_id == user_id,
+                CaloriesBaseline.user_key == self.user_key(user_id),
             )
             .one_or_none()
         )
 
-    def create_baseline_calories_record(self, record: CaloriesBaseline) -> CaloriesBaseline:
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
-    def update_baseline_calories_record(self, record: CaloriesBaseline) -> CaloriesBaseline:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
     def delete_baseline_calories_record(self, user_id: str, record_id: str) -> Optional[CaloriesBaseline]:
-        record = self.get_baseline_calories_record(user_id, record_id)
+        record = self._get_baseline_calories_record(user_id, record_id)
         if record:
             self.db.delete(record)
             self.db.commit()
             return record
-        return None
+        return delete_archived_record(self.db, CaloriesBaseline, self.user_key(user_id), record_id)
 
 # Sleep Daily Repository
 
@@ -227,17 +275,6 @@ class MetricsRepository:
             query = query.filter(SleepDaily.date_day <= end_date)
         return query.order_by(SleepDaily.date_day.desc()).all()
 
-    def get_sleep_daily_by_date_source(self, user_id: str, date_day: datetime, source: DataSource) -> Optional[SleepDaily]:
-        return (
-            self.db.query(SleepDaily)
-            .filter(
-                SleepDaily.user_id == user_id,
-                SleepDaily.date_day == date_day,
-                SleepDaily.source == source,
-            )
-            .one_or_none()
-        )
-
     def get_sleep_daily_record(self, user_id: str, record_id: str) -> Optional[SleepDaily]:
         return (
             self.db.query(SleepDaily)
@@ -248,17 +285,6 @@ class MetricsRepository:
             .one_or_none()
         )
 
-    def create_sleep_daily_record(self, record: SleepDaily) -> SleepDaily:
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
-    def update_sleep_daily_record(self, record: SleepDaily) -> SleepDaily:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
     def delete_sleep_daily_record(self, user_id: str, record_id: str) -> Optional[SleepDaily]:
         record = self.get_sleep_daily_record(user_id, record_id)
         if record:
@@ -270,74 +296,48 @@ class MetricsRepository:
 # Miles Repository
 
     def get_miles_data(self, user_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[ActivityMiles]:
-        query = self.db.query(ActivityMiles).filter(ActivityMiles.user_id == user_id)
+        query = self.db.query(ActivityMiles).filter(ActivityMiles.user_key == self.user_key(user_id))
         if start_date:
             query = query.filter(ActivityMiles.date_hour >= start_date)
         if end_date:
             query = query.filter(ActivityMiles.date_hour <= end_date)
         records = query.order_by(ActivityMiles.date_hour.desc()).all()
-        return records
+        return with_archived(self.db, ActivityMiles, records, self.user_key(user_id), start_date, end_date)
 
     def get_miles_data_by_id(self, user_id: str, record_id: str) -> ActivityMiles:
-        return self.db.query(ActivityMiles).filter(ActivityMiles.id == record_id, ActivityMiles.user_id == user_id).first()
-
-    def get_miles_data_by_date_hour_source(self, user_id: str, date_hour: datetime, source: str) -> Optional[ActivityMiles]:
-        return self.db.query(ActivityMiles).filter(ActivityMiles.user_id == user_id, ActivityMiles.date_hour == date_hour, ActivityMiles.source == source).first()
-
-    def create_new_miles_record(self, record: ActivityMiles) -> ActivityMiles:
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
-    def update_miles_record(self, record: ActivityMiles) -> ActivityMiles:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
+        record = self.db.query(ActivityMiles).filter(ActivityMiles.id == record_id, ActivityMiles.user_key == self.user_key(user_id)).first()
+        return record or archived_record(self.db, ActivityMiles, self.user_key(user_id), record_id)
 
     def delete_miles_record(self, user_id: str, record_id: str) -> Optional[ActivityMiles]:
-        record = self.db.query(ActivityMiles).filter(ActivityMiles.id == record_id, ActivityMiles.user_id == user_id).first()
+        record = self.db.query(ActivityMiles).filter(ActivityMiles.id == record_id, ActivityMiles.user_key == self.user_key(user_id)).first()
         if record:
             self.db.delete(record)
             self.db.commit()
             return record
-        return None
+        return delete_archived_record(self.db, ActivityMiles, self.user_key(user_id), record_id)
 
 # Steps Repository
 
     def get_steps_data(self, user_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[ActivitySteps]:
-        query = self.db.query(ActivitySteps).filter(ActivitySteps.user_id == user_id)
+        query = self.db.query(ActivitySteps).filter(ActivitySteps.user_key == self.user_key(user_id))
         if start_date:
             query = query.filter(ActivitySteps.date_hour >= start_date)
         if end_date:
             query = query.filter(ActivitySteps.date_hour <= end_date)
         records = query.order_by(ActivitySteps.date_hour.desc()).all()
-        return records
-
-    def get_steps_data_by_date_hour_source(self, user_id: str, date_hour: datetime, source: str) -> Optional[ActivitySteps]:
-        return self.db.query(ActivitySteps).filter(ActivitySteps.user_id == user_id, ActivitySteps.date_hour == date_hour, ActivitySteps.source == source).first()
-
-    def update_steps_record(self, record: ActivitySteps) -> ActivitySteps:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
-    def create_new_steps_record(self, record: ActivitySteps) -> ActivitySteps:
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
+        return with_archived(self.db, ActivitySteps, records, self.user_key(user_id), start_date, end_date)
 
     def get_steps_data_by_id(self, user_id: str, record_id: str) -> Optional[ActivitySteps]:
-        return self.db.query(ActivitySteps).filter(ActivitySteps.id == record_id, ActivitySteps.user_id == user_id).first()
+        record = self.db.query(ActivitySteps).filter(ActivitySteps.id == record_id, ActivitySteps.user_key == self.user_key(user_id)).first()
+        return record or archived_record(self.db, ActivitySteps, self.user_key(user_id), record_id)
 
     def delete_steps_record(self, user_id: str, record_id: str) -> Optional[ActivitySteps]:
-        record = self.db.query(ActivitySteps).filter(ActivitySteps.id == record_id, ActivitySteps.user_id == user_id).first()
+        record = self.db.query(ActivitySteps).filter(ActivitySteps.id == record_id, ActivitySteps.user_key == self.user_key(user_id)).first()
         if record:
             self.db.delete(record)
             self.db.commit()
             return record
-        return None
+        return delete_archived_record(self.db, ActivitySteps, self.user_key(user_id), record_id)
 
 
 # Workouts Repository
@@ -354,20 +354,6 @@ class MetricsRepository:
     def get_workouts_data_by_id(self, user_id: str, record_id: str) -> Optional[ActivityWorkouts]:
         return self.db.query(ActivityWorkouts).filter(ActivityWorkouts.id == record_id, ActivityWorkouts.user_id == user_id).first()
 
-    def get_workouts_data_by_date_source(self, user_id: str, date: datetime, source: str) -> Optional[ActivityWorkouts]:
-        return self.db.query(ActivityWorkouts).filter(ActivityWorkouts.user_id == user_id, ActivityWorkouts.date == date, ActivityWorkouts.source == source).first()
-
-    def update_workouts_record(self, record: ActivityWorkouts) -> ActivityWorkouts:
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
-    def create_new_workouts_record(self, record: ActivityWorkouts) -> ActivityWorkouts:
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
-
     def delete_workouts_record(self, user_id: str, record_id: str) -> Optional[ActivityWorkouts]:
         record = self.db.query(ActivityWorkouts).filter(ActivityWorkouts.id == record_id, ActivityWorkouts.user_id == user_id).first()
         if record:
@@ -375,3 +361,154 @@ class MetricsRepository:
             self.db.commit()
             return record
         return None
+
+
+# Aggregate Helpers
+
+    def get_latest_weight_record(self, user_id: str) -> Optional[BodyComposition]:
+        return (
+            self.db.query(BodyComposition)
+            .filter(
+                BodyComposition.user_id == user_id,
+                BodyComposition.weight.isnot(None),
+            )
+            .order_by(BodyComposition.date_hour.desc())
+            .first()
+        )
+
+    def get_steps_total(self, user_id: str, start_date: datetime, end_date: datetime) -> Optional[int]:
+        # Archived days are summed from their unpacked hours, the rest in SQL
+        cold_steps = []
+        if reaches_archive(start_date):
+            horizon = archive_horizon()
+            cold_end = min(to_utc(end_date), horizon - timedelta(microseconds=1))
+            cold_steps = [r.steps for r in self.get_steps_data(user_id, start_date, cold_end) if r.steps is not None]
+            start_date = horizon
+        total = (
+            self.db.query(func.sum(ActivitySteps.steps))
+            .filter(
+                ActivitySteps.user_key == self.user_key(user_id),
+                ActivitySteps.date_hour >= start_date,
+                ActivitySteps.date_hour <= end_date,
+            )
+            .scalar()
+        )
+        if cold_steps:
+            total = (total or 0) + sum(cold_steps)
+        return int(total) if total is not None else None
+
+    def get_sleep_minutes_average(self, user_id: str, start_date: datetime, end_date: datetime) -> Optional[float]:
+        average = (
+            self.db.query(func.avg(SleepDaily.total_sleep_minutes))
+            .filter(
+                SleepDaily.user_id == user_id,
+                SleepDaily.date_day >= start_date,
+                SleepDaily.date_day <= end_date,
+            )
+            .scalar()
+        )
+        return float(average) if average is not None else None
+
+    def get_daily_series(self, user_id: str, metric: str, start_date: datetime) -> List[Tuple[date, float]]:
+        """Daily (UTC) values of a DAILY_SERIES metric from start_date on, oldest first"""
+        model, time_name, value_name, aggregate = DAILY_SERIES[metric]
+        time_column, value_column = getattr(model, time_name), getattr(model, value_name)
+        daily = {}
+        # Days before the horizon are aggregated from their hours (archived, or not
+        # archived yet), the rest in SQL
+        if model in ARCHIVES and reaches_archive(start_date):
+            horizon = archive_horizon()
+            user_key, cold_end = self.user_key(user_id), horizon - timedelta(microseconds=1)
+            hourly = (
+                self.db.query(model)
+                .filter(model.user_key == user_key, time_column >= start_date, time_column <= cold_end)
+                .all()
+            )
+            cold = {}
+            for record in with_archived(self.db, model, hourly, user_key, start_date, cold_end):
+                value = getattr(record, value_name)
+                if value is not None:
+                    cold.setdefault(to_utc(record.date_hour).date(), []).append(float(value))
+            daily = {day: sum(values) if aggregate == "sum" else sum(values) / len(values) for day, values in cold.items()}
+            start_date = horizon
+
+        owner = model.user_key == self.user_key(user_id) if model in ARCHIVES else model.user_id == user_id
+        if time_name == "date_day":
+            # Already one timestamp per day: group on the indexed column and fold into UTC dates here
+            rows = (
+                self.db.query(time_column, func.sum(value_column), func.count(value_column))
+                .filter(owner, time_column >= start_date, value_column.isnot(None))
+                .group_by(time_column)
+                .all()
+            )
+            totals = {}
+            for day_start, total, count in rows:
+                running = totals.setdefault(to_utc(day_start).date(), [0.0, 0])
+                running[0] += float(total)
+                running[1] += count
+            daily.update((day, total if aggregate == "sum" else total / count) for day, (total, count) in totals.items())
+            return sorted(daily.items())
+
+        day = func.date(func.timezone("UTC", time_column))
+        rows = (
+            self.db.query(day, getattr(func, aggregate)(value_column))
+            .filter(owner, time_column >= start_date, value_column.isnot(None))
+            .group_by(day)
+            .all()
+        )
+        daily.update((row_day, float(value)) for row_day, value in rows)
+        return sorted(daily.items())
+
+    def get_heart_rate_series(self, user_id: str, start_date: datetime, end_date: datetime) -> list:
+        """(epoch seconds, avg_hr, heart_rate) of every hour and source in the window, archived hours included"""
+        user_key = self.user_key(user_id)
+        rows = (
+            self.db.query(
+                func.extract("epoch", BodyHeartRate.date_hour),
+                BodyHeartRate.avg_hr,
+                BodyHeartRate.heart_rate,
+            )
+            .filter(
+                BodyHeartRate.user_key == user_key,
+                BodyHeartRate.date_hour >= start_date,
+                BodyHeartRate.date_hour <= end_date,
+            )
+            .all()
+        )
+        if reaches_archive(start_date):
+            rows += [
+                (record.date_hour.timestamp(), record.avg_hr, record.heart_rate)
+                for record in archived_records(self.db, BodyHeartRate, user_key, start_date, end_date)
+            ]
+        return rows
+
+    def get_heart_rate_averages(self, user_id: str, start_date: datetime, end_date: datetime) -> tuple:
+        """Return (avg_hr, avg_resting_hr) over the window; either may be None"""
+        # Averages are combined from sums and counts so archived days can join in
+        cold = []
+        if reaches_archive(start_date):
+            horizon = archive_horizon()
+            cold = self.get_heart_rate_data(user_id, start_date, min(to_utc(end_date), horizon - timedelta(microseconds=1)))
+            start_date = horizon
+        hr_sum, hr_count, resting_sum, resting_count = (
+            self.db.query(
+                func.sum(BodyHeartRate.avg_hr),
+                func.count(BodyHeartRate.avg_hr),
+                func.sum(BodyHeartRate.resting_hr),
+                func.count(BodyHeartRate.resting_hr),
+            )
+            .filter(
+                BodyHeartRate.user_key == self.user_key(user_id),
+                BodyHeartRate.date_hour >= start_date,
+                BodyHeartRate.date_hour <= end_date,
+            )
+            .one()
+        )
+        hr_values = [float(r.avg_hr) for r in cold if r.avg_hr is not None]
+        resting_values = [float(r.resting_hr) for r in cold if r.resting_hr is not None]
+        hr_total, hr_count = float(hr_sum or 0) + sum(hr_values), hr_count + len(hr_values)
+        resting_total, resting_count = float(resting_sum or 0) + sum(resting_values), resting_count + len(resting_values)
+        return (
+            hr_total / hr_count if hr_count else None,
+            resting_total / resting_count if resting_count else None,
+        )
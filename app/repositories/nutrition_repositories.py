@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.nutrition.macros import NutritionMacros
@@ -193,3 +194,20 @@ class NutritionRepository:
             query = query.join(Food).filter(Food.name.ilike(f"%{food_name}%"))
         records = query.order_by(ConsumptionLog.logged_at.desc()).all()
         return records
+
+    def get_consumption_totals(self, user_id: str, start_date: datetime, end_date: datetime) -> tuple:
+        """Return (calories, protein, carbs, fat) summed in the database; None when nothing was logged"""
+        return (
+            self.db.query(
+                func.sum(ConsumptionLog.calories_total),
+                func.sum(ConsumptionLog.protein_total),
+                func.sum(ConsumptionLog.carbs_total),
+                func.sum(ConsumptionLog.fat_total),
+            )
+            .filter(
+                ConsumptionLog.user_id == user_id,
+                ConsumptionLog.logged_at >= start_date,
+                ConsumptionLog.logged_at <= end_date,
+            )
+            .one()
+        )
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.auth.token_revocation import AuthTokenRevocation
+
+
+class TokenRevocationRepository:
+    """Data access helpers for the auth_token_revocations table."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, revocation: AuthTokenRevocation) -> None:
+        """Stage a revocation row; the caller commits alongside the version bump."""
+        self.db.add(revocation)
+
+    def get_active_versions(self, now: datetime) -> List[tuple]:
+        """Return (user_id, highest revoked version) for revocations that have not expired."""
+        return (
+            self.db.query(AuthTokenRevocation.user_id, func.max(AuthTokenRevocation.token_version))
+            .filter(AuthTokenRevocation.expires_at > now)
+            .group_by(AuthTokenRevocation.user_id)
+            .all()
+        )
+
+    def delete_expired(self, now: datetime) -> int:
+        """Remove revocations whose tokens have all expired."""
+        deleted = (
+            self.db.query(AuthTokenRevocation)
+            .filter(AuthTokenRevocation.expires_at <= now)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
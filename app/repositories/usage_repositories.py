@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.chat.usage import LlmUsage
+
+
+class UsageRepository:
+    """Data access helpers for the llm_usage ledger."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bulk_create(self, entries: List[dict]) -> None:
+        """Insert a batch of ledger rows in one executemany round trip."""
+        if not entries:
+            return
+        self.db.bulk_insert_mappings(LlmUsage, entries)
+        self.db.commit()
+
+    def get_hourly_totals(self, user_id: str, since: datetime) -> List[tuple]:
+        """Return (hour_start, total_tokens) pairs for the user's usage since the given time."""
+        hour = func.date_trunc("hour", LlmUsage.created_at)
+        return (
+            self.db.query(hour, func.sum(LlmUsage.total_tokens))
+            .filter(LlmUsage.user_id == user_id, LlmUsage.created_at >= since)
+            .group_by(hour)
+            .all()
+        )
@@ -3,6 +3,7 @@
 
 # Auth schemas
 from .auth.user import (
+    AuthPrincipal,
     Token,
     TokenData,
     UserCreate,
@@ -91,6 +92,13 @@ from .metric.body.heartrate import (
     HeartRateExportRecord,
     HeartRateExportResponse,
     HeartRateResponse,
+    HeartRateSamplesIngestResponse,
+    HeartRateSamplesResponse,
+    HeartRateSamplesUpload,
+    HeartRateZone,
+    HeartRateZoneDay,
+    HeartRateZonesResponse,
+    HeartRateZoneWorkout,
 )
 from .metric.calories.active import (
     ActiveCaloriesDataPoint,
@@ -151,9 +159,16 @@ from .profile.user_profile import (
     UserProfileRead,
     UserProfileUpdate,
 )
+from .insights.trends import (
+    MetricTrend,
+    TrendMetric,
+    TrendPoint,
+    TrendsResponse,
+)
 
 __all__ = [
     # Auth
+    "AuthPrincipal",
     "Token",
     "TokenData",
     "UserCreate",
@@ -203,6 +218,13 @@ __all__ = [
     "HeartRateExportRecord",
     "HeartRateExportResponse",
     "HeartRateResponse",
+    "HeartRateSamplesIngestResponse",
+    "HeartRateSamplesResponse",
+    "HeartRateSamplesUpload",
+    "HeartRateZone",
+    "HeartRateZoneDay",
+    "HeartRateZonesResponse",
+    "HeartRateZoneWorkout",
     # Metric - Activity
     "StepsDataPoint",
     "StepsMetric",
@@ -268,4 +290,9 @@ __all__ = [
     "UserProfileRead",
     "UserProfileUpdate",
     "UserProfileDeleteResponse",
+    # Insights
+    "MetricTrend",
+    "TrendMetric",
+    "TrendPoint",
+    "TrendsResponse",
 ]
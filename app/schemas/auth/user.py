@@ -31,6 +31,21 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class AuthPrincipal(BaseModel):
+    """Immutable auth fields resolved for an authenticated request."""
+
+    id: str
+    email: str
+    full_name: str | None = None
+    is_active: bool
+    is_superuser: bool = False
+    token_version: int = 0
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 class AuthEnvelopeOut(BaseModel):
     access_token: str
     token_type: str = "bearer"
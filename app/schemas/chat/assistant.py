@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ChatRequest(BaseModel):
     message: str
@@ -20,6 +20,17 @@ class ConversationResponse(BaseModel):
     updated_at: Optional[datetime] = None
     status: str
 
+class ConversationSummaryResponse(ConversationResponse):
+    title: Optional[str] = None
+    last_message_preview: Optional[str] = None
+    last_message_role: Optional[str] = None
+    last_message_at: Optional[datetime] = None
+    message_count: int = 0
+
+class ConversationListResponse(BaseModel):
+    records: List[ConversationSummaryResponse]
+    next_cursor: Optional[str] = None
+
 class MessageCreate(BaseModel):
     content: str
     role: str
@@ -31,4 +42,17 @@ class MessageResponse(BaseModel):
     content: str
     role: str
     created_at: datetime
-    updated_at: Optional[datetime] = None
\ No newline at end of file
+    updated_at: Optional[datetime] = None
+
+class MessageSearchResult(BaseModel):
+    id: str
+    conversation_id: str
+    role: str
+    created_at: datetime
+    headline: str
+    rank: float
+
+class MessageSearchResponse(BaseModel):
+    query: str
+    records: List[MessageSearchResult]
+    has_more: bool
@@ -0,0 +1,49 @@
+from datetime import date
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TrendMetric(str, Enum):
+    """Metric series the trends endpoint covers"""
+
+    RESTING_HR = "resting_hr"
+    HRV = "hrv"
+    WEIGHT = "weight"
+    SLEEP_MINUTES = "sleep_minutes"
+    STEPS = "steps"
+
+
+class TrendPoint(BaseModel):
+    day: date
+    value: float = Field(..., description="Daily value (steps summed, everything else averaged)")
+    rolling_mean: float = Field(..., description="Mean of the days with data in the last 7 days")
+    ewma: float = Field(..., description="Exponentially weighted moving average over readings (span 7)")
+    z_score: Optional[float] = Field(
+        None, description="Deviation from the preceding 28 days in standard deviations, when they hold 7+ readings"
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class MetricTrend(BaseModel):
+    metric: TrendMetric
+    latest: Optional[TrendPoint] = Field(None, description="Most recent day with data")
+    percentile: Optional[float] = Field(
+        None, description="Percentile rank (0-100) of the latest value among the last year's days"
+    )
+    p10: Optional[float] = Field(None, description="10th percentile of the last year's days")
+    median: Optional[float] = Field(None, description="Median of the last year's days")
+    p90: Optional[float] = Field(None, description="90th percentile of the last year's days")
+    history_days: int = Field(..., description="Days with data in the last year")
+    points: List[TrendPoint] = Field(..., description="Days with data in the requested window, oldest first")
+
+    class Config:
+        from_attributes = True
+
+
+class TrendsResponse(BaseModel):
+    user_id: str
+    metrics: List[MetricTrend]
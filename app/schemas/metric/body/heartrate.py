@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -94,3 +94,85 @@ class HeartRateBulkCreateResponse(BaseModel):
     updated_count: int
     total_processed: int
     records: List[HeartRateResponse]
+
+
+# Raw Sample Schemas
+MAX_SAMPLES_PER_UPLOAD = 172_800  # Two days at 1 Hz
+
+
+class HeartRateSamplesUpload(BaseModel):
+    source: DataSource = Field(..., description="Source of the samples")
+    start: datetime = Field(
+        ..., description="Time of the first sample, or of offset 0 when offsets are given"
+    )
+    interval_seconds: float = Field(
+        1.0, gt=0, le=3600, description="Spacing of evenly spaced samples (ignored when offsets are given)"
+    )
+    offsets: Optional[List[float]] = Field(
+        None, description="Seconds from start of each sample, for irregular sampling"
+    )
+    bpm: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_SAMPLES_PER_UPLOAD,
+        description="Heart rate readings in BPM (1-300), one per sample",
+    )
+
+
+class HeartRateSamplesIngestResponse(BaseModel):
+    message: str
+    samples_received: int
+    hours_updated: int
+    records: List[HeartRateResponse] = Field(
+        ..., description="Hourly summaries computed from the samples"
+    )
+
+
+class HeartRateSamplesResponse(BaseModel):
+    user_id: str
+    source: DataSource
+    start: Optional[datetime] = Field(None, description="Time of the first sample")
+    offsets: List[int] = Field(..., description="Seconds from start of each sample")
+    bpm: List[int] = Field(..., description="Heart rate reading of each sample")
+    total_count: int
+
+
+# Zone Schemas
+class HeartRateZone(BaseModel):
+    zone: int = Field(..., description="0 is below zone 1; zones 1-5 are the training zones")
+    name: str
+    min_bpm: Optional[int] = Field(None, description="First BPM of the zone")
+    max_bpm: Optional[int] = Field(None, description="Last BPM of the zone")
+
+
+class HeartRateZoneWorkout(BaseModel):
+    workout_id: str
+    workout_name: Optional[str]
+    workout_type: str
+    start: datetime
+    duration_minutes: Optional[int]
+    seconds_in_zone: List[int] = Field(..., description="Seconds spent in each zone, indexed by zone")
+    estimated: bool = Field(
+        ..., description="No samples covered the workout; all of it is put in the zone of its average heart rate"
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class HeartRateZoneDay(BaseModel):
+    day: date
+    seconds_in_zone: List[int] = Field(..., description="Seconds spent in each zone, indexed by zone")
+    workouts: List[HeartRateZoneWorkout]
+
+    class Config:
+        from_attributes = True
+
+
+class HeartRateZonesResponse(BaseModel):
+    user_id: str
+    max_hr: int = Field(..., description="Estimated maximum heart rate (220 - age)")
+    resting_hr: int = Field(..., description="Average resting heart rate of the last 30 days")
+    zones: List[HeartRateZone]
+    days: List[HeartRateZoneDay]
+    total_seconds_in_zone: List[int] = Field(..., description="Seconds in each zone over all days")
@@ -1,24 +1,34 @@
+import ipaddress
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.rate_limit import TokenBucketLimiter, build_bucket_backend
 from app.core.rid import generate_rid
-from app.db.session import get_db
+from app.core.shared_cache import ModelCodec, build_cache
+from app.db.session import SessionLocal
+from app.models.auth.token_revocation import AuthTokenRevocation
 from app.models.auth.user import AuthUser
+from app.repositories.token_revocation_repositories import TokenRevocationRepository
 from app.repositories.user_repositories import UserRepository
-from app.schemas.auth.user import UserUpdate
+from app.schemas.auth.user import AuthPrincipal, UserUpdate
+from app.services.password_service import password_pool
+from app.services.token_service import revocation_list
 
 # Security configuration
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+# Built once so signing and verification skip per-call key construction
+_SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+
 # Configure password hashing
 pwd_context = CryptContext(
     schemes=["bcrypt"],
@@ -26,6 +36,37 @@ pwd_context = CryptContext(
     bcrypt__rounds=10,  # Reduced from 12 to 10 for better performance while maintaining security
 )
 
+# Authenticated principals by user id, so most requests skip the users lookup.
+# Shared by all workers on the host, so profile update/delete invalidates everywhere;
+# the short TTL still bounds staleness across hosts or with the per-process fallback.
+_principal_cache = build_cache(
+    "auth-principals",
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    codec=ModelCodec(AuthPrincipal),
+    slot_size=256,
+)
+
+# Login attempt throttling, checked before any database or bcrypt work
+_login_bucket_backend = build_bucket_backend(
+    settings.LOGIN_RATE_LIMIT_BACKEND,
+    redis_url=settings.LOGIN_RATE_LIMIT_REDIS_URL,
+    max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+)
+_login_ip_limiter = TokenBucketLimiter(
+    "login-ip",
+    capacity=settings.LOGIN_RATE_LIMIT_IP_CAPACITY,
+    refill_per_minute=settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+    backend=_login_bucket_backend,
+)
+_login_email_limiter = TokenBucketLimiter(
+    "login-email",
+    capacity=settings.LOGIN_RATE_LIMIT_EMAIL_CAPACITY,
+    refill_per_minute=settings.LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE,
+    backend=_login_bucket_backend,
+)
+_trusted_proxies = settings.trusted_proxy_networks
+
 
 # Classes
 
@@ -35,8 +76,9 @@ class AuthService:
         self.repository = UserRepository(db)  # ← Add repository
 
 
-    def create_user(self, email: str, password: str, full_name: Optional[str] = None) -> AuthUser:
-        hashed_password = get_password_hash(password)
+    async def create_user(self, email: str, password: str, full_name: Optional[str] = None) -> AuthUser:
+        # bcrypt runs on the password pool so the event loop stays responsive
+        hashed_password = await password_pool.run(get_password_hash, password)
         user_id = generate_rid("auth", "user")
         db_user = AuthUser(
             id=user_id, email=email, hashed_password=hashed_password, full_name=full_name
@@ -61,37 +103,73 @@ class AuthService:
         else:
             expire = datetime.now(timezone.utc) + timedelta(minutes=15)
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
 
-    def authenticate_user(self, email: str, password: str) -> Optional[AuthUser]:
+    async def authenticate_user(self, email: str, password: str) -> Optional[AuthUser]:
         user = self.db.query(AuthUser).filter(AuthUser.email == email).first()
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):  # type: ignore
+        if not await password_pool.run(verify_password, password, user.hashed_password):
             return None
         return user
 
 
     def verify_token(self, token: str) -> Optional[str]:
         """Verify JWT token and return the user ID if valid"""
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id: str | None = payload.get("sub")
-            if user_id is None:
-                return None
-            return user_id
-        except JWTError:
-            return None
+        claims = decode_access_token(token)
+        return claims.get("sub") if claims else None
 
     
     def update_user_profile(self, user_id: str, update_data: UserUpdate) -> AuthUser:
-        return self.repository.update(user_id, update_data)
+        user = self.repository.get_by_id(user_id)
+        previous_claims = build_token_claims(user) if user is not None else None
+        user = self.repository.update(user_id, update_data)
+        if build_token_claims(user) != previous_claims:
+            # Issued tokens still carry the old email/is_active/is_superuser claims
+            self.revoke_tokens(user_id)
+            self.db.refresh(user)
+        else:
+            invalidate_principal(user_id)
+        return user
 
 
     def delete_user(self, user_id: str) -> AuthUser:
-        return self.repository.delete(user_id)
+        user = self.repository.get_by_id(user_id)
+        if user is not None:
+            # Committed together with the delete below
+            self._stage_revocation(user)
+        user = self.repository.delete(user_id)
+        revocation_list.add(user_id, user.token_version)  # type: ignore
+        invalidate_principal(user_id)
+        return user
+
+
+    def revoke_tokens(self, user_id: str) -> None:
+        """Revoke every token issued to the user so far"""
+        user = self.repository.get_by_id(user_id)
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        revoked_version = self._stage_revocation(user)
+        user.token_version = revoked_version + 1  # type: ignore
+        self.db.commit()
+        revocation_list.add(user_id, revoked_version)
+        invalidate_principal(user_id)
+
+
+    def _stage_revocation(self, user: AuthUser) -> int:
+        # Tokens at this version are all expired once the longest token lifetime has passed
+        version: int = user.token_version  # type: ignore
+        TokenRevocationRepository(self.db).add(
+            AuthTokenRevocation(
+                id=generate_rid("auth", "revocation"),
+                user_id=user.id,
+                token_version=version,
+                expires_at=datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+            )
+        )
+        return version
 
 
 # Utilitiy functions
@@ -115,12 +193,97 @@ def get_password_hash(password: str) -> str:
         )
 
 
+def build_token_claims(user) -> dict:
+    """Claims embedded in access tokens so requests can authorize without a lookup"""
+    return {
+        "sub": user.id,
+        "email": user.email,
+        "is_active": bool(user.is_active),
+        "is_superuser": bool(user.is_superuser),
+        "ver": user.token_version or 0,
+    }
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """Verify JWT token and return its claims if valid"""
+    try:
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[ALGORITHM])
+        if payload.get("sub") is None:
+            return None
+        return payload
+    except JWTError:
+        return None
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies)
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    """
+    Address a request came from. Only a trusted proxy's X-Forwarded-For is believed,
+    and its right-most entry that is not a trusted proxy is the client: entries to
+    the left of it were written by the client itself and can be forged.
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or not _is_trusted_proxy(peer):
+        return peer
+    forwarded = [
+        address.strip() for address in request.headers.get("x-forwarded-for", "").split(",") if address.strip()
+    ]
+    for address in reversed(forwarded):
+        if not _is_trusted_proxy(address):
+            return address
+    return forwarded[0] if forwarded else peer
+
+
+def enforce_login_rate_limit(client_ip: Optional[str], email: str) -> None:
+    """Raise 429 if this IP or email has used up its login attempts"""
+    retry_after = _login_ip_limiter.hit(client_ip or "unknown")
+    if retry_after is None:
+        retry_after = _login_email_limiter.hit(email.strip().lower())
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Drop a cached principal after the user's auth fields change"""
+    _principal_cache.pop(user_id)
+
+
+def load_principal(user_id: str) -> Optional[AuthPrincipal]:
+    """Return the user's principal, querying the database only on a cache miss"""
+    principal = _principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    db = SessionLocal()
+    try:
+        user = UserRepository(db).get_by_id(user_id)
+    finally:
+        db.close()
+    if user is None:
+        return None
+
+    principal = AuthPrincipal.model_validate(user)
+    _principal_cache.set(user_id, principal)
+    return principal
+
+
 # FastAPI dependencies
 
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
-    db: Session = Depends(get_db),
-) -> AuthUser:
+) -> AuthPrincipal:
     """Get current authenticated user from JWT token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -128,26 +291,40 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        token = credentials.credentials
-        auth_service = AuthService(db)
-        user_id = auth_service.verify_token(token)
-        if user_id is None:
-            raise credentials_exception
-    except Exception:
+    claims = decode_access_token(credentials.credentials)
+    if claims is None:
         raise credentials_exception
+    user_id: str = claims["sub"]
+    # Lets the routing session apply this user's read-your-writes window
+    request.state.user_id = user_id
 
-    user = auth_service.get_user_by_id(user_id)
-    if user is None:
+    # Tokens issued before versioning count as version 0
+    token_version = claims.get("ver", 0)
+    if revocation_list.is_revoked(user_id, token_version):
+        raise credentials_exception
+
+    if settings.AUTH_STATELESS_TOKENS and "ver" in claims:
+        # Everything handlers need is in the signed claims: no database or cache access
+        return AuthPrincipal(
+            id=user_id,
+            email=claims.get("email", ""),
+            is_active=claims.get("is_active", False),
+            is_superuser=claims.get("is_superuser", False),
+            token_version=token_version,
+        )
+
+    # Cached requests never open a database session here
+    principal = load_principal(user_id)
+    if principal is None or token_version < principal.token_version:
         raise credentials_exception
 
-    return user
+    return principal
 
 
 def get_current_active_user(
-    current_user: AuthUser = Depends(get_current_user),
-) -> AuthUser:
+    current_user: AuthPrincipal = Depends(get_current_user),
+) -> AuthPrincipal:
     """Get current active user"""
-    if not current_user.is_active:  # type: ignore
+    if not current_user.is_active:
         raise HTTPException(status_code=403, detail="Inactive user")
     return current_user
@@ -1,3 +1,4 @@
+import base64
 from datetime import datetime
 from typing import List, Optional
 
@@ -6,7 +7,14 @@ from sqlalchemy.orm import Session
 from app.core.rid import generate_rid
 from app.models.chat.conversation import ChatConversation
 from app.models.chat.message import ChatMessage
-from app.schemas.chat.assistant import ConversationCreate, ConversationResponse, MessageCreate, MessageResponse
+from app.schemas.chat.assistant import (
+    ConversationCreate,
+    ConversationResponse,
+    ConversationSummaryResponse,
+    MessageCreate,
+    MessageResponse,
+    MessageSearchResult,
+)
 from app.repositories.conversation_repositories import ConversationRepository
 from app.repositories.message_repositories import MessageRepository
 
@@ -75,4 +83,66 @@ class ChatService:
 
     def get_all_conversations(self, user_id: str) -> List[ChatConversation]:
         """Get all conversations for a user"""
-        return self.conversation_repository.get_all(user_id)
\ No newline at end of file
+        return self.conversation_repository.get_all(user_id)
+
+    def list_conversation_summaries(
+        self, user_id: str, limit: int, cursor: Optional[str] = None
+    ) -> tuple[List[ConversationSummaryResponse], Optional[str]]:
+        """Returns (summaries, next_cursor); next_cursor is None on the last page"""
+        before = self._decode_cursor(cursor) if cursor else None
+        # Fetch one extra row to learn whether another page exists
+        rows = self.conversation_repository.list_with_preview(user_id, limit + 1, before)
+        page = rows[:limit]
+        summaries = [
+            ConversationSummaryResponse(
+                id=conversation.id,
+                user_id=conversation.user_id,
+                title=conversation.title,
+                created_at=conversation.created_at,
+                updated_at=conversation.updated_at,
+                status=conversation.status,
+                last_message_preview=preview,
+                last_message_role=role,
+                last_message_at=last_message_at,
+                message_count=message_count,
+            )
+            for conversation, preview, role, last_message_at, message_count in page
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1][0]
+            next_cursor = self._encode_cursor(last.created_at, last.id)
+        return summaries, next_cursor
+
+    def search_messages(
+        self, user_id: str, query: str, limit: int, offset: int = 0
+    ) -> tuple[List[MessageSearchResult], bool]:
+        """Returns (results, has_more) for a ranked full-text search of the user's chat history"""
+        # Fetch one extra row instead of counting every match
+        rows = self.message_repository.search(user_id, query, limit + 1, offset)
+        results = [
+            MessageSearchResult(
+                id=message.id,
+                conversation_id=message.conversation_id,
+                role=message.role,
+                created_at=message.created_at,
+                headline=headline,
+                rank=float(rank),
+            )
+            for message, rank, headline in rows[:limit]
+        ]
+        return results, len(rows) > limit
+
+    @staticmethod
+    def _encode_cursor(created_at: datetime, conversation_id: str) -> str:
+        raw = f"{created_at.isoformat()}|{conversation_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+        """Raises ValueError for malformed cursors"""
+        try:
+            created_at, conversation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+            return datetime.fromisoformat(created_at), conversation_id
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
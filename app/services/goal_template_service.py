@@ -2,9 +2,20 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.shared_cache import ModelCodec, build_cache
 from app.repositories.goal_templates_repository import GoalTemplateRepository
 from app.schemas.goal.templates import GoalTemplateRead
 
+# Newest active version per slug, shared by every worker on the host
+_latest_template_cache = build_cache(
+    "goal-templates",
+    maxsize=256,
+    ttl_seconds=settings.GOAL_TEMPLATE_CACHE_TTL_SECONDS,
+    codec=ModelCodec(GoalTemplateRead),
+    slot_size=8192,
+)
+
 
 class GoalTemplateService:
     """Thin service wrapper so other layers don't instantiate repositories directly."""
@@ -15,7 +26,17 @@ class GoalTemplateService:
 
     def get_latest_active(self, slug: str) -> Optional[GoalTemplateRead]:
         """Fetch newest active template version for preset building."""
-        return self.repository.get_latest_active(slug)
+        template = _latest_template_cache.get(slug)
+        if template is None:
+            template = self.repository.get_latest_active(slug)
+            if template is not None:
+                _latest_template_cache.set(slug, template)
+        return template
+
+    @staticmethod
+    def invalidate_latest(slug: str) -> None:
+        """Drop the cached latest version after a new one is published."""
+        _latest_template_cache.pop(slug)
 
 
     # Not used yet but will support backfills or debugging once we manage multiple template versions.
@@ -0,0 +1,173 @@
+import logging
+import marshal
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.shared_cache import build_cache
+from app.repositories.metrics_repositories import MetricsRepository
+from app.repositories.nutrition_repositories import NutritionRepository
+from app.repositories.user_goals_repository import UserGoalRepository
+
+logger = logging.getLogger(__name__)
+
+# Sections in the order they are rendered into the prompt
+DIGEST_SECTIONS = ("weight", "steps", "sleep", "heart_rate", "goal", "intake")
+
+DIGEST_WINDOW_DAYS = 7
+
+
+@dataclass
+class HealthDigest:
+    """Per-user digest; each section is a short pre-rendered line of prompt text."""
+
+    user_id: str
+    sections: Dict[str, Optional[str]] = field(default_factory=dict)
+    intake_day: Optional[date] = None
+
+    def render(self) -> str:
+        lines = [self.sections[name] for name in DIGEST_SECTIONS if self.sections.get(name)]
+        if not lines:
+            return ""
+        return "User health summary (from their tracked data):\n" + "\n".join(
+            f"- {line}" for line in lines
+        )
+
+
+class _DigestCodec:
+    """Encode a HealthDigest as a marshalled (user_id, sections, intake_day ordinal) tuple."""
+
+    id = "health-digest:user_id,sections,intake_day"
+
+    def encode(self, digest: HealthDigest) -> bytes:
+        intake_day = digest.intake_day.toordinal() if digest.intake_day else None
+        return marshal.dumps((digest.user_id, digest.sections, intake_day))
+
+    def decode(self, data: bytes) -> HealthDigest:
+        user_id, sections, intake_day = marshal.loads(data)
+        return HealthDigest(user_id, sections, date.fromordinal(intake_day) if intake_day else None)
+
+
+# Shared by all workers on the host, so an ingest handled by one worker drops the digest for every worker
+_digest_cache = build_cache(
+    "health-digests",
+    maxsize=settings.HEALTH_DIGEST_CACHE_SIZE,
+    ttl_seconds=settings.HEALTH_DIGEST_TTL_SECONDS,
+    codec=_DigestCodec(),
+    slot_size=2048,
+)
+
+
+class HealthDigestService:
+    """Builds and maintains the compact health digest used to ground the assistant."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.metrics_repository = MetricsRepository(db)
+        self.nutrition_repository = NutritionRepository(db)
+        self.goal_repository = UserGoalRepository(db)
+        self._builders: Dict[str, Callable[[str], Optional[str]]] = {
+            "weight": self._build_weight,
+            "steps": self._build_steps,
+            "sleep": self._build_sleep,
+            "heart_rate": self._build_heart_rate,
+            "goal": self._build_goal,
+            "intake": self._build_intake,
+        }
+
+    def get_digest_text(self, user_id: str) -> str:
+        """Return the rendered digest, building it on first use."""
+        digest = _digest_cache.get(user_id)
+        if digest is None:
+            digest = self._build_digest(user_id)
+            _digest_cache.set(user_id, digest)
+        elif digest.intake_day != datetime.now(timezone.utc).date():
+            # Today's intake rolls over at midnight even without new logs
+            self._refresh(digest, ("intake",))
+            _digest_cache.set(user_id, digest)
+        return digest.render()
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the user's digest after an ingest; it is rebuilt on their next chat turn."""
+        _digest_cache.pop(user_id)
+
+    def _build_digest(self, user_id: str) -> HealthDigest:
+        digest = HealthDigest(user_id=user_id)
+        self._refresh(digest, DIGEST_SECTIONS)
+        return digest
+
+    def _refresh(self, digest: HealthDigest, sections: tuple) -> None:
+        for name in sections:
+            digest.sections[name] = self._builders[name](digest.user_id)
+            if name == "intake":
+                digest.intake_day = datetime.now(timezone.utc).date()
+
+    def _window(self) -> tuple:
+        end = datetime.now(timezone.utc)
+        return end - timedelta(days=DIGEST_WINDOW_DAYS), end
+
+    """Section builders"""
+
+    def _build_weight(self, user_id: str) -> Optional[str]:
+        record = self.metrics_repository.get_latest_weight_record(user_id)
+        if not record or record.weight is None:
+            return None
+        return f"Latest weight: {float(record.weight):.1f} lb ({record.date_hour.date().isoformat()})"
+
+    def _build_steps(self, user_id: str) -> Optional[str]:
+        start, end = self._window()
+        total = self.metrics_repository.get_steps_total(user_id, start, end)
+        if total is None:
+            return None
+        return f"Steps: {round(total / DIGEST_WINDOW_DAYS):,}/day average over the last {DIGEST_WINDOW_DAYS} days"
+
+    def _build_sleep(self, user_id: str) -> Optional[str]:
+        start, end = self._window()
+        average = self.metrics_repository.get_sleep_minutes_average(user_id, start, end)
+        if average is None:
+            return None
+        hours, minutes = divmod(round(average), 60)
+        return f"Sleep: {hours}h {minutes}m/night average over the last {DIGEST_WINDOW_DAYS} days"
+
+    def _build_heart_rate(self, user_id: str) -> Optional[str]:
+        start, end = self._window()
+        avg_hr, avg_resting_hr = self.metrics_repository.get_heart_rate_averages(user_id, start, end)
+        parts = []
+        if avg_hr is not None:
+            parts.append(f"average {avg_hr:.0f} bpm")
+        if avg_resting_hr is not None:
+            parts.append(f"resting {avg_resting_hr:.0f} bpm")
+        if not parts:
+            return None
+        return f"Heart rate ({DIGEST_WINDOW_DAYS}-day): " + ", ".join(parts)
+
+    def _build_goal(self, user_id: str) -> Optional[str]:
+        goal = self.goal_repository.get_active_for_user(user_id)
+        if not goal:
+            return None
+        variants = []
+        for name in ("rest", "workout"):
+            preset = (goal.variants or {}).get(name)
+            if not preset:
+                continue
+            variants.append(
+                f"{name} day {preset['calories_kcal']:.0f} kcal "
+                f"(P {preset['protein_g']:.0f}g / C {preset['carbs_g']:.0f}g / F {preset['fat_g']:.0f}g)"
+            )
+        pace = (goal.params or {}).get("pace_mode")
+        header = f"Active goal: {goal.template_slug}" + (f", {pace} pace" if pace else "")
+        return header + (": " + "; ".join(variants) if variants else "")
+
+    def _build_intake(self, user_id: str) -> Optional[str]:
+        now = datetime.now(timezone.utc)
+        start = datetime.combine(now.date(), datetime.min.time(), tzinfo=timezone.utc)
+        calories, protein, carbs, fat = self.nutrition_repository.get_consumption_totals(user_id, start, now)
+        if calories is None:
+            return "Intake today: nothing logged yet"
+        return (
+            f"Intake today: {float(calories):.0f} kcal "
+            f"(P {float(protein or 0):.0f}g / C {float(carbs or 0):.0f}g / F {float(fat or 0):.0f}g)"
+        )
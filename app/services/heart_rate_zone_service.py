@@ -0,0 +1,316 @@
+import secrets
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.shared_cache import MarshalCodec, build_cache
+from app.db.archive import to_utc
+from app.models.metric.activity.workouts import ActivityWorkouts
+from app.repositories.metrics_repositories import MetricsRepository
+from app.repositories.user_profile_repository import UserProfileRepository
+
+# Zone 0 is everything below zone 1; zones 1-5 start at these fractions of heart rate reserve
+ZONE_NAMES = ("Below zones", "Very light", "Light", "Moderate", "Hard", "Maximum")
+ZONE_RESERVE_FRACTIONS = (0.5, 0.6, 0.7, 0.8, 0.9)
+ZONE_COUNT = len(ZONE_NAMES)
+
+DEFAULT_RESTING_HR = 60
+RESTING_HR_WINDOW_DAYS = 30
+DEFAULT_RANGE_DAYS = 7
+MAX_RANGE_DAYS = 366
+
+# A sample counts until the next one, but never for longer than this
+MAX_SAMPLE_SECONDS = 300
+
+
+@dataclass
+class ZoneWorkout:
+    workout_id: str
+    workout_name: Optional[str]
+    workout_type: str
+    start: datetime
+    duration_minutes: Optional[int]
+    seconds_in_zone: List[int]
+    estimated: bool  # No samples; the whole workout is put in the zone of its average heart rate
+
+
+@dataclass
+class ZoneDay:
+    day: date
+    seconds_in_zone: List[int]
+    workouts: List[ZoneWorkout] = field(default_factory=list)
+
+
+@dataclass
+class ZoneReport:
+    max_hr: int
+    resting_hr: int
+    edges: Tuple[int, ...]  # First BPM of zones 1-5
+    days: List[ZoneDay]
+
+
+# Settled days per user and month under "user_id:generation:YYYY-MM" as (edges,
+# {day ordinal: encoded day}), valid for the zone edges they were binned with, so a
+# year's view is twelve small entries rather than one that outgrows a slot. The
+# user's generation is kept under "user_id" and replaced by ingest, which orphans
+# every month at once. Shared by all workers on the host; days inside the sync
+# window are never cached, so late device syncs are picked up even with the
+# per-process fallback.
+_zone_cache = build_cache(
+    "heart-rate-zones",
+    maxsize=settings.HEART_RATE_ZONE_CACHE_SIZE,
+    ttl_seconds=settings.HEART_RATE_ZONE_CACHE_TTL_SECONDS,
+    codec=MarshalCodec(),
+    slot_size=settings.HEART_RATE_ZONE_CACHE_SLOT_BYTES,
+)
+
+
+def _encode_day(zone_day: ZoneDay) -> Tuple[Any, ...]:
+    return (
+        zone_day.seconds_in_zone,
+        [
+            (
+                workout.workout_id,
+                workout.workout_name,
+                workout.workout_type,
+                to_utc(workout.start).timestamp(),
+                workout.duration_minutes,
+                workout.seconds_in_zone,
+                workout.estimated,
+            )
+            for workout in zone_day.workouts
+        ],
+    )
+
+
+def _decode_day(day: date, encoded: Tuple[Any, ...]) -> ZoneDay:
+    seconds_in_zone, workouts = encoded
+    return ZoneDay(
+        day=day,
+        seconds_in_zone=list(seconds_in_zone),
+        workouts=[
+            ZoneWorkout(
+                workout_id=workout_id,
+                workout_name=workout_name,
+                workout_type=workout_type,
+                start=datetime.fromtimestamp(start, tz=timezone.utc),
+                duration_minutes=duration_minutes,
+                seconds_in_zone=list(workout_seconds),
+                estimated=estimated,
+            )
+            for workout_id, workout_name, workout_type, start, duration_minutes, workout_seconds, estimated in workouts
+        ],
+    )
+
+
+def zone_edges(age: int, resting_hr: int) -> Tuple[int, Tuple[int, ...]]:
+    """
+    Karvonen zones: max HR from age (220 - age), zone starts at fractions of the
+    reserve between resting and max HR.
+
+    Returns:
+        Max HR and the first BPM of zones 1-5
+    """
+    max_hr = 220 - age
+    reserve = max_hr - resting_hr
+    return max_hr, tuple(round(resting_hr + fraction * reserve) for fraction in ZONE_RESERVE_FRACTIONS)
+
+
+class HeartRateZoneService:
+    """
+    Time in heart rate zones per day and per workout.
+
+    Raw samples (see HeartRateSampleService) are used wherever an hour has them,
+    each counting until the next sample; other hours count fully in the zone of
+    their hourly average. Where several sources cover the same second or hour
+    only one is counted. Each range is loaded with one query per table and
+    binned with NumPy. Days older than the sync window are cached per user and
+    month in the shared cache tier; newer ones are binned on every request because
+    devices may still upload them.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.metrics_repository = MetricsRepository(db)
+
+    def get_time_in_zones(
+        self,
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Optional[ZoneReport]:
+        """
+        Time in zones of every UTC day from start_date to end_date (default: the last week).
+
+        Returns:
+            The report, or None if the user has no profile to take an age from
+
+        Raises:
+            ValueError: If the range is reversed or longer than MAX_RANGE_DAYS
+        """
+        profile = UserProfileRepository(self.db).get(user_id)
+        if profile is None:
+            return None
+
+        today = datetime.now(timezone.utc).date()
+        last_day = to_utc(end_date).date() if end_date else today
+        first_day = to_utc(start_date).date() if start_date else last_day - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        if first_day > last_day:
+            raise ValueError("start_date must not be after end_date")
+        if (last_day - first_day).days >= MAX_RANGE_DAYS:
+            raise ValueError(f"The range can span at most {MAX_RANGE_DAYS} days")
+
+        birth_date = profile.birth_date
+        age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+        resting_hr = self._resting_hr(user_id)
+        max_hr, edges = zone_edges(age, resting_hr)
+        if resting_hr >= max_hr:
+            resting_hr = DEFAULT_RESTING_HR
+            max_hr, edges = zone_edges(age, resting_hr)
+
+        days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+        generation = self._generation(user_id)
+        months: Dict[str, Dict[int, Any]] = {}
+        for month in dict.fromkeys(f"{day:%Y-%m}" for day in days):
+            cached = _zone_cache.get(f"{user_id}:{generation}:{month}")
+            months[month] = dict(cached[1]) if cached is not None and tuple(cached[0]) == edges else {}
+        cached_days = {ordinal: encoded for month_days in months.values() for ordinal, encoded in month_days.items()}
+
+        missing = [day for day in days if day.toordinal() not in cached_days]
+        computed = self._bin_days(user_id, edges, missing[0], missing[-1]) if missing else {}
+
+        settled = today - timedelta(days=settings.HEART_RATE_ZONE_SYNC_WINDOW_DAYS)
+        changed = set()
+        for day, zone_day in computed.items():
+            if day < settled:
+                months[f"{day:%Y-%m}"][day.toordinal()] = _encode_day(zone_day)
+                changed.add(f"{day:%Y-%m}")
+        for month in changed:
+            _zone_cache.set(f"{user_id}:{generation}:{month}", (edges, months[month]))
+
+        return ZoneReport(
+            max_hr=max_hr,
+            resting_hr=resting_hr,
+            edges=edges,
+            days=[computed.get(day) or _decode_day(day, cached_days[day.toordinal()]) for day in days],
+        )
+
+    def invalidate(self, user_id: str) -> None:
+        _zone_cache.pop(user_id)
+
+    @staticmethod
+    def _generation(user_id: str) -> str:
+        generation = _zone_cache.get(user_id)
+        if generation is None:
+            generation = secrets.token_hex(8)
+            _zone_cache.set(user_id, generation)
+        return generation
+
+    def _resting_hr(self, user_id: str) -> int:
+        end = datetime.now(timezone.utc)
+        _, resting_hr = self.metrics_repository.get_heart_rate_averages(
+            user_id, end - timedelta(days=RESTING_HR_WINDOW_DAYS), end
+        )
+        return round(resting_hr) if resting_hr else DEFAULT_RESTING_HR
+
+    def _bin_days(self, user_id: str, edges: Tuple[int, ...], first_day: date, last_day: date) -> Dict[date, ZoneDay]:
+        """Bin every day from first_day to last_day in one pass"""
+        start = datetime.combine(first_day, time(), tzinfo=timezone.utc)
+        end = datetime.combine(last_day + timedelta(days=1), time(), tzinfo=timezone.utc) - timedelta(microseconds=1)
+        workouts = [
+            workout
+            for workout in self.metrics_repository.get_workouts_data(user_id, start, end)
+            if workout.date is not None
+        ]
+        workouts.sort(key=lambda workout: workout.date)
+        # Samples of workouts running past midnight of the last day still count
+        data_end = max(
+            [end] + [workout.date + timedelta(minutes=workout.duration_minutes or 0) for workout in workouts]
+        )
+
+        hours = self.metrics_repository.get_heart_rate_series(user_id, start, data_end)
+        hours = np.array(hours, dtype=float).reshape(-1, 3)
+        sample_rows = self.metrics_repository.get_heart_rate_samples(user_id, None, start, data_end)
+        decoded = [row.decode() for row in sample_rows]
+
+        # Samples: one per second across sources, each lasting until the next
+        sample_seconds = np.concatenate([seconds for seconds, _ in decoded] + [np.empty(0, dtype=np.int64)])
+        sample_bpm = np.concatenate([bpm for _, bpm in decoded] + [np.empty(0, dtype=np.int64)])
+        sample_seconds, first = np.unique(sample_seconds, return_index=True)
+        sample_bpm = sample_bpm[first]
+        sample_duration = np.minimum(np.diff(sample_seconds, append=sample_seconds[-1:] + 1), MAX_SAMPLE_SECONDS)
+
+        # Hourly rows: one per hour across sources, only for hours without samples
+        hour_seconds = hours[:, 0].astype(np.int64)
+        hour_bpm = np.where(np.isnan(hours[:, 1]), hours[:, 2], hours[:, 1])
+        known = ~np.isnan(hour_bpm)
+        hour_seconds, first = np.unique(hour_seconds[known], return_index=True)
+        hour_bpm = hour_bpm[known][first]
+        uncovered = ~np.isin(hour_seconds // 3600, sample_seconds // 3600)
+        hour_seconds, hour_bpm = hour_seconds[uncovered], hour_bpm[uncovered]
+
+        seconds = np.concatenate([sample_seconds, hour_seconds])
+        zones = np.searchsorted(edges, np.concatenate([sample_bpm, hour_bpm]), side="right")
+        durations = np.concatenate([sample_duration, np.full(len(hour_seconds), 3600)])
+
+        day_count = (last_day - first_day).days + 1
+        day_index = seconds // 86400 - (int(start.timestamp()) // 86400)
+        in_range = (day_index >= 0) & (day_index < day_count)
+        day_totals = np.bincount(
+            day_index[in_range] * ZONE_COUNT + zones[in_range],
+            weights=durations[in_range],
+            minlength=day_count * ZONE_COUNT,
+        ).reshape(day_count, ZONE_COUNT)
+
+        result = {
+            first_day + timedelta(days=n): ZoneDay(
+                day=first_day + timedelta(days=n),
+                seconds_in_zone=np.rint(day_totals[n]).astype(np.int64).tolist(),
+            )
+            for n in range(day_count)
+        }
+        zone_workouts = self._bin_workouts(
+            edges, workouts, sample_seconds, zones[: len(sample_seconds)], sample_duration
+        )
+        for workout, zone_workout in zip(workouts, zone_workouts):
+            result[to_utc(workout.date).date()].workouts.append(zone_workout)
+        return result
+
+    @staticmethod
+    def _bin_workouts(edges, workouts: List[ActivityWorkouts], seconds, zones, durations) -> List[ZoneWorkout]:
+        """Workouts (sorted by start) with the samples inside them binned; a sample overlapping two goes to the later one"""
+        if not workouts:
+            return []
+        starts = np.array([to_utc(workout.date).timestamp() for workout in workouts])
+        ends = starts + np.array([(workout.duration_minutes or 0) * 60 for workout in workouts])
+        index = np.searchsorted(starts, seconds, side="right") - 1
+        inside = index >= 0
+        inside[inside] = seconds[inside] < ends[index[inside]]
+        totals = np.bincount(
+            index[inside] * ZONE_COUNT + zones[inside],
+            weights=durations[inside],
+            minlength=len(workouts) * ZONE_COUNT,
+        ).reshape(len(workouts), ZONE_COUNT)
+
+        zone_workouts = []
+        for workout, total in zip(workouts, totals):
+            seconds_in_zone = np.rint(total).astype(np.int64).tolist()
+            estimated = not any(seconds_in_zone) and bool(workout.avg_heart_rate and workout.duration_minutes)
+            if estimated:
+                seconds_in_zone[int(np.searchsorted(edges, workout.avg_heart_rate, side="right"))] = workout.duration_minutes * 60
+            zone_workouts.append(
+                ZoneWorkout(
+                    workout_id=workout.id,
+                    workout_name=workout.workout_name,
+                    workout_type=workout.workout_type,
+                    start=workout.date,
+                    duration_minutes=workout.duration_minutes,
+                    seconds_in_zone=seconds_in_zone,
+                    estimated=estimated,
+                )
+            )
+        return zone_workouts
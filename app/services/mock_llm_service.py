@@ -0,0 +1,189 @@
+"""
+In-process stand-in for the OpenAI async client.
+
+Emulates `client.chat.completions.create` (streaming and non-streaming) with a
+configurable time-to-first-token distribution and token rate, so the chat
+endpoint can be load-tested without calling OpenAI.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+
+# Canned reply text the mock draws tokens from
+_LOREM_TOKENS = (
+    "Staying consistent matters more than any single day . Aim for balanced meals "
+    "with lean protein , plenty of vegetables and whole grains , keep hydrated , "
+    "and build activity into your routine with short walks after meals . "
+    "Track how you feel and adjust gradually ."
+).split()
+
+
+@dataclass
+class MockMessage:
+    role: str
+    content: Optional[str]
+
+
+@dataclass
+class MockDelta:
+    content: Optional[str] = None
+    role: Optional[str] = None
+
+
+@dataclass
+class MockChoice:
+    index: int
+    message: Optional[MockMessage] = None
+    delta: Optional[MockDelta] = None
+    finish_reason: Optional[str] = None
+
+
+@dataclass
+class MockUsage:
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+@dataclass
+class MockChatCompletion:
+    id: str
+    model: str
+    choices: List[MockChoice]
+    usage: Optional[MockUsage] = None
+    created: int = field(default_factory=lambda: int(time.time()))
+    object: str = "chat.completion"
+
+
+class MockLatencyModel:
+    """
+    Samples time-to-first-token and per-token delays.
+
+    Distributions:
+        fixed: always the mean
+        uniform: mean +/- jitter
+        lognormal: long-tailed around the mean, jitter used as the sigma in seconds
+    """
+
+    def __init__(
+        self,
+        distribution: str = "lognormal",
+        mean_ms: float = 400.0,
+        jitter_ms: float = 200.0,
+        tokens_per_second: float = 50.0,
+        seed: Optional[int] = None,
+    ):
+        self.distribution = distribution
+        self.mean_s = mean_ms / 1000
+        self.jitter_s = jitter_ms / 1000
+        self.tokens_per_second = tokens_per_second
+        self._random = random.Random(seed)
+
+    def first_token_delay(self) -> float:
+        if self.distribution == "fixed" or self.mean_s <= 0:
+            return max(self.mean_s, 0.0)
+        if self.distribution == "uniform":
+            return max(self._random.uniform(self.mean_s - self.jitter_s, self.mean_s + self.jitter_s), 0.0)
+        if self.distribution == "lognormal":
+            # Parameterise so the median equals the configured mean
+            sigma = self.jitter_s / self.mean_s if self.mean_s else 0.0
+            return self._random.lognormvariate(0.0, sigma) * self.mean_s
+        raise ValueError(f"Unknown mock latency distribution: {self.distribution}")
+
+    def token_delay(self) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return 1.0 / self.tokens_per_second
+
+
+class MockCompletions:
+    def __init__(self, latency: MockLatencyModel, completion_tokens: int):
+        self.latency = latency
+        self.completion_tokens = completion_tokens
+        self._counter = 0
+
+    async def create(
+        self,
+        model: str,
+        messages: list,
+        stream: bool = False,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ):
+        self._counter += 1
+        completion_id = f"chatcmpl-mock-{self._counter}"
+        n_tokens = min(self.completion_tokens, max_tokens or self.completion_tokens)
+        tokens = [_LOREM_TOKENS[i % len(_LOREM_TOKENS)] for i in range(n_tokens)]
+        # Rough prompt size: ~4 characters per token, like the real tokenizer on English text
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+
+        if stream:
+            return self._stream(completion_id, model, tokens)
+
+        await asyncio.sleep(self.latency.first_token_delay() + self.latency.token_delay() * n_tokens)
+        return MockChatCompletion(
+            id=completion_id,
+            model=model,
+            choices=[
+                MockChoice(
+                    index=0,
+                    message=MockMessage(role="assistant", content=" ".join(tokens)),
+                    finish_reason="stop",
+                )
+            ],
+            usage=MockUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=n_tokens,
+                total_tokens=prompt_tokens + n_tokens,
+            ),
+        )
+
+    async def _stream(self, completion_id: str, model: str, tokens: List[str]) -> AsyncIterator[MockChatCompletion]:
+        await asyncio.sleep(self.latency.first_token_delay())
+        for i, token in enumerate(tokens):
+            yield MockChatCompletion(
+                id=completion_id,
+                model=model,
+                object="chat.completion.chunk",
+                choices=[
+                    MockChoice(
+                        index=0,
+                        delta=MockDelta(content=token if i == 0 else f" {token}", role="assistant" if i == 0 else None),
+                    )
+                ],
+            )
+            await asyncio.sleep(self.latency.token_delay())
+        yield MockChatCompletion(
+            id=completion_id,
+            model=model,
+            object="chat.completion.chunk",
+            choices=[MockChoice(index=0, delta=MockDelta(), finish_reason="stop")],
+        )
+
+
+class MockChat:
+    def __init__(self, completions: MockCompletions):
+        self.completions = completions
+
+
+class MockAsyncOpenAI:
+    """Drop-in replacement exposing the `chat.completions.create` surface used by the app."""
+
+    def __init__(self, latency: Optional[MockLatencyModel] = None, completion_tokens: int = 120):
+        self.chat = MockChat(MockCompletions(latency or MockLatencyModel(), completion_tokens))
+
+
+def build_mock_client() -> MockAsyncOpenAI:
+    """Build a mock client from the MOCK_LLM_* settings."""
+    latency = MockLatencyModel(
+        distribution=settings.MOCK_LLM_LATENCY_DISTRIBUTION,
+        mean_ms=settings.MOCK_LLM_LATENCY_MS,
+        jitter_ms=settings.MOCK_LLM_LATENCY_JITTER_MS,
+        tokens_per_second=settings.MOCK_LLM_TOKENS_PER_SECOND,
+    )
+    return MockAsyncOpenAI(latency=latency, completion_tokens=settings.MOCK_LLM_COMPLETION_TOKENS)
@@ -6,7 +6,7 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.core.rid import generate_rid
+from app.core.rid import generate_rid, generate_sortable_rids
 from app.core.datetime_utils import parse_iso_datetime, get_day_boundaries_from_datetime
 from app.models.nutrition.macros import NutritionMacros
 from app.models.nutrition.foods import Food
@@ -24,6 +24,7 @@ from app.schemas.nutrition.macros import (
     NutritionMacrosRecordCreate,
 )
 from app.repositories.nutrition_repositories import NutritionRepository
+from app.services.health_digest_service import HealthDigestService
 
 logger = logging.getLogger(__name__)
 
@@ -175,6 +176,7 @@ class NutritionService:
             is_saved=log_data.is_saved,  # Has default in schema, so should always have a value
         )
         repository.create_consumption_log(log)
+        HealthDigestService(self.db).invalidate(user_id)
         return log
 
     def get_consumption_log(self, user_id: str, log_id: str) -> Optional[ConsumptionLog]:
@@ -208,11 +210,14 @@ class NutritionService:
             log.is_saved = log_data.is_saved
         
         repository.update_consumption_log(log)
+        HealthDigestService(self.db).invalidate(log.user_id)
         return log
 
     def delete_consumption_log(self, log: ConsumptionLog) -> None:
         repository = NutritionRepository(self.db)
+        user_id = log.user_id
         repository.delete_consumption_log(log)
+        HealthDigestService(self.db).invalidate(user_id)
 
     def get_daily_consumption_logs_data(self, user_id: str, date: str) -> ConsumptionLogExport:
         nutrition_repository = NutritionRepository(self.db)
@@ -325,6 +330,7 @@ class NutritionService:
         updated_count = 0
         processed_records = []
 
+        new_ids = iter(generate_sortable_rids("nutrition", "macros", len(bulk_data.records)))
         for record_data in bulk_data.records:
             record_datetime = parse_iso_datetime(record_data.datetime)
             existing_record = nutrition_repository.get_macro_record_by_datetime_food(user_id, record_datetime, record_data.food_name)
@@ -347,7 +353,7 @@ class NutritionService:
             else:
                 # Create new macro record
                 new_record = NutritionMacros(
-                    id=generate_rid("nutrition", "macros"),
+                    id=next(new_ids),
                     user_id=user_id,
                     datetime=record_datetime,
                     food_name=record_data.food_name,
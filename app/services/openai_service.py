@@ -1,30 +1,44 @@
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
 from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.services.mock_llm_service import build_mock_client
+from app.services.usage_service import usage_meter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
+# Initialize the completion client for the configured backend
 try:
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    logger.info("Successfully initialized OpenAI client")
+    if settings.LLM_BACKEND == "mock":
+        client = build_mock_client()
+        logger.warning("Using mock LLM backend - responses are synthetic")
+    else:
+        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        logger.info("Successfully initialized OpenAI client")
 except Exception as e:
     logger.error(f"Failed to initialize OpenAI client: {str(e)}")
     raise
 
 
-async def get_chat_completion(messages: list, model: str = "gpt-3.5-turbo"):
+async def get_chat_completion(
+    messages: list,
+    model: str = "gpt-3.5-turbo",
+    user_id: Optional[str] = None,
+    conversation_id: Optional[str] = None,
+):
     """
     Get a completion from ChatGPT
 
     Args:
         messages (list): List of message dictionaries with 'role' and 'content'
         model (str): The model to use for completion
+        user_id (str, optional): User to meter token usage against
+        conversation_id (str, optional): Conversation recorded on the usage ledger row
 
     Returns:
         str: The completion text
@@ -65,6 +79,15 @@ async def get_chat_completion(messages: list, model: str = "gpt-3.5-turbo"):
                 f"Completion tokens: {response.usage.completion_tokens}, "
                 f"Total tokens: {response.usage.total_tokens}"
             )
+            if user_id is not None:
+                # Buffered in memory; the ledger insert happens in a background batch
+                usage_meter.record(
+                    user_id=user_id,
+                    model=model,
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=response.usage.completion_tokens,
+                    conversation_id=conversation_id,
+                )
 
         return response_content
     except Exception as e:
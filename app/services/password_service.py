@@ -0,0 +1,98 @@
+"""
+Bcrypt work kept off the event loop.
+
+Hashing and verification run on a small dedicated thread pool (the bcrypt C
+extension releases the GIL, so threads give real parallelism without the cost of
+shipping work to other processes). The pool admits at most `workers + max_queue`
+jobs; beyond that callers get a 503 instead of queueing behind a login storm.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordPool:
+    """
+    Bounded executor for password hashing.
+
+    Args:
+        workers: Threads doing bcrypt work concurrently
+        max_queue: Jobs allowed to wait for a free thread before new work is shed
+        retry_after: Seconds suggested to rejected clients
+    """
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int = 1):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Only touched from the event loop thread, so no lock is needed
+        self._in_flight = 0
+        self._rejected = 0
+        self._completed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password"
+            )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs admitted but still waiting for a worker thread."""
+        return max(self._in_flight - self.workers, 0)
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run func(*args) on the pool, or raise 503 if the pool is saturated."""
+        if self._in_flight >= self.workers + self.max_queue:
+            self._rejected += 1
+            logger.warning(
+                f"Password pool saturated ({self._in_flight} in flight), rejecting request"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily overloaded, please retry",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+
+    def status(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Process-wide pool used by login and signup
+password_pool = PasswordPool(
+    workers=settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1),
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.repositories.token_revocation_repositories import TokenRevocationRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocationList:
+    """
+    In-memory view of revoked token versions for one worker process.
+
+    Holds only the highest revoked version per user, so a lookup is a single dict
+    read on the request path. A background task reloads the map from
+    auth_token_revocations every `refresh_interval` seconds; revocations made by this
+    worker are applied immediately, other workers pick them up on their next refresh.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._revoked: Dict[str, int] = {}
+        # Revocations made here since the last load began; a snapshot may not include them yet
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, user_id: str, token_version: int) -> bool:
+        return token_version <= self._revoked.get(user_id, -1)
+
+    def add(self, user_id: str, token_version: int) -> None:
+        with self._lock:
+            _merge(self._pending, user_id, token_version)
+            _merge(self._revoked, user_id, token_version)
+
+    def _load(self) -> Dict[str, int]:
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            repository = TokenRevocationRepository(db)
+            repository.delete_expired(now)
+            return {user_id: version for user_id, version in repository.get_active_versions(now)}
+        finally:
+            db.close()
+
+    async def refresh(self) -> None:
+        with self._lock:
+            # Committed before the load starts, so the snapshot covers these unless they expired
+            pending, self._pending = self._pending, {}
+        try:
+            revoked = await asyncio.to_thread(self._load)
+        except Exception as e:
+            # Keep serving the last known set rather than dropping revocations
+            logger.error(f"Failed to refresh token revocations: {str(e)}")
+            with self._lock:
+                for user_id, version in pending.items():
+                    _merge(self._pending, user_id, version)
+            return
+        with self._lock:
+            # Revocations added while loading are kept until the next snapshot
+            for source in (pending, self._pending):
+                for user_id, version in source.items():
+                    _merge(revoked, user_id, version)
+            self._revoked = revoked
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self.refresh()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _merge(versions: Dict[str, int], user_id: str, token_version: int) -> None:
+    if token_version > versions.get(user_id, -1):
+        versions[user_id] = token_version
+
+
+# Process-wide revocation list consulted by the auth dependencies
+revocation_list = TokenRevocationList(refresh_interval=settings.AUTH_REVOCATION_REFRESH_SECONDS)
@@ -0,0 +1,255 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.shared_cache import MarshalCodec, build_cache
+from app.db.archive import to_utc
+from app.repositories.metrics_repositories import DAILY_SERIES, MetricsRepository
+
+TREND_METRICS = tuple(DAILY_SERIES)
+
+# Health digest sections (the names ingest already reports) -> trend metrics they feed
+TREND_METRICS_BY_SECTION = {
+    "heart_rate": ("resting_hr", "hrv"),
+    "weight": ("weight",),
+    "sleep": ("sleep_minutes",),
+    "steps": ("steps",),
+}
+
+HISTORY_DAYS = 365
+ROLLING_DAYS = 7
+BASELINE_DAYS = 28
+MIN_BASELINE_READINGS = 7
+EWMA_SPAN = 7
+EWMA_ALPHA = 2 / (EWMA_SPAN + 1)
+
+# Readings per closed-form EWMA block; keeps (1 - alpha) ** -n well inside float range
+EWMA_BLOCK = 64
+
+
+@dataclass(frozen=True)
+class _Series:
+    """
+    One metric of one user, one entry per day with data; all arrays are NumPy.
+
+    sums and squares are prefix sums with one more entry than days, so any
+    window's sum is a difference of two entries (they keep an offset once the
+    front is trimmed, which differences cancel). stale_from is the last day
+    read, which may still grow; version is the backfill marker the series was
+    read under (see TrendService).
+    """
+
+    days: Any  # date ordinals
+    values: Any
+    sums: Any
+    squares: Any
+    rolling: Any
+    ewma: Any
+    z_scores: Any
+    stale_from: date
+    version: Any = None
+
+
+@dataclass
+class TrendPoint:
+    day: date
+    value: float
+    rolling_mean: float
+    ewma: float
+    z_score: Optional[float]
+
+
+@dataclass
+class MetricTrend:
+    metric: str
+    points: List[TrendPoint]
+    history_days: int
+    percentile: Optional[float] = None
+    p10: Optional[float] = None
+    median: Optional[float] = None
+    p90: Optional[float] = None
+
+    @property
+    def latest(self) -> Optional[TrendPoint]:
+        return self.points[-1] if self.points else None
+
+
+# Per worker, keyed by (user_id, metric)
+_series_cache: TTLCache[_Series] = TTLCache(
+    maxsize=settings.TREND_CACHE_SIZE,
+    ttl_seconds=settings.TREND_CACHE_TTL_SECONDS,
+)
+
+# Backfill markers by "user_id:metric", shared by all workers on the host. Any
+# change to a marker makes every worker read that series again in full.
+_backfill_markers = build_cache(
+    "trend-backfills",
+    maxsize=settings.TREND_CACHE_SIZE,
+    ttl_seconds=settings.TREND_CACHE_TTL_SECONDS,
+    codec=MarshalCodec(),
+    slot_size=128,
+)
+
+
+def ewma(values, initial: Optional[float] = None):
+    """
+    y[t] = (1 - alpha) * y[t-1] + alpha * x[t], seeded with initial (or the first value).
+
+    Unrolled per block as y[t] = d**t * (y[0] + sum(alpha * x[i] / d**i)) so it
+    needs no Python loop over readings.
+    """
+    decay = 1 - EWMA_ALPHA
+    result = np.empty(len(values))
+    previous = initial
+    for start in range(0, len(values), EWMA_BLOCK):
+        block = values[start:start + EWMA_BLOCK]
+        if previous is None:
+            previous = block[0]
+        powers = decay ** np.arange(1, len(block) + 1)
+        result[start:start + len(block)] = powers * (previous + np.cumsum(EWMA_ALPHA * block / powers))
+        previous = result[start + len(block) - 1]
+    return result
+
+
+def extend_series(
+    series: Optional[_Series],
+    rows: Sequence[Tuple[date, float]],
+    read_from: date,
+    history_start: date,
+    version: Any = None,
+) -> _Series:
+    """
+    Replace the days from read_from on with rows and derive only the new entries.
+
+    Args:
+        series: Cached series, or None to start from rows alone
+        rows: Daily values from read_from on, oldest first
+        read_from: First day rows were read for
+        history_start: Entries before this day are dropped
+        version: Backfill marker the rows were read under
+    """
+    if series is None:
+        empty = np.empty(0)
+        series = _Series(empty, empty, np.zeros(1), np.zeros(1), empty, empty, empty, read_from)
+    keep = int(np.searchsorted(series.days, read_from.toordinal()))
+    new_values = np.array([value for _, value in rows], dtype=float)
+
+    days = np.concatenate([series.days[:keep], [day.toordinal() for day, _ in rows]]).astype(np.int64)
+    values = np.concatenate([series.values[:keep], new_values])
+    sums = np.concatenate([series.sums[:keep + 1], series.sums[keep] + np.cumsum(new_values)])
+    squares = np.concatenate([series.squares[:keep + 1], series.squares[keep] + np.cumsum(new_values ** 2)])
+
+    index = np.arange(keep, len(days))
+    window_start = np.searchsorted(days, days[index] - (ROLLING_DAYS - 1))
+    rolling = (sums[index + 1] - sums[window_start]) / (index + 1 - window_start)
+
+    # Baseline: the BASELINE_DAYS before each day, not counting the day itself
+    baseline_start = np.searchsorted(days, days[index] - BASELINE_DAYS)
+    count = index - baseline_start
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (sums[index] - sums[baseline_start]) / count
+        std = np.sqrt(np.maximum((squares[index] - squares[baseline_start]) / count - mean ** 2, 0))
+        z_scores = np.where((count >= MIN_BASELINE_READINGS) & (std > 0), (values[index] - mean) / std, np.nan)
+
+    smoothed = ewma(new_values, series.ewma[keep - 1] if keep else None)
+
+    first = int(np.searchsorted(days, history_start.toordinal()))
+    return _Series(
+        days=days[first:],
+        values=values[first:],
+        sums=sums[first:],
+        squares=squares[first:],
+        rolling=np.concatenate([series.rolling[:keep], rolling])[first:],
+        ewma=np.concatenate([series.ewma[:keep], smoothed])[first:],
+        z_scores=np.concatenate([series.z_scores[:keep], z_scores])[first:],
+        stale_from=rows[-1][0] if rows else read_from,
+        version=version,
+    )
+
+
+class TrendService:
+    """
+    Rolling means, EWMA, z-scores and percentiles of daily metric series.
+
+    Each user's series of the last year is kept per worker with every derived
+    value already computed. A read only fetches the days from the last day read
+    or the start of the resync window, whichever is earlier, and derives those
+    entries, so after the first request a trend costs one small query and late
+    syncs of recent days are seen by every worker. Ingest reports the days it
+    touched through mark_changed; a backfill older than the resync window
+    replaces the series' marker in the shared cache, and each worker reads the
+    whole series again once it sees the new marker.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.metrics_repository = MetricsRepository(db)
+
+    def get_trends(self, user_id: str, metrics: Optional[Iterable[str]] = None, days: int = 30) -> List[MetricTrend]:
+        """Trends of the given metrics (default: all), with the points of the last `days` days"""
+        today = datetime.now(timezone.utc).date()
+        window_start = (today - timedelta(days=days - 1)).toordinal()
+        trends = []
+        for metric in metrics or TREND_METRICS:
+            series = self._series(user_id, metric, today)
+            shown = slice(int(np.searchsorted(series.days, window_start)), len(series.days))
+            trend = MetricTrend(
+                metric=metric,
+                points=[
+                    TrendPoint(
+                        day=date.fromordinal(day),
+                        value=value,
+                        rolling_mean=rolling,
+                        ewma=smoothed,
+                        z_score=None if np.isnan(z_score) else z_score,
+                    )
+                    for day, value, rolling, smoothed, z_score in zip(
+                        series.days[shown].tolist(),
+                        series.values[shown].tolist(),
+                        series.rolling[shown].tolist(),
+                        series.ewma[shown].tolist(),
+                        series.z_scores[shown].tolist(),
+                    )
+                ],
+                history_days=len(series.days),
+            )
+            if len(series.values):
+                latest = series.values[-1]
+                trend.percentile = float(np.count_nonzero(series.values <= latest) / len(series.values) * 100)
+                trend.p10, trend.median, trend.p90 = np.percentile(series.values, [10, 50, 90]).tolist()
+            trends.append(trend)
+        return trends
+
+    def mark_changed(self, user_id: str, section: str, moments: Iterable[datetime]) -> None:
+        """Make every worker re-read series fed by a digest section when an ingest backfilled them"""
+        changed = [to_utc(moment).date() for moment in moments if moment is not None]
+        if not changed or min(changed) >= self._resync_start(datetime.now(timezone.utc).date()):
+            return
+        for metric in TREND_METRICS_BY_SECTION.get(section, ()):
+            _backfill_markers.set(f"{user_id}:{metric}", datetime.now(timezone.utc).timestamp())
+
+    def _series(self, user_id: str, metric: str, today: date) -> _Series:
+        history_start = today - timedelta(days=HISTORY_DAYS - 1)
+        version = _backfill_markers.get(f"{user_id}:{metric}")
+        series = _series_cache.get((user_id, metric))
+        if series is None or series.version != version:
+            series = None
+            read_from = history_start
+        else:
+            read_from = max(min(series.stale_from, self._resync_start(today)), history_start)
+        rows = self.metrics_repository.get_daily_series(
+            user_id, metric, datetime.combine(read_from, time(), tzinfo=timezone.utc)
+        )
+        series = extend_series(series, rows, read_from, history_start, version)
+        _series_cache.set((user_id, metric), series)
+        return series
+
+    @staticmethod
+    def _resync_start(today: date) -> date:
+        """First day every read fetches again, whatever the cached series holds"""
+        return today - timedelta(days=settings.TREND_RESYNC_DAYS - 1)
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.rid import generate_rid
+from app.db.session import SessionLocal
+from app.repositories.usage_repositories import UsageRepository
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_HOUR = 3600
+
+
+class QuotaStatus(str, Enum):
+    OK = "ok"
+    SOFT_LIMIT = "soft_limit"
+    HARD_LIMIT = "hard_limit"
+
+
+class UsageMeter:
+    """
+    Per-user LLM token metering for one worker process.
+
+    Counters are kept in memory as hourly buckets over a rolling window and seeded from
+    the llm_usage ledger the first time a user is seen, so quota checks cost no queries
+    on the hot path. Ledger rows are buffered and written in batches by a background task
+    every `flush_interval` seconds, or sooner once `batch_size` rows are waiting.
+
+    Counters only see this worker's traffic after seeding, so with several workers a user
+    can overshoot a limit by what the other workers served since the seed.
+    """
+
+    def __init__(
+        self,
+        soft_limit: int,
+        hard_limit: int,
+        flush_interval: float,
+        batch_size: int,
+        window_hours: int = 24,
+    ):
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.window_hours = window_hours
+        self._counters: Dict[str, Dict[int, int]] = {}
+        self._buffer: List[dict] = []
+        self._lock = threading.Lock()
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    """Counters"""
+
+    def _current_hour(self) -> int:
+        return int(time.time() // SECONDS_PER_HOUR)
+
+    def tokens_used(self, user_id: str) -> int:
+        """Tokens used by the user within the rolling window (as known to this worker)."""
+        oldest = self._current_hour() - self.window_hours + 1
+        with self._lock:
+            buckets = self._counters.get(user_id, {})
+            return sum(tokens for hour, tokens in buckets.items() if hour >= oldest)
+
+    def _seed(self, db: Session, user_id: str) -> None:
+        since = datetime.now(timezone.utc) - timedelta(hours=self.window_hours)
+        buckets: Dict[int, int] = {}
+        for hour_start, total in UsageRepository(db).get_hourly_totals(user_id, since):
+            buckets[int(hour_start.timestamp() // SECONDS_PER_HOUR)] = int(total or 0)
+        with self._lock:
+            # Usage recorded while we were querying wins over the snapshot
+            for hour, tokens in self._counters.get(user_id, {}).items():
+                buckets[hour] = buckets.get(hour, 0) + tokens
+            self._counters[user_id] = buckets
+
+    def check_quota(self, db: Session, user_id: str) -> QuotaStatus:
+        """Classify the user's rolling usage against the configured limits."""
+        if not self.soft_limit and not self.hard_limit:
+            return QuotaStatus.OK
+        if user_id not in self._counters:
+            self._seed(db, user_id)
+
+        used = self.tokens_used(user_id)
+        if self.hard_limit and used >= self.hard_limit:
+            logger.warning(f"User {user_id} reached hard LLM token limit: {used}/{self.hard_limit}")
+            return QuotaStatus.HARD_LIMIT
+        if self.soft_limit and used >= self.soft_limit:
+            logger.warning(f"User {user_id} passed soft LLM token limit: {used}/{self.soft_limit}")
+            return QuotaStatus.SOFT_LIMIT
+        return QuotaStatus.OK
+
+    def record(
+        self,
+        user_id: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        conversation_id: Optional[str] = None,
+    ) -> None:
+        """Count usage immediately and queue the ledger row; never touches the database."""
+        total_tokens = prompt_tokens + completion_tokens
+        entry = {
+            "id": generate_rid("chat", "usage"),
+            "user_id": user_id,
+            "conversation_id": conversation_id,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+            "created_at": datetime.now(timezone.utc),
+        }
+        hour = self._current_hour()
+        with self._lock:
+            buckets = self._counters.setdefault(user_id, {})
+            buckets[hour] = buckets.get(hour, 0) + total_tokens
+            self._buffer.append(entry)
+            buffered = len(self._buffer)
+        if buffered >= self.batch_size and self._flush_requested is not None:
+            self._flush_requested.set()
+
+    def _prune_counters(self) -> None:
+        """Forget hours that left the window and users with no usage inside it."""
+        oldest = self._current_hour() - self.window_hours + 1
+        with self._lock:
+            for user_id in list(self._counters):
+                buckets = {h: t for h, t in self._counters[user_id].items() if h >= oldest}
+                if buckets:
+                    self._counters[user_id] = buckets
+                else:
+                    del self._counters[user_id]
+
+    """Ledger writes"""
+
+    def _write(self, entries: List[dict]) -> None:
+        db = SessionLocal()
+        try:
+            UsageRepository(db).bulk_create(entries)
+        finally:
+            db.close()
+
+    async def flush(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        try:
+            # Run the blocking insert off the event loop
+            await asyncio.to_thread(self._write, batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} LLM usage rows: {str(e)}")
+            with self._lock:
+                # Retry next cycle, but never let a dead database grow the buffer without bound
+                if len(self._buffer) + len(batch) <= self.batch_size * 10:
+                    self._buffer = batch + self._buffer
+                else:
+                    logger.error(f"Dropping {len(batch)} LLM usage rows; buffer is full")
+
+    async def _run(self) -> None:
+        assert self._flush_requested is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+            self._prune_counters()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._flush_requested = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background writer and flush whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+# Process-wide meter shared by the chat endpoint and the completion client
+usage_meter = UsageMeter(
+    soft_limit=settings.LLM_DAILY_TOKEN_SOFT_LIMIT,
+    hard_limit=settings.LLM_DAILY_TOKEN_HARD_LIMIT,
+    flush_interval=settings.LLM_USAGE_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.LLM_USAGE_FLUSH_BATCH_SIZE,
+)
@@ -17,6 +17,7 @@ from app.schemas.goal.user_goals import (
 from app.schemas.goal.templates import GoalTemplateRead
 from app.schemas.profile.user_profile import UserProfileRead
 from app.services.goal_template_service import GoalTemplateService
+from app.services.health_digest_service import HealthDigestService
 from app.services.macro_preset_service import MacroPresetService
 from app.services.user_profile_service import UserProfileService
 
@@ -46,7 +47,9 @@ class UserGoalService:
         goal = self.repository.get_by_id(goal_id)
         if not goal:
             return None
-        return self.repository.delete(goal)
+        deleted = self.repository.delete(goal)
+        HealthDigestService(self.db).invalidate(deleted.user_id)
+        return deleted
 
 
     def create_goal(
@@ -83,7 +86,9 @@ class UserGoalService:
             start_bmi=build_result.start_bmi,
             active=True,
         )
-        return self.repository.create(goal)
+        goal = self.repository.create(goal)
+        HealthDigestService(self.db).invalidate(user_id)
+        return goal
 
     """Helper methods for create_goal"""
 
@@ -0,0 +1 @@
+"""End-to-end HTTP benchmark suite; see benchmarks/run.py for usage."""
@@ -0,0 +1,201 @@
+"""
+Deterministic synthetic payloads for the benchmark scenarios.
+
+Every generator takes a random.Random, so a run is reproducible from its seed.
+Values follow rough daily rhythms (little activity at night, a resting heart
+rate that drifts slowly) so indexes and aggregates see realistic data.
+"""
+
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, List
+
+SOURCES = ["apple_watch", "iphone", "fitbit", "garmin", "oura_ring"]
+
+FOOD_NAMES = [
+    "Chicken breast", "Chicken thigh", "Chickpea salad", "Apple", "Apple pie", "Applesauce",
+    "Banana", "Banana bread", "Greek yogurt", "Yogurt parfait", "Oatmeal", "Oat milk",
+    "Brown rice", "Rice cakes", "Salmon fillet", "Salmon sushi", "Egg omelette", "Egg whites",
+    "Peanut butter", "Peanut butter toast", "Almonds", "Almond milk", "Avocado toast",
+    "Beef burrito", "Beef stew", "Turkey sandwich", "Tuna salad", "Protein shake",
+    "Protein bar", "Spinach salad", "Sweet potato", "Whole wheat pasta", "Cottage cheese",
+]
+
+SEARCH_TERMS = ["chick", "apple", "ban", "yog", "oat", "rice", "salmon", "egg", "peanut",
+                "alm", "beef", "protein", "salad", "toast", "milk"]
+
+CHAT_PROMPTS = [
+    "How many steps should I aim for today?",
+    "Can you suggest a high protein breakfast?",
+    "I slept badly last night, any tips?",
+    "Is my resting heart rate normal?",
+    "What should I eat after a workout?",
+]
+
+# Relative activity per hour of day, 0 at night and peaking in the evening
+_ACTIVITY = [0, 0, 0, 0, 0, 0.1, 0.4, 0.8, 0.7, 0.5, 0.5, 0.6,
+             0.8, 0.6, 0.5, 0.5, 0.6, 0.9, 1.0, 0.7, 0.5, 0.3, 0.1, 0]
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time(0), tzinfo=timezone.utc)
+
+
+def hours(day: date, days: int = 1) -> Iterator[datetime]:
+    start = day_start(day)
+    for offset in range(days * 24):
+        yield start + timedelta(hours=offset)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat()
+
+
+def steps(rng: random.Random, day: date, days: int = 1, source: str = "apple_watch") -> List[dict]:
+    return [
+        {"date_hour": _iso(hour), "steps": max(int(rng.gauss(900, 300) * _ACTIVITY[hour.hour]), 0),
+         "source": source}
+        for hour in hours(day, days)
+    ]
+
+
+def miles(rng: random.Random, day: date, days: int = 1, source: str = "apple_watch") -> List[dict]:
+    return [
+        {"date_hour": _iso(hour), "miles": round(max(rng.gauss(0.4, 0.15), 0) * _ACTIVITY[hour.hour], 3),
+         "activity_type": "walking", "source": source}
+        for hour in hours(day, days)
+    ]
+
+
+def heart_rate(rng: random.Random, day: date, days: int = 1, source: str = "apple_watch") -> List[dict]:
+    records = []
+    resting = 58 + rng.randint(-4, 4)
+    for hour in hours(day, days):
+        avg = resting + 35 * _ACTIVITY[hour.hour] + rng.gauss(0, 3)
+        records.append({
+            "date_hour": _iso(hour),
+            "heart_rate": int(avg),
+            "min_hr": int(avg - 8 - rng.random() * 4),
+            "avg_hr": round(avg, 1),
+            "max_hr": int(avg + 15 + rng.random() * 25 * _ACTIVITY[hour.hour]),
+            "resting_hr": resting,
+            "heart_rate_variability": round(rng.gauss(45, 10), 1),
+            "source": source,
+        })
+    return records
+
+
+def active_calories(rng: random.Random, day: date, days: int = 1, source: str = "apple_watch") -> List[dict]:
+    return [
+        {"date_hour": _iso(hour), "calories_burned": round(max(rng.gauss(45, 15), 0) * _ACTIVITY[hour.hour], 1),
+         "source": source}
+        for hour in hours(day, days)
+    ]
+
+
+def baseline_calories(rng: random.Random, day: date, days: int = 1, source: str = "apple_watch") -> List[dict]:
+    return [
+        {"date_hour": _iso(hour), "baseline_calories": round(rng.gauss(70, 2), 1), "bmr": 1680.0,
+         "source": source}
+        for hour in hours(day, days)
+    ]
+
+
+def body_composition(rng: random.Random, day: date, days: int = 1, source: str = "withings") -> List[dict]:
+    weight = 78 + rng.gauss(0, 3)
+    records = []
+    for offset in range(days):
+        weight += rng.gauss(0, 0.2)
+        records.append({
+            "measurement_date": _iso(day_start(day + timedelta(days=offset)) + timedelta(hours=7)),
+            "weight": round(weight, 2),
+            "body_fat_percentage": round(20 + rng.gauss(0, 1), 1),
+            "water_percentage": round(55 + rng.gauss(0, 1), 1),
+            "source": source,
+        })
+    return records
+
+
+def sleep_daily(rng: random.Random, day: date, days: int = 1, source: str = "oura_ring") -> List[dict]:
+    records = []
+    for offset in range(days):
+        start = day_start(day + timedelta(days=offset))
+        total = int(rng.gauss(430, 40))
+        deep, rem = int(total * 0.2), int(total * 0.22)
+        bedtime = start - timedelta(minutes=60 + rng.randint(0, 90))
+        records.append({
+            "date_day": _iso(start),
+            "bedtime": _iso(bedtime),
+            "wake_time": _iso(bedtime + timedelta(minutes=total + 20)),
+            "total_sleep_minutes": total,
+            "deep_sleep_minutes": deep,
+            "rem_sleep_minutes": rem,
+            "light_sleep_minutes": total - deep - rem,
+            "awake_minutes": 20,
+            "sleep_efficiency": round(min(rng.gauss(90, 3), 100), 1),
+            "sleep_quality_score": rng.randint(5, 9),
+            "source": source,
+        })
+    return records
+
+
+def workouts(rng: random.Random, day: date, days: int = 1, source: str = "apple_watch") -> List[dict]:
+    records = []
+    for offset in range(days):
+        # Rest days, but never an empty batch (the bulk endpoints reject those)
+        if rng.random() < 0.4 and (records or offset < days - 1):
+            continue
+        duration = rng.choice([30, 45, 60])
+        records.append({
+            "date": _iso(day_start(day + timedelta(days=offset)) + timedelta(hours=18)),
+            "workout_name": rng.choice(["Run", "Ride", "Strength", "Yoga"]),
+            "workout_type": rng.choice(["cardio", "strength", "flexibility"]),
+            "duration_minutes": duration,
+            "calories_burned": round(duration * rng.uniform(6, 11), 1),
+            "avg_heart_rate": rng.randint(110, 150),
+            "max_heart_rate": rng.randint(155, 185),
+            "intensity": rng.choice(["low", "moderate", "high"]),
+            "source": source,
+        })
+    return records
+
+
+# (name, bulk upsert route, generator) for the eight metric kinds
+METRIC_KINDS = [
+    ("steps", "/api/v1/metric/steps/bulk", steps),
+    ("miles", "/api/v1/metric/miles/bulk", miles),
+    ("heartrate", "/api/v1/metric/heartrate/bulk", heart_rate),
+    ("active", "/api/v1/metric/active/bulk", active_calories),
+    ("baseline", "/api/v1/metric/baseline/bulk", baseline_calories),
+    ("composition", "/api/v1/metric/composition/bulk", body_composition),
+    ("daily", "/api/v1/metric/daily/bulk", sleep_daily),
+    ("workouts", "/api/v1/metric/workouts/bulk", workouts),
+]
+
+
+def meals(rng: random.Random, day: date) -> List[dict]:
+    """A day's worth of macro records (breakfast, lunch, dinner and a snack)."""
+    records = []
+    for hour in (8, 13, 16, 19):
+        calories = rng.uniform(150, 800)
+        records.append({
+            "datetime": _iso(day_start(day) + timedelta(hours=hour)),
+            "food_name": rng.choice(FOOD_NAMES),
+            "calories": round(calories, 1),
+            "protein": round(calories * rng.uniform(0.03, 0.08), 1),
+            "carbs": round(calories * rng.uniform(0.08, 0.14), 1),
+            "fat": round(calories * rng.uniform(0.02, 0.05), 1),
+        })
+    return records
+
+
+def food(rng: random.Random, index: int) -> dict:
+    calories = rng.uniform(50, 600)
+    return {
+        "name": f"{FOOD_NAMES[index % len(FOOD_NAMES)]} #{index}",
+        "brand": rng.choice([None, "Generic", "FarmFresh", "GoodFoods"]),
+        "calories": round(calories, 1),
+        "protein": round(calories * rng.uniform(0.02, 0.1), 1),
+        "carbs": round(calories * rng.uniform(0.05, 0.15), 1),
+        "fat": round(calories * rng.uniform(0.01, 0.06), 1),
+    }
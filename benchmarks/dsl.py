@@ -0,0 +1,97 @@
+"""
+Scenario DSL.
+
+A scenario is a list of HTTP steps that every virtual user runs in order, once
+per iteration, after optional setup steps whose timings are not recorded:
+
+    Scenario("food_search", "Type-ahead food search", users=20, iterations=25)
+        .before("create foods", "POST", FOODS, json=lambda ctx: data.food(ctx.rng, 0))
+        .get("search", FOODS, params=lambda ctx: {"search": ctx.rng.choice(data.SEARCH_TERMS)})
+
+Paths are route templates (e.g. /api/v1/nutrition/macros/daily/{date}) filled
+from `path_params`, so results line up with the server's per-route metrics.
+Payload, query and path callables receive a Context and must only draw
+randomness from ctx.rng to keep runs reproducible.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_EXPECT = (200, 201, 204)
+
+
+@dataclass
+class Context:
+    """What a virtual user knows while building a request."""
+
+    user: int
+    iteration: int
+    rng: random.Random
+    today: date
+    state: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Step:
+    name: str
+    method: str
+    route: str
+    path_params: Optional[Callable[[Context], dict]] = None
+    params: Optional[Callable[[Context], dict]] = None
+    json: Optional[Callable[[Context], Any]] = None
+    expect: Tuple[int, ...] = DEFAULT_EXPECT
+    repeat: int = 1
+    shared: bool = False  # setup only: run once by the first user before the others start
+
+    def build(self, ctx: Context) -> Tuple[str, Optional[dict], Any]:
+        """Concrete path, query parameters and JSON body for one request."""
+        path = self.route.format(**self.path_params(ctx)) if self.path_params else self.route
+        params = self.params(ctx) if self.params else None
+        body = self.json(ctx) if self.json else None
+        return path, params, body
+
+
+class Scenario:
+    """
+    Named workload: `users` virtual users each run `steps` for `iterations` rounds.
+
+    Args:
+        name: Identifier used on the command line and in results
+        description: One line shown in reports
+        users: Concurrent virtual users
+        iterations: Rounds per user
+        think_ms: Pause between a user's rounds (e.g. a polling interval)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        users: int = 10,
+        iterations: int = 10,
+        think_ms: float = 0.0,
+    ):
+        self.name = name
+        self.description = description
+        self.users = users
+        self.iterations = iterations
+        self.think_ms = think_ms
+        self.setup: List[Step] = []
+        self.steps: List[Step] = []
+
+    def step(self, name: str, method: str, route: str, **options) -> "Scenario":
+        self.steps.append(Step(name, method, route, **options))
+        return self
+
+    def get(self, name: str, route: str, **options) -> "Scenario":
+        return self.step(name, "GET", route, **options)
+
+    def post(self, name: str, route: str, **options) -> "Scenario":
+        return self.step(name, "POST", route, **options)
+
+    def before(self, name: str, method: str, route: str, **options) -> "Scenario":
+        """Add an unmeasured setup step (repeat=N runs it N times, shared=True runs it once)."""
+        self.setup.append(Step(name, method, route, **options))
+        return self
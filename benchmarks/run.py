@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+End-to-end HTTP benchmarks against a local server and Postgres.
+
+Start the server with the stub LLM and one worker (so /metrics sees every
+request), with login throttling relaxed for the bench users:
+
+    LLM_BACKEND=mock LOGIN_RATE_LIMIT_IP_CAPACITY=1000 \\
+        uv run uvicorn app.main:app --workers 1
+
+then run every scenario, or a few of them:
+
+    uv run python -m benchmarks --history-days 730
+    uv run python -m benchmarks --scenario dashboard --scenario food_search --skip-seed
+
+Bench users are created on first use and seeded with `--history-days` of
+hourly metrics through the bulk endpoints (skipped when already seeded; for
+larger datasets load them with the synthetic data generator and pass
+--skip-seed). Results are printed and written as JSON to benchmarks/results/;
+pass `--compare` with an earlier results file to see p95 and RPS deltas.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.runner import bench_tokens, run_scenario, seed_history  # noqa: E402
+from benchmarks.scenarios import SCENARIOS  # noqa: E402
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_scenario(name: str, results: dict) -> None:
+    print("=" * 50)
+    print(f"{name}: {results['description']}")
+    print(f"Users x iterations: {results['users']} x {results['iterations']}")
+    print(f"Requests:    {results['requests']} ({results['errors']} unexpected)")
+    print(f"Wall time:   {results['wall_time_s']:.2f}s")
+    print(f"Throughput:  {results['rps']:.1f} req/s")
+    for step_name, step in results["steps"].items():
+        latency = step.get("latency_ms")
+        timing = (
+            f"p50 {latency['p50']:.0f} / p95 {latency['p95']:.0f} / p99 {latency['p99']:.0f} ms"
+            if latency
+            else "no successful requests"
+        )
+        statements = step["statements_per_request"]
+        statements_text = f"{statements:g} stmts/req" if statements is not None else "stmts n/a"
+        print(f"  {step_name:<22} {timing}  {step['rps']:.1f} req/s  {statements_text}  {step['statuses']}")
+
+
+def print_comparison(current: dict, baseline: dict) -> None:
+    print("=" * 50)
+    print(f"Compared with {baseline.get('commit') or 'baseline'} ({baseline.get('started_at')})")
+    for name, results in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or "latency_ms" not in results or "latency_ms" not in previous:
+            continue
+        p95, old_p95 = results["latency_ms"]["p95"], previous["latency_ms"]["p95"]
+        rps, old_rps = results["rps"], previous["rps"]
+        print(
+            f"  {name:<18} p95 {old_p95:.0f} -> {p95:.0f} ms ({(p95 - old_p95) / old_p95 * 100:+.1f}%)  "
+            f"rps {old_rps:.1f} -> {rps:.1f} ({(rps - old_rps) / old_rps * 100:+.1f}%)"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end HTTP benchmarks")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS) + ["all"],
+        help="Scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Seed for every generated payload")
+    parser.add_argument("--history-days", type=int, default=365, help="Days of history to seed per bench user")
+    parser.add_argument("--skip-seed", action="store_true", help="Do not seed history")
+    parser.add_argument("--user-prefix", default="bench", help="Bench users are <prefix>-<n>@example.com")
+    parser.add_argument("--password", default="bench-password-123")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    names = args.scenario or ["all"]
+    scenarios = list(SCENARIOS.values()) if "all" in names else [SCENARIOS[name] for name in names]
+    users = max(scenario.users for scenario in scenarios)
+    today = date.today()
+    started_at = datetime.now(timezone.utc)
+
+    print(f"🔄 Preparing {users} bench users against {args.base_url}...")
+    tokens = bench_tokens(args.base_url, users, args.user_prefix, args.password)
+    if not args.skip_seed and args.history_days > 0:
+        print(f"🌱 Seeding {args.history_days} days of history per user (skipped where present)...")
+        with ThreadPoolExecutor(max_workers=min(users, 8)) as executor:
+            sent = sum(executor.map(
+                lambda user: seed_history(args.base_url, tokens[user], user, args.history_days, args.seed, today),
+                range(users),
+            ))
+        print(f"✅ Seeding done ({sent} bulk requests)")
+
+    results = {
+        "started_at": started_at.isoformat(),
+        "commit": git_commit(),
+        "base_url": args.base_url,
+        "seed": args.seed,
+        "history_days": 0 if args.skip_seed else args.history_days,
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        print(f"🔄 Running {scenario.name}...")
+        results["scenarios"][scenario.name] = run_scenario(
+            scenario, args.base_url, tokens, args.seed, today, args.timeout
+        )
+        print_scenario(scenario.name, results["scenarios"][scenario.name])
+
+    output = args.output or RESULTS_DIR / f"{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print("=" * 50)
+    print(f"📄 Results written to {output}")
+
+    if args.compare:
+        print_comparison(results, json.loads(args.compare.read_text()))
+
+    failed = any(scenario["errors"] for scenario in results["scenarios"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
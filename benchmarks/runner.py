@@ -0,0 +1,273 @@
+"""
+Runs scenarios against a live server and summarises what happened.
+
+Latencies are measured client side. Statements per request come from the
+server's /metrics (db_request_statements, per route template), scraped before
+and after each scenario; with several workers a scrape only sees the worker
+that answered it, so run the server with one worker for exact numbers.
+"""
+
+import random
+import re
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks import data
+from benchmarks.dsl import Context, Scenario, Step
+from benchmarks.scenarios import SYNC_WINDOW_DAYS
+from scripts.bench_chat import percentile
+
+SIGNUP_PATH = "/api/v1/auth/signup"
+LOGIN_PATH = "/api/v1/auth/login"
+METRICS_PATH = "/metrics"
+SEED_CHUNK_DAYS = 7
+
+_STATEMENT_SAMPLE = re.compile(r'^db_request_statements_(sum|count)\{route="([^"]*)"\} (\S+)$', re.MULTILINE)
+
+
+class Client:
+    """requests.Session bound to one bench user."""
+
+    def __init__(self, base_url: str, token: str, timeout: float):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def send(self, step: Step, ctx: Context) -> Tuple[int, float]:
+        """Issue one request; returns (status, seconds), status 0 on a transport error."""
+        path, params, body = step.build(ctx)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                step.method, self.base_url + path, params=params, json=body, timeout=self.timeout
+            )
+            return response.status_code, time.perf_counter() - started
+        except requests.RequestException:
+            return 0, time.perf_counter() - started
+
+
+# Bench users and seed data
+
+
+def _login(base_url: str, email: str, password: str) -> str:
+    # Login is rate limited per IP; honour Retry-After rather than failing the run
+    for _ in range(30):
+        response = requests.post(base_url + LOGIN_PATH, json={"email": email, "password": password}, timeout=60)
+        if response.status_code == 429:
+            time.sleep(int(response.headers.get("Retry-After", "5")))
+            continue
+        response.raise_for_status()
+        return response.json()["access_token"]
+    raise RuntimeError(f"Could not log in {email}: still rate limited")
+
+
+def bench_tokens(base_url: str, count: int, prefix: str, password: str) -> List[str]:
+    """Sign up (or log in) `count` bench users and return their access tokens."""
+    tokens = []
+    for index in range(count):
+        email = f"{prefix}-{index}@example.com"
+        response = requests.post(
+            base_url + SIGNUP_PATH,
+            json={"email": email, "password": password, "full_name": f"Bench User {index}"},
+            timeout=60,
+        )
+        if response.status_code in (200, 201):
+            tokens.append(response.json()["access_token"])
+        elif response.status_code == 400:
+            tokens.append(_login(base_url, email, password))
+        else:
+            raise RuntimeError(f"Could not create bench user {email}: HTTP {response.status_code}")
+    return tokens
+
+
+def seed_history(base_url: str, token: str, user: int, days: int, seed: int, today: date) -> int:
+    """
+    Upload `days` of history for all eight metric kinds, ending where the sync
+    window starts. Skipped when the first day is already there. Returns the
+    number of bulk requests sent.
+    """
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    first_day = today - timedelta(days=SYNC_WINDOW_DAYS + days)
+    probe = session.get(
+        base_url + "/api/v1/metric/steps/",
+        params={
+            "start_date": data.day_start(first_day).isoformat(),
+            "end_date": data.day_start(first_day + timedelta(days=1)).isoformat(),
+        },
+        timeout=60,
+    )
+    if probe.status_code == 200 and probe.json().get("total_count"):
+        return 0
+
+    rng = random.Random(f"{seed}:history:{user}")
+    sent = 0
+    for offset in range(0, days, SEED_CHUNK_DAYS):
+        chunk_days = min(SEED_CHUNK_DAYS, days - offset)
+        day = first_day + timedelta(days=offset)
+        for kind, route, generator in data.METRIC_KINDS:
+            response = session.post(
+                base_url + route, json={"records": generator(rng, day, chunk_days)}, timeout=300
+            )
+            if response.status_code >= 400:
+                raise RuntimeError(f"Seeding {kind} for user {user} failed: HTTP {response.status_code}")
+            sent += 1
+    return sent
+
+
+# Server-side statement counts
+
+
+def scrape_statements(base_url: str) -> Optional[Dict[str, Tuple[float, float]]]:
+    """route -> (statements sum, request count) from /metrics, or None if unavailable."""
+    try:
+        response = requests.get(base_url + METRICS_PATH, timeout=10)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    totals: Dict[str, List[float]] = {}
+    for kind, route, value in _STATEMENT_SAMPLE.findall(response.text):
+        totals.setdefault(route, [0.0, 0.0])[0 if kind == "sum" else 1] = float(value)
+    return {route: (values[0], values[1]) for route, values in totals.items()}
+
+
+def _statements_per_request(before, after, route: str) -> Optional[float]:
+    if before is None or after is None:
+        return None
+    total_before, count_before = before.get(route, (0.0, 0.0))
+    total_after, count_after = after.get(route, (0.0, 0.0))
+    requests_seen = count_after - count_before
+    if requests_seen <= 0:
+        return None
+    return round((total_after - total_before) / requests_seen, 2)
+
+
+# Running scenarios
+
+
+class _Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Counter] = {}
+        self.unexpected: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: Step, status: int, seconds: float) -> None:
+        with self._lock:
+            self.statuses.setdefault(step.name, Counter())[status] += 1
+            if status in step.expect:
+                self.latencies.setdefault(step.name, []).append(seconds)
+            else:
+                self.unexpected[step.name] = self.unexpected.get(step.name, 0) + 1
+
+
+def summarize(latencies: List[float], statuses: Counter, errors: int, wall_time: float) -> dict:
+    total = sum(statuses.values())
+    summary = {
+        "requests": total,
+        "errors": errors,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(total / wall_time, 2) if wall_time else 0.0,
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "mean": round(statistics.mean(latencies) * 1000, 2),
+            "max": round(max(latencies) * 1000, 2),
+        }
+    return summary
+
+
+def _context(scenario: Scenario, user: int, seed: int, today: date) -> Context:
+    return Context(user=user, iteration=0, rng=random.Random(f"{seed}:{scenario.name}:{user}"), today=today)
+
+
+def _run_setup(client: Client, steps: List[Step], ctx: Context) -> None:
+    for step in steps:
+        for index in range(step.repeat):
+            ctx.iteration = index
+            status, _ = client.send(step, ctx)
+            if status not in step.expect:
+                raise RuntimeError(f"Setup step '{step.name}' failed: HTTP {status}")
+    ctx.iteration = 0
+
+
+def _run_user(client: Client, scenario: Scenario, ctx: Context, recorder: _Recorder) -> None:
+    for iteration in range(scenario.iterations):
+        ctx.iteration = iteration
+        for step in scenario.steps:
+            for _ in range(step.repeat):
+                status, seconds = client.send(step, ctx)
+                recorder.record(step, status, seconds)
+        if scenario.think_ms:
+            time.sleep(scenario.think_ms / 1000)
+
+
+def run_scenario(
+    scenario: Scenario,
+    base_url: str,
+    tokens: List[str],
+    seed: int,
+    today: date,
+    timeout: float,
+) -> dict:
+    """Run one scenario with the first `scenario.users` tokens and return its results."""
+    users = min(scenario.users, len(tokens))
+    clients = [Client(base_url, tokens[user], timeout) for user in range(users)]
+    contexts = [_context(scenario, user, seed, today) for user in range(users)]
+
+    shared = [step for step in scenario.setup if step.shared]
+    per_user = [step for step in scenario.setup if not step.shared]
+    if shared:
+        _run_setup(clients[0], shared, contexts[0])
+    if per_user:
+        with ThreadPoolExecutor(max_workers=users) as executor:
+            for future in [
+                executor.submit(_run_setup, clients[user], per_user, contexts[user]) for user in range(users)
+            ]:
+                future.result()
+
+    recorder = _Recorder()
+    before = scrape_statements(base_url)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        for future in [
+            executor.submit(_run_user, clients[user], scenario, contexts[user], recorder) for user in range(users)
+        ]:
+            future.result()
+    wall_time = time.perf_counter() - started
+    after = scrape_statements(base_url)
+
+    steps = {}
+    all_latencies: List[float] = []
+    all_statuses: Counter = Counter()
+    for step in scenario.steps:
+        latencies = recorder.latencies.get(step.name, [])
+        statuses = recorder.statuses.get(step.name, Counter())
+        result = summarize(latencies, statuses, recorder.unexpected.get(step.name, 0), wall_time)
+        result["route"] = f"{step.method} {step.route}"
+        result["statements_per_request"] = _statements_per_request(before, after, step.route)
+        steps[step.name] = result
+        all_latencies.extend(latencies)
+        all_statuses.update(statuses)
+
+    results = summarize(all_latencies, all_statuses, sum(recorder.unexpected.values()), wall_time)
+    results.update({
+        "description": scenario.description,
+        "users": users,
+        "iterations": scenario.iterations,
+        "wall_time_s": round(wall_time, 3),
+        "steps": steps,
+    })
+    return results
@@ -0,0 +1,80 @@
+"""
+The benchmark scenarios, in the order `--scenario all` runs them.
+"""
+
+from datetime import timedelta
+
+from benchmarks import data
+from benchmarks.dsl import Context, Scenario
+
+# Days before today left out of the seeded history, so sync bursts create rows
+# instead of updating them
+SYNC_WINDOW_DAYS = 30
+
+FOODS = "/api/v1/nutrition/foods/"
+
+
+def sync_day(ctx: Context):
+    return ctx.today - timedelta(days=SYNC_WINDOW_DAYS - ctx.iteration % SYNC_WINDOW_DAYS)
+
+
+def last_week(ctx: Context) -> dict:
+    start = data.day_start(ctx.today - timedelta(days=7))
+    return {"start_date": start.isoformat(), "end_date": data.day_start(ctx.today).isoformat()}
+
+
+def today_param(ctx: Context) -> dict:
+    return {"date": data.day_start(ctx.today).isoformat().replace("+00:00", "Z")}
+
+
+def _sync_payload(generator):
+    return lambda ctx: {"records": generator(ctx.rng, sync_day(ctx))}
+
+
+sync_burst = Scenario(
+    "sync_burst",
+    "Device sync: one day of bulk upserts for each of the eight metric kinds",
+    users=20,
+    iterations=10,
+)
+for kind, route, generator in data.METRIC_KINDS:
+    sync_burst.post(f"{kind} bulk", route, json=_sync_payload(generator))
+
+dashboard = (
+    Scenario("dashboard", "Dashboard load: the user, a week of metrics and active goals", users=30, iterations=20)
+    .get("user", "/api/v1/auth/user/")
+    .get("steps week", "/api/v1/metric/steps/", params=last_week)
+    .get("heartrate week", "/api/v1/metric/heartrate/", params=last_week)
+    .get("active calories week", "/api/v1/metric/active/", params=last_week)
+    .get("sleep week", "/api/v1/metric/daily/", params=last_week)
+    .get("active goals", "/api/v1/goal/user-goals/active", expect=(200, 404))
+)
+
+nutrition_polling = (
+    Scenario("nutrition_polling", "Daily nutrition totals polled every second", users=50, iterations=20, think_ms=1000)
+    .before("log meals", "POST", "/api/v1/nutrition/macros/bulk",
+            json=lambda ctx: {"records": data.meals(ctx.rng, ctx.today)})
+    .get("daily macros", "/api/v1/nutrition/macros/daily/{date}", path_params=today_param)
+    .get("daily consumption", "/api/v1/nutrition/consumption-logs/daily/{date}", path_params=today_param)
+)
+
+food_search = (
+    Scenario("food_search", "Type-ahead food search over a shared catalogue", users=20, iterations=25)
+    .before("create foods", "POST", FOODS, json=lambda ctx: data.food(ctx.rng, ctx.iteration),
+            repeat=200, shared=True)
+    .get("search", FOODS, params=lambda ctx: {"search": ctx.rng.choice(data.SEARCH_TERMS), "limit": 20})
+)
+
+# Every bench user chats in its own conversation. Conversations outlive the run, so the
+# context sent to the model grows run over run; use a new --user-prefix to start empty
+chat = (
+    Scenario("chat", "Assistant chat against the stub LLM (LLM_BACKEND=mock), one conversation per user",
+             users=20, iterations=5)
+    .post("message", "/api/v1/chat/assistant/",
+          json=lambda ctx: {"message": data.CHAT_PROMPTS[ctx.iteration % len(data.CHAT_PROMPTS)]})
+)
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (sync_burst, dashboard, nutrition_polling, food_search, chat)
+}
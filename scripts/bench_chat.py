@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Load-test the chat assistant endpoint end to end.
+
+Start the server with the mock LLM backend so no OpenAI calls are made:
+
+    LLM_BACKEND=mock MOCK_LLM_LATENCY_MS=400 uv run uvicorn app.main:app --workers 2
+
+then drive N concurrent conversations through POST /api/v1/chat/assistant/:
+
+    uv run python scripts/bench_chat.py --conversations 50 --turns 5
+
+Each conversation signs up its own user first (not timed), so every simulated
+user has its own conversation, quota and health digest, and history starts
+empty on every run.
+
+Reports latency percentiles, throughput and the peak DB pool usage observed
+through /api/v1/system/health/db-pool while the run was in flight (pool
+numbers come from whichever worker answers the poll).
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import requests
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+SIGNUP_PATH = "/api/v1/auth/signup"
+CHAT_PATH = "/api/v1/chat/assistant/"
+POOL_PATH = "/api/v1/system/health/db-pool"
+
+PROMPTS = [
+    "How many steps should I aim for today?",
+    "Can you suggest a high protein breakfast?",
+    "I slept badly last night, any tips?",
+    "Is my resting heart rate normal?",
+    "What should I eat after a workout?",
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def create_user(base_url: str, email: str, password: str, timeout: float) -> str:
+    """Sign up a bench user and return its access token."""
+    response = requests.post(
+        base_url + SIGNUP_PATH,
+        json={"email": email, "password": password, "full_name": "Chat Bench User"},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def run_conversation(
+    base_url: str, token: str, turns: int, timeout: float, latencies: List[float], errors: List[str]
+) -> None:
+    """One simulated user sending `turns` sequential messages."""
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    for turn in range(turns):
+        started = time.perf_counter()
+        try:
+            response = session.post(
+                base_url + CHAT_PATH,
+                json={"message": PROMPTS[turn % len(PROMPTS)]},
+                timeout=timeout,
+            )
+            elapsed = time.perf_counter() - started
+            if response.status_code == 200:
+                latencies.append(elapsed)
+            else:
+                errors.append(f"HTTP {response.status_code}")
+        except requests.RequestException as e:
+            errors.append(type(e).__name__)
+
+
+def poll_pool(base_url: str, stop: threading.Event, samples: List[dict]) -> None:
+    """Sample pool usage every 100ms until stopped."""
+    session = requests.Session()
+    while not stop.is_set():
+        try:
+            samples.append(session.get(base_url + POOL_PATH, timeout=2).json())
+        except requests.RequestException:
+            pass
+        stop.wait(0.1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Chat endpoint load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--conversations", type=int, default=20, help="Concurrent conversations")
+    parser.add_argument("--turns", type=int, default=5, help="Messages per conversation")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--password", default="bench-password-123", help="Password of the bench users")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    print(f"👤 Signing up {args.conversations} bench users...")
+    tokens = [
+        create_user(args.base_url, f"bench-chat-{run_id}-{index}@example.com", args.password, args.timeout)
+        for index in range(args.conversations)
+    ]
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    pool_samples: List[dict] = []
+    stop = threading.Event()
+
+    poller = threading.Thread(target=poll_pool, args=(args.base_url, stop, pool_samples), daemon=True)
+    poller.start()
+
+    print(f"🔄 Running {args.conversations} conversations x {args.turns} turns against {args.base_url}...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.conversations) as executor:
+        for token in tokens:
+            executor.submit(run_conversation, args.base_url, token, args.turns, args.timeout, latencies, errors)
+    wall_time = time.perf_counter() - started
+
+    stop.set()
+    poller.join()
+
+    total = len(latencies) + len(errors)
+    print("=" * 50)
+    print(f"Requests:    {total} ({len(errors)} failed)")
+    print(f"Wall time:   {wall_time:.2f}s")
+    print(f"Throughput:  {len(latencies) / wall_time:.1f} req/s")
+    if latencies:
+        print(f"Latency p50: {percentile(latencies, 50) * 1000:.0f} ms")
+        print(f"Latency p95: {percentile(latencies, 95) * 1000:.0f} ms")
+        print(f"Latency p99: {percentile(latencies, 99) * 1000:.0f} ms")
+        print(f"Latency avg: {statistics.mean(latencies) * 1000:.0f} ms")
+    if pool_samples:
+        print(f"DB pool size:            {pool_samples[-1]['size']}")
+        print(f"DB pool peak checked out: {max(s['checked_out'] for s in pool_samples)}")
+        print(f"DB pool peak overflow:    {max(s['overflow'] for s in pool_samples)}")
+    else:
+        print("DB pool usage: unavailable (pool endpoint not reachable)")
+    if errors:
+        print(f"Errors: {sorted(set(errors))}")
+    print("=" * 50)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Measure how a login storm affects everything else on the worker.
+
+Start the server, then run:
+
+    uv run python scripts/bench_login.py --logins 400 --concurrency 50
+
+The script signs up a bench user (or reuses it), fires concurrent logins at
+POST /api/v1/auth/login and, at the same time, probes GET /api/v1/system/health
+every 20ms. The health endpoint does no work, so its latency is a direct
+read of event-loop stalls: with bcrypt on the loop it climbs to hundreds of
+milliseconds, with the password pool it should stay near the idle baseline.
+Login 503s mean the pool shed load; the peak queue depth comes from
+/api/v1/system/health/password-pool.
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import requests
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.bench_chat import percentile  # noqa: E402
+
+LOGIN_PATH = "/api/v1/auth/login"
+SIGNUP_PATH = "/api/v1/auth/signup"
+HEALTH_PATH = "/api/v1/system/health"
+POOL_PATH = "/api/v1/system/health/password-pool"
+
+
+def ensure_user(base_url: str, email: str, password: str) -> None:
+    response = requests.post(
+        base_url + SIGNUP_PATH,
+        json={"email": email, "password": password, "full_name": "Bench User"},
+        timeout=30,
+    )
+    if response.status_code not in (201, 400):
+        raise RuntimeError(f"Could not create bench user: HTTP {response.status_code}")
+
+
+def probe(base_url: str, stop: threading.Event, latencies: List[float], pool_samples: List[dict]) -> None:
+    """Time the no-op health endpoint and sample the password pool until stopped."""
+    session = requests.Session()
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            session.get(base_url + HEALTH_PATH, timeout=10)
+            latencies.append(time.perf_counter() - started)
+            pool_samples.append(session.get(base_url + POOL_PATH, timeout=10).json())
+        except requests.RequestException:
+            pass
+        stop.wait(0.02)
+
+
+def login(base_url: str, email: str, password: str, statuses: List[int], latencies: List[float]) -> None:
+    started = time.perf_counter()
+    try:
+        response = requests.post(
+            base_url + LOGIN_PATH, json={"email": email, "password": password}, timeout=60
+        )
+        statuses.append(response.status_code)
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+    except requests.RequestException:
+        statuses.append(0)
+
+
+def measure_idle(base_url: str, samples: int = 50) -> List[float]:
+    session = requests.Session()
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        session.get(base_url + HEALTH_PATH, timeout=10)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def report_latency(label: str, latencies: List[float]) -> None:
+    if not latencies:
+        print(f"{label}: no samples")
+        return
+    print(
+        f"{label}: p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+        f"p99 {percentile(latencies, 99) * 1000:.1f} ms, "
+        f"max {max(latencies) * 1000:.1f} ms, avg {statistics.mean(latencies) * 1000:.1f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Login storm / event-loop latency benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=200, help="Total login requests")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent login clients")
+    parser.add_argument("--email", default="bench-login@example.com")
+    parser.add_argument("--password", default="bench-login-password")
+    args = parser.parse_args()
+
+    ensure_user(args.base_url, args.email, args.password)
+    idle = measure_idle(args.base_url)
+
+    statuses: List[int] = []
+    login_latencies: List[float] = []
+    probe_latencies: List[float] = []
+    pool_samples: List[dict] = []
+    stop = threading.Event()
+    prober = threading.Thread(
+        target=probe, args=(args.base_url, stop, probe_latencies, pool_samples), daemon=True
+    )
+    prober.start()
+
+    print(f"🔄 Sending {args.logins} logins with {args.concurrency} concurrent clients to {args.base_url}...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for _ in range(args.logins):
+            executor.submit(login, args.base_url, args.email, args.password, statuses, login_latencies)
+    wall_time = time.perf_counter() - started
+
+    stop.set()
+    prober.join()
+
+    shed = statuses.count(503)
+    failed = len([s for s in statuses if s not in (200, 503)])
+    print("=" * 50)
+    print(f"Logins:      {len(statuses)} ({statuses.count(200)} ok, {shed} shed with 503, {failed} failed)")
+    print(f"Wall time:   {wall_time:.2f}s ({statuses.count(200) / wall_time:.1f} logins/s)")
+    report_latency("Login latency       ", login_latencies)
+    report_latency("Event loop idle     ", idle)
+    report_latency("Event loop in storm ", probe_latencies)
+    if pool_samples:
+        print(f"Password pool workers:    {pool_samples[-1]['workers']}")
+        print(f"Password pool peak queue: {max(s['queue_depth'] for s in pool_samples)}")
+    print("=" * 50)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compare random and time-sortable RIDs as primary keys.
+
+    uv run python scripts/bench_rid.py --rows 2000000 --batch 1000
+
+First times id generation (generate_rid, generate_sortable_rid and the batch
+generate_sortable_rids). Then, for each scheme, inserts --rows rows into a
+scratch table with a text primary key, in batches like a bulk endpoint would,
+and reports throughput over the first and last tenth of the run together with
+the final primary key index size. Random suffixes land anywhere in the index,
+so once it outgrows shared_buffers every batch touches cold pages and splits
+full ones; sortable ids append to the rightmost leaf. The scratch tables are
+dropped afterwards unless --keep is given.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.rid import generate_rid, generate_sortable_rid, generate_sortable_rids  # noqa: E402
+
+HIGH_LEVEL_TYPE = "metric"
+RESOURCE_TYPE = "body_heartrate"
+
+SCHEMES = {
+    "random": lambda count: [generate_rid(HIGH_LEVEL_TYPE, RESOURCE_TYPE) for _ in range(count)],
+    "sortable": lambda count: generate_sortable_rids(HIGH_LEVEL_TYPE, RESOURCE_TYPE, count),
+}
+
+
+def time_generation(label: str, make: Callable[[], List[str]], ids_per_call: int, calls: int) -> None:
+    started = time.perf_counter()
+    for _ in range(calls):
+        make()
+    elapsed = time.perf_counter() - started
+    total = ids_per_call * calls
+    print(f"{label:<32} {total / elapsed:>12,.0f} ids/s  ({elapsed / total * 1e6:.2f} us/id)")
+
+
+def bench_inserts(connection, scheme: str, rows: int, batch: int, keep: bool) -> None:
+    from psycopg2.extras import execute_values
+
+    table = f"bench_rid_{scheme}"
+    cursor = connection.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(
+        f"CREATE TABLE {table} (id text PRIMARY KEY, user_id text NOT NULL, value integer, created_at timestamptz)"
+    )
+    connection.commit()
+
+    now = datetime.now(timezone.utc)
+    tenth = max(rows // batch // 10, 1)
+    batch_times: List[float] = []
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        count = min(batch, rows - offset)
+        ids = SCHEMES[scheme](count)
+        batch_started = time.perf_counter()
+        execute_values(
+            cursor,
+            f"INSERT INTO {table} (id, user_id, value, created_at) VALUES %s",
+            [(rid, "auth..user.bench", offset + index, now) for index, rid in enumerate(ids)],
+            page_size=count,
+        )
+        connection.commit()
+        batch_times.append(time.perf_counter() - batch_started)
+    elapsed = time.perf_counter() - started
+
+    cursor.execute("SELECT pg_relation_size(%s), pg_relation_size(%s)", (table, f"{table}_pkey"))
+    table_size, index_size = cursor.fetchone()
+    first = tenth * batch / sum(batch_times[:tenth])
+    last = tenth * batch / sum(batch_times[-tenth:])
+    print(
+        f"{scheme:<10} {rows / elapsed:>10,.0f} rows/s overall, first 10% {first:,.0f}, last 10% {last:,.0f}  "
+        f"index {index_size / 2**20:,.1f} MiB (table {table_size / 2**20:,.1f} MiB)"
+    )
+    if not keep:
+        cursor.execute(f"DROP TABLE {table}")
+        connection.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Random vs time-sortable RID benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows inserted per scheme")
+    parser.add_argument("--batch", type=int, default=1000, help="Rows per INSERT transaction")
+    parser.add_argument("--scheme", action="append", choices=sorted(SCHEMES), help="Scheme to insert (repeatable)")
+    parser.add_argument("--generate-only", action="store_true", help="Only time id generation")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables")
+    args = parser.parse_args()
+
+    print("🔄 Id generation")
+    time_generation("generate_rid", lambda: generate_rid(HIGH_LEVEL_TYPE, RESOURCE_TYPE), 1, 100_000)
+    time_generation("generate_sortable_rid", lambda: generate_sortable_rid(HIGH_LEVEL_TYPE, RESOURCE_TYPE), 1, 100_000)
+    time_generation(
+        f"generate_sortable_rids x{args.batch}",
+        lambda: generate_sortable_rids(HIGH_LEVEL_TYPE, RESOURCE_TYPE, args.batch),
+        args.batch,
+        max(100_000 // args.batch, 1),
+    )
+    if args.generate_only:
+        return 0
+
+    from app.db.session import engine
+
+    print(f"🔄 Inserting {args.rows:,} rows per scheme in batches of {args.batch}")
+    connection = engine.raw_connection()
+    try:
+        for scheme in args.scheme or list(SCHEMES):
+            bench_inserts(connection, scheme, args.rows, args.batch, args.keep)
+    finally:
+        connection.close()
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Fill the database with a large, deterministic synthetic dataset using COPY.
+
+    uv run python scripts/generate_synthetic_data.py --users 1000 --years 2 --workers 8
+
+Every user gets an account, a profile and, for each day of the range, hourly
+steps, miles, heart rate, active and baseline calories, a night of sleep and
+their meals (nutrition_macros, plus consumption_logs against a shared food
+catalogue); some days also get a workout, a body composition measurement or a
+chat conversation. Values follow per-user traits (wake time, step volume,
+resting heart rate, weight), so the data looks like people: circadian step
+curves, heart rate that tracks activity, meals at habitual times.
+
+The output depends only on --seed and the user index, never on --workers, so a
+run can be reproduced exactly or extended later with --first-user. Users are
+split into batches; each worker process generates a batch into in-memory COPY
+buffers and loads it in one transaction. 1000 users x 2 years is about 95M
+rows. Use --dry-run to measure generation speed without a database.
+
+Load into a fresh database (see scripts/reset_db.py): accounts are
+<prefix>-<n>@example.com and collide with an earlier run using the same prefix.
+All synthetic users share --password.
+"""
+
+import argparse
+import io
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Columns loaded per table, in load order (parents before children)
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "auth_users": (
+        "id", "user_key", "email", "hashed_password", "full_name", "is_active", "is_superuser",
+        "token_version", "created_at",
+    ),
+    "user_profiles": ("user_id", "height_in", "birth_date", "sex", "timezone", "default_activity_level"),
+    "activity_steps": ("id", "user_key", "date_hour", "steps", "source", "created_at"),
+    "activity_miles": ("id", "user_key", "date_hour", "miles", "activity_type", "source", "created_at"),
+    "body_heartrate": (
+        "id", "user_key", "date_hour", "heart_rate", "min_hr", "avg_hr", "max_hr", "resting_hr",
+        "heart_rate_variability", "source", "created_at",
+    ),
+    "calories_active": ("id", "user_key", "date_hour", "calories_burned", "source", "created_at"),
+    "calories_baseline": ("id", "user_key", "date_hour", "baseline_calories", "bmr", "source", "created_at"),
+    "sleep_daily": (
+        "id", "user_id", "date_day", "bedtime", "wake_time", "total_sleep_minutes", "deep_sleep_minutes",
+        "light_sleep_minutes", "rem_sleep_minutes", "awake_minutes", "sleep_efficiency",
+        "sleep_quality_score", "source", "created_at",
+    ),
+    "activity_workouts": (
+        "id", "user_id", "date", "workout_name", "workout_type", "source", "duration_minutes",
+        "calories_burned", "distance_miles", "avg_heart_rate", "max_heart_rate", "intensity", "created_at",
+    ),
+    "body_composition": (
+        "id", "user_id", "date_hour", "source", "weight", "body_fat_percentage", "muscle_mass_percentage",
+        "water_percentage", "bmr", "measurement_method", "created_at",
+    ),
+    "nutrition_macros": (
+        "id", "user_id", "datetime", "food_name", "calories", "protein", "carbs", "fat", "is_saved",
+        "created_at",
+    ),
+    "consumption_logs": (
+        "id", "user_id", "logged_at", "food_id", "servings", "serving_unit", "calories_total",
+        "protein_total", "carbs_total", "fat_total", "is_saved", "created_at",
+    ),
+    "conversations": ("id", "title", "user_id", "created_at", "status"),
+    "chat_messages": ("id", "conversation_id", "role", "content", "user_id", "created_at"),
+}
+
+FOOD_COLUMNS = (
+    "id", "name", "brand", "calories", "protein", "carbs", "fat", "serving_unit", "serving_size", "created_at",
+)
+
+# (high-level type, resource type) used for RIDs, matching what the services generate
+RID_TYPES = {
+    "auth_users": ("auth", "user"),
+    "activity_steps": ("metric", "activity_steps"),
+    "activity_miles": ("metric", "activity_miles"),
+    "body_heartrate": ("metric", "body_heartrate"),
+    "calories_active": ("metric", "active_calories"),
+    "calories_baseline": ("metric", "calories_baseline"),
+    "sleep_daily": ("metric", "sleep_daily"),
+    "activity_workouts": ("metric", "activity_workouts"),
+    "body_composition": ("metric", "body_composition"),
+    "nutrition_macros": ("nutrition", "macros"),
+    "consumption_logs": ("nutrition", "consumption_log"),
+    "foods": ("nutrition", "food"),
+    "conversations": ("chat", "conversation"),
+    "chat_messages": ("chat", "message"),
+}
+
+_RID_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+NULL = "\\N"
+
+WEARABLES = ["APPLE_WATCH", "FITBIT", "GARMIN", "SAMSUNG"]
+# Only values present in the datasource enum created by the migrations
+SLEEP_SOURCES = ["APPLE_WATCH", "FITBIT", "GARMIN"]
+TIMEZONES = ["America/Los_Angeles", "America/New_York", "America/Chicago", "Europe/London", "Europe/Berlin"]
+
+FOODS = [
+    # name, calories, protein, carbs, fat (per serving)
+    ("Chicken breast", 165, 31, 0, 3.6), ("Brown rice", 216, 5, 45, 1.8), ("Greek yogurt", 100, 17, 6, 0.7),
+    ("Oatmeal", 150, 5, 27, 2.5), ("Banana", 105, 1.3, 27, 0.4), ("Apple", 95, 0.5, 25, 0.3),
+    ("Salmon fillet", 280, 39, 0, 13), ("Egg", 78, 6, 0.6, 5), ("Avocado toast", 260, 6, 28, 15),
+    ("Peanut butter", 190, 8, 7, 16), ("Almonds", 164, 6, 6, 14), ("Protein shake", 160, 30, 5, 2.5),
+    ("Turkey sandwich", 350, 24, 38, 10), ("Beef burrito", 520, 26, 58, 20), ("Spinach salad", 120, 4, 8, 8),
+    ("Sweet potato", 112, 2, 26, 0.1), ("Whole wheat pasta", 350, 14, 70, 2.5), ("Cottage cheese", 110, 13, 5, 4.5),
+    ("Tuna salad", 380, 28, 8, 26), ("Pizza slice", 285, 12, 36, 10), ("Granola bar", 190, 4, 29, 7),
+]
+BRANDS = [None, "Generic", "FarmFresh", "GoodFoods", "Trader's", "Nature's Best"]
+
+CHAT_TURNS = [
+    ("How many steps should I aim for today?",
+     "Based on your recent average, aim for about 8,000 steps today. A short walk after lunch helps."),
+    ("Can you suggest a high protein breakfast?",
+     "Try Greek yogurt with berries and granola, or two eggs with whole grain toast."),
+    ("I slept badly last night, any tips?",
+     "Keep a consistent bedtime, avoid screens for an hour before bed and keep the room cool."),
+    ("Is my resting heart rate normal?",
+     "Your resting heart rate is within the normal adult range of 60 to 100 bpm."),
+    ("What should I eat after a workout?",
+     "Combine protein and carbohydrates within two hours, for example chicken with rice."),
+]
+
+
+def rid(rng: random.Random, table: str) -> str:
+    """Deterministic RID in the generate_rid format, drawn from the user's stream."""
+    high_level_type, resource_type = RID_TYPES[table]
+    value = rng.getrandbits(62)
+    chars = []
+    for _ in range(12):
+        value, index = divmod(value, 36)
+        chars.append(_RID_ALPHABET[index])
+    return f"{high_level_type}..{resource_type}.{''.join(chars)}"
+
+
+def _text(value: str) -> str:
+    """Escape a string for COPY text format."""
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _stamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d %H:%M:%S+00")
+
+
+@dataclass
+class Traits:
+    """Per-user habits every generated value is derived from."""
+
+    wake_hour: float
+    sleep_minutes: float
+    daily_steps: float
+    resting_hr: int
+    max_hr: int
+    hrv: float
+    weight_kg: float
+    body_fat: float
+    bmr: float
+    workouts_per_week: float
+    wearable: str
+    sleep_source: str
+    hourly_weights: List[float]
+
+
+def make_traits(rng: random.Random, age: int, sex: str) -> Traits:
+    wake_hour = rng.uniform(5.5, 9.0)
+    weight = rng.gauss(84 if sex == "masc" else 68, 12)
+    bmr = 10 * weight + 625 - 5 * age + (5 if sex == "masc" else -161)
+    # Circadian step curve: nothing asleep, peaks at the commute, lunch and early evening
+    weights = []
+    for hour in range(24):
+        awake = (hour - wake_hour) % 24
+        if awake >= 16.5:
+            weights.append(0.0)
+            continue
+        weight_h = 0.3 + math.exp(-((awake - 1.5) ** 2) / 2)
+        weight_h += 0.7 * math.exp(-((hour - 12.5) ** 2) / 1.5) + 0.9 * math.exp(-((hour - 17.5) ** 2) / 3)
+        weights.append(weight_h)
+    total = sum(weights)
+    return Traits(
+        wake_hour=wake_hour,
+        sleep_minutes=rng.gauss(440, 30),
+        daily_steps=rng.lognormvariate(math.log(7000), 0.45),
+        resting_hr=int(rng.gauss(62, 7)),
+        max_hr=220 - age,
+        hrv=rng.gauss(50, 15),
+        weight_kg=weight,
+        body_fat=rng.gauss(24 if sex == "masc" else 31, 5),
+        bmr=bmr,
+        workouts_per_week=rng.choice([0, 1, 2, 3, 3, 4, 5]),
+        wearable=rng.choice(WEARABLES),
+        sleep_source=rng.choice(SLEEP_SOURCES),
+        hourly_weights=[w / total for w in weights],
+    )
+
+
+class CopyBuffers:
+    """One COPY text buffer per table, with row counts."""
+
+    def __init__(self):
+        self.buffers = {table: io.StringIO() for table in TABLES}
+        self.counts: Counter = Counter()
+
+    def add(self, table: str, line: str) -> None:
+        self.buffers[table].write(line)
+        self.counts[table] += 1
+
+
+def generate_user(
+    index: int, user_key: int, seed: int, start: date, days: int, prefix: str, password_hash: str,
+    food_ids: List[str], out: CopyBuffers,
+) -> None:
+    """Write one user's account, profile and full history into out."""
+    rng = random.Random(f"{seed}:user:{index}")
+    user_id = rid(rng, "auth_users")
+    sex = rng.choice(["masc", "fem", "fem", "masc", "other"])
+    age = rng.randint(18, 75)
+    traits = make_traits(rng, age, sex)
+    joined = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+    birth_date = date(start.year - age, rng.randint(1, 12), rng.randint(1, 28))
+
+    out.add("auth_users", f"{user_id}\t{user_key}\t{prefix}-{index}@example.com\t{password_hash}\t"
+                          f"Synthetic User {index}\tt\tf\t0\t{_stamp(joined)}\n")
+    out.add("user_profiles", f"{user_id}\t{rng.gauss(67, 4):.2f}\t{birth_date.isoformat()}\t{sex}\t"
+                             f"{rng.choice(TIMEZONES)}\tmoderate\n")
+
+    wearable = traits.wearable
+    weight = traits.weight_kg
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        midnight = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+        day_prefix = day.isoformat()
+        weekend = day.weekday() >= 5
+        day_steps = traits.daily_steps * rng.lognormvariate(0, 0.35) * (0.85 if weekend else 1.0)
+
+        workout_hour = None
+        if rng.random() < traits.workouts_per_week / 7:
+            workout_hour = rng.choice([6, 7, 12, 17, 18, 19])
+            duration = rng.choice([30, 45, 45, 60, 75])
+            workout_calories = duration * rng.uniform(6, 11)
+            workout_type = rng.choice(["cardio", "cardio", "strength", "flexibility"])
+            avg_hr = int(traits.resting_hr + (traits.max_hr - traits.resting_hr) * rng.uniform(0.5, 0.75))
+            out.add("activity_workouts", (
+                f"{rid(rng, 'activity_workouts')}\t{user_id}\t{day_prefix} {workout_hour:02d}:00:00+00\t"
+                f"{rng.choice(['Run', 'Ride', 'Strength', 'Yoga', 'Swim'])}\t{workout_type}\t{wearable}\t"
+                f"{duration}\t{workout_calories:.1f}\t"
+                f"{(duration / 10 if workout_type == 'cardio' else 0):.2f}\t{avg_hr}\t"
+                f"{min(avg_hr + rng.randint(10, 30), traits.max_hr)}\t"
+                f"{rng.choice(['low', 'moderate', 'high'])}\t{day_prefix} {workout_hour:02d}:59:00+00\n"
+            ))
+
+        hourly_bmr = traits.bmr / 24
+        for hour in range(24):
+            stamp = f"{day_prefix} {hour:02d}:00:00+00"
+            created = f"{day_prefix} {hour:02d}:59:00+00"
+            steps = int(day_steps * traits.hourly_weights[hour] * rng.uniform(0.6, 1.4))
+            activity = min(steps / 1500, 1.5)
+            active_calories = steps * 0.04
+            if hour == workout_hour:
+                steps += int(duration * 100) if workout_type == "cardio" else 0
+                activity = 2.0
+                active_calories += workout_calories
+            asleep = traits.hourly_weights[hour] == 0
+            avg = traits.resting_hr + (traits.max_hr - traits.resting_hr) * 0.22 * activity
+            avg += rng.gauss(0, 2) - (4 if asleep else 0)
+
+            out.add("activity_steps", f"{rid(rng, 'activity_steps')}\t{user_key}\t{stamp}\t{steps}\t{wearable}\t{created}\n")
+            out.add("activity_miles", (
+                f"{rid(rng, 'activity_miles')}\t{user_key}\t{stamp}\t{steps / 2100:.3f}\twalking\t{wearable}\t{created}\n"
+            ))
+            out.add("body_heartrate", (
+                f"{rid(rng, 'body_heartrate')}\t{user_key}\t{stamp}\t{int(avg)}\t{int(avg - rng.uniform(3, 10))}\t"
+                f"{avg:.1f}\t{int(avg + rng.uniform(5, 12) + 20 * activity)}\t{traits.resting_hr}\t"
+                f"{max(rng.gauss(traits.hrv, 8), 5):.1f}\t{wearable}\t{created}\n"
+            ))
+            out.add("calories_active", (
+                f"{rid(rng, 'calories_active')}\t{user_key}\t{stamp}\t{active_calories:.1f}\t{wearable}\t{created}\n"
+            ))
+            out.add("calories_baseline", (
+                f"{rid(rng, 'calories_baseline')}\t{user_key}\t{stamp}\t{hourly_bmr * rng.uniform(0.97, 1.03):.1f}\t"
+                f"{traits.bmr:.0f}\t{wearable}\t{created}\n"
+            ))
+
+        # The night that ended this morning
+        wake = midnight + timedelta(hours=traits.wake_hour + rng.gauss(0, 0.4) + (0.75 if weekend else 0))
+        total = max(int(rng.gauss(traits.sleep_minutes, 35)), 180)
+        awake_minutes = rng.randint(5, 45)
+        bedtime = wake - timedelta(minutes=total + awake_minutes)
+        deep, rem = int(total * rng.uniform(0.13, 0.23)), int(total * rng.uniform(0.18, 0.25))
+        out.add("sleep_daily", (
+            f"{rid(rng, 'sleep_daily')}\t{user_id}\t{_stamp(midnight)}\t{_stamp(bedtime)}\t{_stamp(wake)}\t"
+            f"{total}\t{deep}\t{total - deep - rem}\t{rem}\t{awake_minutes}\t"
+            f"{min(100 * total / (total + awake_minutes), 100):.1f}\t{min(max(int(total / 50), 1), 10)}\t"
+            f"{traits.sleep_source}\t{_stamp(wake + timedelta(minutes=5))}\n"
+        ))
+
+        weight += rng.gauss(0, 0.08)
+        if rng.random() < 3 / 7:
+            measured = wake + timedelta(minutes=rng.randint(5, 40))
+            out.add("body_composition", (
+                f"{rid(rng, 'body_composition')}\t{user_id}\t{_stamp(measured)}\tMANUAL\t{weight:.2f}\t"
+                f"{traits.body_fat + rng.gauss(0, 0.6):.1f}\t{rng.gauss(40, 2):.1f}\t{rng.gauss(55, 1.5):.1f}\t"
+                f"{traits.bmr:.0f}\tbioimpedance\t{_stamp(measured)}\n"
+            ))
+
+        # Meals at habitual times; about half are also logged against the food catalogue
+        meal_times = []
+        if rng.random() < 0.85:
+            meal_times.append(traits.wake_hour + 0.75)
+        meal_times.append(12.5 + rng.gauss(0, 0.5))
+        if rng.random() < 0.5:
+            meal_times.append(15.5 + rng.gauss(0, 0.5))
+        meal_times.append(19 + rng.gauss(0, 0.75))
+        for meal_hour in meal_times:
+            eaten = midnight + timedelta(hours=min(max(meal_hour, 0), 23.9))
+            name, calories, protein, carbs, fat = rng.choice(FOODS)
+            servings = rng.choice([1, 1, 1, 1.5, 2])
+            out.add("nutrition_macros", (
+                f"{rid(rng, 'nutrition_macros')}\t{user_id}\t{_stamp(eaten)}\t{name}\t{calories * servings:.1f}\t"
+                f"{protein * servings:.1f}\t{carbs * servings:.1f}\t{fat * servings:.1f}\t"
+                f"{'t' if rng.random() < 0.1 else 'f'}\t{_stamp(eaten)}\n"
+            ))
+            if food_ids and rng.random() < 0.5:
+                out.add("consumption_logs", (
+                    f"{rid(rng, 'consumption_logs')}\t{user_id}\t{_stamp(eaten)}\t{rng.choice(food_ids)}\t"
+                    f"{servings}\tserving\t{calories * servings:.2f}\t{protein * servings:.2f}\t"
+                    f"{carbs * servings:.2f}\t{fat * servings:.2f}\tf\t{_stamp(eaten)}\n"
+                ))
+
+        if rng.random() < 10 / 365:
+            conversation_id = rid(rng, "conversations")
+            started = midnight + timedelta(hours=rng.uniform(traits.wake_hour, 22))
+            question, _ = rng.choice(CHAT_TURNS)
+            out.add("conversations", f"{conversation_id}\t{_text(question[:60])}\t{user_id}\t{_stamp(started)}\tactive\n")
+            for turn in range(rng.randint(1, 5)):
+                question, answer = rng.choice(CHAT_TURNS)
+                for role, content in (("user", question), ("assistant", answer)):
+                    started += timedelta(seconds=rng.randint(5, 90))
+                    out.add("chat_messages", (
+                        f"{rid(rng, 'chat_messages')}\t{conversation_id}\t{role}\t{_text(content)}\t"
+                        f"{user_id}\t{_stamp(started)}\n"
+                    ))
+
+
+def food_catalogue(seed: int, count: int, created: datetime) -> Tuple[List[str], str]:
+    """Food ids and their COPY rows for a shared catalogue of `count` foods."""
+    rng = random.Random(f"{seed}:foods")
+    ids, lines = [], []
+    for index in range(count):
+        food_id = rid(rng, "foods")
+        name, calories, protein, carbs, fat = FOODS[index % len(FOODS)]
+        brand = rng.choice(BRANDS)
+        scale = rng.uniform(0.8, 1.2)
+        ids.append(food_id)
+        lines.append(
+            f"{food_id}\t{_text(name)} #{index}\t{_text(brand) if brand else NULL}\t{calories * scale:.2f}\t"
+            f"{protein * scale:.2f}\t{carbs * scale:.2f}\t{fat * scale:.2f}\tserving\t1\t{_stamp(created)}\n"
+        )
+    return ids, "".join(lines)
+
+
+# Worker processes
+
+_worker: dict = {}
+
+
+def _init_worker(options: dict) -> None:
+    _worker.update(options)
+    if not options["dry_run"]:
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import NullPool
+
+        from app.core.config import settings
+
+        _worker["engine"] = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+
+def copy_into(cursor, table: str, columns: Tuple[str, ...], buffer: io.StringIO) -> None:
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def load_batch(batch: Tuple[int, int]) -> Counter:
+    """Generate users [first, first + count) and load them in one transaction."""
+    first, count = batch
+    connection = None if _worker["dry_run"] else _worker["engine"].raw_connection()
+    if connection is None:
+        user_keys = [index + 1 for index in range(first, first + count)]
+    else:
+        # Internal user keys are drawn from the identity sequence so later signups never collide
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence('auth_users', 'user_key')) FROM generate_series(1, %s)",
+            (count,),
+        )
+        user_keys = [row[0] for row in cursor.fetchall()]
+
+    out = CopyBuffers()
+    for index, user_key in zip(range(first, first + count), user_keys):
+        generate_user(
+            index, user_key, _worker["seed"], _worker["start"], _worker["days"], _worker["prefix"],
+            _worker["password_hash"], _worker["food_ids"], out,
+        )
+    if connection is None:
+        return out.counts
+
+    try:
+        # Durability of a bulk load is not worth a WAL flush per batch
+        cursor.execute("SET synchronous_commit = off")
+        for table, columns in TABLES.items():
+            if out.counts[table]:
+                copy_into(cursor, table, columns, out.buffers[table])
+        connection.commit()
+    finally:
+        connection.close()
+    return out.counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load a synthetic dataset with COPY")
+    parser.add_argument("--users", type=int, default=1000, help="Users to generate")
+    parser.add_argument("--first-user", type=int, default=0, help="Index of the first user (to extend a dataset)")
+    parser.add_argument("--years", type=float, default=2.0, help="Years of history per user")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(), help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--batch-users", type=int, default=10, help="Users per COPY transaction")
+    parser.add_argument("--foods", type=int, default=5000, help="Size of the shared food catalogue")
+    parser.add_argument("--prefix", default="synthetic", help="Emails are <prefix>-<n>@example.com")
+    parser.add_argument("--password", default="synthetic-password", help="Password of every synthetic user")
+    parser.add_argument("--dry-run", action="store_true", help="Generate rows without loading them")
+    args = parser.parse_args()
+
+    days = int(args.years * 365)
+    start = args.end_date - timedelta(days=days - 1)
+    created = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+
+    if args.dry_run:
+        password_hash = "dry-run"
+    else:
+        from app.services.auth_service import get_password_hash
+
+        password_hash = get_password_hash(args.password)
+
+    food_ids, food_rows = food_catalogue(args.seed, args.foods, created)
+    if not args.dry_run:
+        from app.core.config import settings
+        from app.db.partitions import ensure_partitions
+
+        _init_worker({"dry_run": False})
+        # Monthly partitions back to the first generated day, so no rows land in the default partition
+        with _worker["engine"].begin() as connection:
+            created_partitions = ensure_partitions(connection, settings.PARTITION_MONTHS_AHEAD, since=start)
+        if created_partitions:
+            print(f"✅ Created {len(created_partitions)} partitions")
+    if not args.dry_run and args.first_user == 0 and args.foods:
+        connection = _worker["engine"].raw_connection()
+        try:
+            copy_into(connection.cursor(), "foods", FOOD_COLUMNS, io.StringIO(food_rows))
+            connection.commit()
+        finally:
+            connection.close()
+        print(f"✅ Loaded {args.foods} foods")
+
+    options = {
+        "seed": args.seed,
+        "start": start,
+        "days": days,
+        "prefix": args.prefix,
+        "password_hash": password_hash,
+        "food_ids": food_ids,
+        "dry_run": args.dry_run,
+    }
+    batches = [
+        (first, min(args.batch_users, args.first_user + args.users - first))
+        for first in range(args.first_user, args.first_user + args.users, args.batch_users)
+    ]
+
+    print(
+        f"🔄 {'Generating' if args.dry_run else 'Loading'} {args.users} users x {days} days "
+        f"({start} to {args.end_date}) with {args.workers} workers..."
+    )
+    totals: Counter = Counter()
+    users_done = 0
+    started = time.perf_counter()
+    with Pool(args.workers, initializer=_init_worker, initargs=(options,)) as pool:
+        for batch, counts in zip(batches, pool.imap(load_batch, batches)):
+            totals.update(counts)
+            users_done += batch[1]
+            elapsed = time.perf_counter() - started
+            rows = sum(totals.values())
+            print(f"  {users_done}/{args.users} users, {rows:,} rows, {rows / elapsed:,.0f} rows/s", flush=True)
+    elapsed = time.perf_counter() - started
+
+    if not args.dry_run:
+        # VACUUM also sets the visibility map, which index-only scans depend on
+        print("🔄 Vacuuming and analyzing tables...")
+        connection = _worker["engine"].raw_connection()
+        try:
+            connection.autocommit = True
+            cursor = connection.cursor()
+            for table in ["foods", *TABLES]:
+                cursor.execute(f"VACUUM (ANALYZE) {table}")
+        finally:
+            connection.close()
+
+    rows = sum(totals.values())
+    print("=" * 50)
+    for table in TABLES:
+        print(f"{table:<20} {totals[table]:>14,}")
+    print(f"{'total':<20} {rows:>14,}")
+    print(f"Elapsed: {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
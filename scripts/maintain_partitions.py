@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Create and retire monthly partitions of the hourly metric tables.
+
+    uv run python scripts/maintain_partitions.py
+    uv run python scripts/maintain_partitions.py --months-ahead 6
+    uv run python scripts/maintain_partitions.py --retain-months 24 --drop
+    uv run python scripts/maintain_partitions.py --archive
+
+Does one run of what the app's partition maintainer does periodically (see
+app/db/partitions.py), for deployments that prefer cron or have the in-app
+maintainer disabled: create missing partitions up to --months-ahead months
+past the current one and, with --retain-months, detach partitions that ended
+before the retention window. Detached partitions are kept as standalone tables
+unless --drop is given. With --archive it then compacts months older than
+METRIC_ARCHIVE_AFTER_MONTHS into the archive tables (see app/db/archive.py),
+as the in-app archiver does when METRIC_ARCHIVE_ENABLED is set. Finishes with
+the partitions of every table and their estimated rows; a non-empty default
+partition means rows arrived for a month that had no partition and should be
+moved out before that month is created.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings  # noqa: E402
+from app.db.archive import MetricArchiver  # noqa: E402
+from app.db.partitions import HOURLY_PARTITIONED_TABLES, PartitionMaintainer  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+
+def print_partitions() -> None:
+    with engine.connect() as connection:
+        for table in HOURLY_PARTITIONED_TABLES:
+            rows = connection.execute(
+                text(
+                    "SELECT c.relname, greatest(c.reltuples, 0)::bigint, pg_total_relation_size(c.oid) "
+                    "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+                ),
+                {"table": table},
+            ).all()
+            print(f"{table} ({len(rows)} partitions)")
+            for name, estimate, size in rows:
+                print(f"  {name:<32} ~{estimate:>12,} rows  {size / 2**20:>10,.1f} MiB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Maintain monthly partitions of the hourly metric tables")
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD, help="Months to create past this one"
+    )
+    parser.add_argument(
+        "--retain-months",
+        type=int,
+        default=settings.METRIC_RETENTION_MONTHS,
+        help="Whole months kept before this one (0 keeps everything)",
+    )
+    parser.add_argument("--drop", action="store_true", help="Drop partitions after detaching them")
+    parser.add_argument("--archive", action="store_true", help="Archive months past the archive horizon")
+    args = parser.parse_args()
+
+    maintainer = PartitionMaintainer(interval=0, months_ahead=args.months_ahead, retain_months=args.retain_months)
+    created, detached = maintainer.run_once()
+    print(f"✅ Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}")
+    if args.retain_months > 0:
+        print(f"✅ Detached {len(detached)} partitions{': ' + ', '.join(detached) if detached else ''}")
+    if args.drop and detached:
+        with engine.begin() as connection:
+            for name in detached:
+                connection.execute(text(f"DROP TABLE {name}"))
+        print(f"🗑️  Dropped {len(detached)} detached partitions")
+    if args.archive:
+        archived = MetricArchiver(interval=0, retain_months=args.retain_months).run_once()
+        for table, days in archived.items():
+            print(f"📦 Archived {days:,} user-days of {table}")
+        if not archived:
+            print("📦 Nothing to archive")
+
+    print("=" * 50)
+    print_partitions()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
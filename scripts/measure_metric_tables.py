@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Measure the hourly metric tables: size on disk and range-scan speed.
+
+Run it before and after a schema change and compare:
+
+    uv run python scripts/measure_metric_tables.py --output before.json
+    uv run alembic upgrade head
+    uv run python scripts/measure_metric_tables.py --compare before.json
+
+For each table it reports rows, heap size, the size of every index and the
+average row width, then times the dashboard/export query (one user's last
+--days days, newest first) for --samples users picked with a fixed seed. Each
+scan is timed client side including the fetch, and once more with EXPLAIN
+(ANALYZE, BUFFERS) for server execution time and pages touched. It works with
+either key layout (user_id RIDs or bigint user_key), and sizes of partitioned
+tables are summed over their partitions. Days compacted into <table>_archive
+are reported separately.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.bench_chat import percentile  # noqa: E402
+
+HOURLY_TABLES = ["activity_steps", "activity_miles", "body_heartrate", "calories_active", "calories_baseline"]
+
+
+def owner_column(cursor, table: str) -> str:
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name = %s AND column_name IN ('user_id', 'user_key')",
+        (table,),
+    )
+    return cursor.fetchone()[0]
+
+
+def sample_owners(cursor, column: str, samples: int, seed: float) -> List:
+    """Owners to scan for, the same users on every run with the same seed."""
+    cursor.execute("SELECT setseed(%s)", (seed,))
+    cursor.execute("SELECT id FROM auth_users ORDER BY random() LIMIT %s", (samples,))
+    user_ids = [row[0] for row in cursor.fetchall()]
+    if column == "user_id":
+        return user_ids
+    # The application resolves and caches the key once, so scans use it directly
+    cursor.execute("SELECT user_key FROM auth_users WHERE id = ANY(%s)", (user_ids,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def table_sizes(cursor, table: str) -> dict:
+    # pg_partition_tree also returns a plain table on its own, so this covers both layouts
+    cursor.execute(
+        "SELECT sum(c.reltuples)::bigint, sum(pg_table_size(t.relid))::bigint, "
+        "sum(pg_indexes_size(t.relid))::bigint FROM pg_partition_tree(%s) t JOIN pg_class c ON c.oid = t.relid WHERE t.isleaf",
+        (table,),
+    )
+    rows, heap, indexes = cursor.fetchone()
+    cursor.execute(
+        "SELECT c.relname, "
+        "(SELECT sum(pg_relation_size(t.relid))::bigint FROM pg_partition_tree(i.indexrelid) t) "
+        "FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = %s::regclass ORDER BY c.relname",
+        (table,),
+    )
+    index_sizes = {name: size for name, size in cursor.fetchall()}
+    cursor.execute(f"SELECT avg(pg_column_size(t.*)) FROM {table} t TABLESAMPLE SYSTEM (1)")
+    width = cursor.fetchone()[0]
+    # Days compacted by app/db/archive.py, if the archive exists yet
+    cursor.execute(
+        "SELECT greatest(c.reltuples, 0)::bigint, pg_total_relation_size(c.oid) FROM pg_class c "
+        "WHERE c.oid = to_regclass(%s)",
+        (f"{table}_archive",),
+    )
+    archive = cursor.fetchone()
+    return {
+        "rows": rows,
+        "heap_bytes": heap,
+        "index_bytes": indexes,
+        "indexes": index_sizes,
+        "avg_row_bytes": round(float(width), 1) if width is not None else None,
+        "archive_days": archive[0] if archive else 0,
+        "archive_bytes": archive[1] if archive else 0,
+    }
+
+
+def scan(cursor, table: str, column: str, owners: List, since: datetime, repeat: int) -> dict:
+    query = f"SELECT * FROM {table} WHERE {column} = %s AND date_hour >= %s ORDER BY date_hour DESC"
+    latencies: List[float] = []
+    execution_ms: List[float] = []
+    pages: List[int] = []
+    rows: List[int] = []
+    for owner in owners:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            cursor.execute(query, (owner, since))
+            fetched = cursor.fetchall()
+            latencies.append(time.perf_counter() - started)
+        rows.append(len(fetched))
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", (owner, since))
+        plan = cursor.fetchone()[0][0]
+        execution_ms.append(plan["Execution Time"])
+        pages.append(plan["Plan"].get("Shared Hit Blocks", 0) + plan["Plan"].get("Shared Read Blocks", 0))
+    return {
+        "rows_per_scan": round(statistics.mean(rows), 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "execution_ms": round(statistics.mean(execution_ms), 3),
+        "pages_per_scan": round(statistics.mean(pages), 1),
+    }
+
+
+def _mib(value: int) -> str:
+    return f"{value / 2**20:,.1f} MiB"
+
+
+def print_table(table: str, result: dict) -> None:
+    sizes, scans = result["sizes"], result["scan"]
+    print(f"{table} ({result['owner_column']})")
+    print(
+        f"  rows {sizes['rows']:,}  heap {_mib(sizes['heap_bytes'])}  indexes {_mib(sizes['index_bytes'])}  "
+        f"avg row {sizes['avg_row_bytes']} B"
+    )
+    for name, size in sizes["indexes"].items():
+        print(f"    {name:<48} {_mib(size)}")
+    if sizes.get("archive_bytes"):
+        print(f"  archive: {sizes['archive_days']:,} user-days, {_mib(sizes['archive_bytes'])}")
+    print(
+        f"  scan: {scans['rows_per_scan']:g} rows, p50 {scans['p50_ms']:.2f} ms, p95 {scans['p95_ms']:.2f} ms, "
+        f"server {scans['execution_ms']:.2f} ms, {scans['pages_per_scan']:g} pages"
+    )
+
+
+def _change(new: float, old: float) -> str:
+    return f"{old:,.2f} -> {new:,.2f} ({(new - old) / old * 100:+.1f}%)" if old else f"{old} -> {new}"
+
+
+def print_comparison(current: dict, baseline: dict) -> None:
+    print("=" * 50)
+    print(f"Compared with {baseline['measured_at']}")
+    for table, result in current["tables"].items():
+        previous: Optional[dict] = baseline["tables"].get(table)
+        if not previous:
+            continue
+        print(f"{table}")
+        print(f"  heap MiB     {_change(result['sizes']['heap_bytes'] / 2**20, previous['sizes']['heap_bytes'] / 2**20)}")
+        print(f"  indexes MiB  {_change(result['sizes']['index_bytes'] / 2**20, previous['sizes']['index_bytes'] / 2**20)}")
+        print(
+            f"  archive MiB  "
+            f"{_change(result['sizes'].get('archive_bytes', 0) / 2**20, previous['sizes'].get('archive_bytes', 0) / 2**20)}"
+        )
+        print(f"  scan p50 ms  {_change(result['scan']['p50_ms'], previous['scan']['p50_ms'])}")
+        print(f"  pages/scan   {_change(result['scan']['pages_per_scan'], previous['scan']['pages_per_scan'])}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Size and range-scan measurements for the hourly metric tables")
+    parser.add_argument("--table", action="append", choices=HOURLY_TABLES, help="Table to measure (repeatable)")
+    parser.add_argument("--days", type=int, default=30, help="Days of history each scan reads")
+    parser.add_argument("--samples", type=int, default=50, help="Users scanned per table")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed scans per user")
+    parser.add_argument("--seed", type=float, default=0.42, help="Seed for picking users (-1 to 1)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    from app.db.session import engine
+
+    since = datetime.now(timezone.utc) - timedelta(days=args.days)
+    results = {"measured_at": datetime.now(timezone.utc).isoformat(), "days": args.days, "tables": {}}
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for table in args.table or HOURLY_TABLES:
+            print(f"🔄 Measuring {table}...")
+            column = owner_column(cursor, table)
+            owners = sample_owners(cursor, column, args.samples, args.seed)
+            results["tables"][table] = {
+                "owner_column": column,
+                "sizes": table_sizes(cursor, table),
+                "scan": scan(cursor, table, column, owners, since, args.repeat),
+            }
+        connection.rollback()
+    finally:
+        connection.close()
+
+    print("=" * 50)
+    for table, result in results["tables"].items():
+        print_table(table, result)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"📄 Results written to {args.output}")
+    if args.compare:
+        print_comparison(results, json.loads(args.compare.read_text()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,7 @@ sys.path.append("/app")
 
 from app.db.session import SessionLocal
 from app.models.goal.templates import GoalTemplate
+from app.services.goal_template_service import GoalTemplateService
 
 
 def parse_args():
@@ -57,6 +58,8 @@ def clone_template(db: Session, slug: str, workout_delta: float, name: str | Non
     )
     db.add(new_template)
     db.commit()
+    # Workers on this host share the template cache, so they pick up the new version now
+    GoalTemplateService.invalidate_latest(slug)
     print(f"Created template {slug} v{new_version} with workout_delta_kcal={workout_delta}")
 
 
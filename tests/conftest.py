@@ -0,0 +1,54 @@
+"""
+Shared fixtures.
+
+Tests that need PostgreSQL run against DATABASE_URL, migrated to head
+(`alembic upgrade head`), and are skipped when it cannot be reached. They
+create their own users and leave their rows behind, so point DATABASE_URL at
+a disposable database.
+"""
+
+import os
+import uuid
+
+import pytest
+
+# The mock backend keeps tests off the OpenAI API; set before the app reads its settings
+os.environ.setdefault("LLM_BACKEND", "mock")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+pytest_plugins = ["app.db.pytest_query_budget"]
+
+TEST_PASSWORD = "test-password-123"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The primary engine, or a skip when no database is reachable."""
+    try:
+        with engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+    except OperationalError:
+        pytest.skip("No database reachable at DATABASE_URL")
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    # No context manager: the background jobs started on startup are not needed
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Authorization header of a freshly signed-up user."""
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"email": f"test-{uuid.uuid4().hex}@example.com", "password": TEST_PASSWORD},
+    )
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
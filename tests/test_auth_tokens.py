@@ -0,0 +1,64 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services.token_service import TokenRevocationList
+
+USER_PATH = "/api/v1/auth/user/"
+
+
+@pytest.fixture
+def stateless_tokens(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS_TOKENS", True)
+
+
+def test_email_change_revokes_issued_tokens(client, auth_headers, stateless_tokens):
+    assert client.get(USER_PATH, headers=auth_headers).status_code == 200
+
+    new_email = f"test-{uuid.uuid4().hex}@example.com"
+    response = client.put(USER_PATH, json={"email": new_email}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    # The old token still claims the previous email
+    assert client.get(USER_PATH, headers=auth_headers).status_code == 401
+
+
+def test_name_change_keeps_issued_tokens(client, auth_headers, stateless_tokens):
+    email = client.get(USER_PATH, headers=auth_headers).json()["email"]
+    response = client.put(USER_PATH, json={"email": email, "full_name": "Test User"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    assert client.get(USER_PATH, headers=auth_headers).status_code == 200
+
+
+def test_revocations_leave_memory_once_expired_from_the_table(monkeypatch):
+    revocations = TokenRevocationList(refresh_interval=60)
+    table = {"user-1": 3}
+    monkeypatch.setattr(revocations, "_load", lambda: dict(table))
+
+    revocations.add("user-1", 3)
+    asyncio.run(revocations.refresh())
+    assert revocations.is_revoked("user-1", 3)
+
+    table.clear()
+    asyncio.run(revocations.refresh())
+    assert not revocations.is_revoked("user-1", 3)
+
+
+def test_revocations_made_during_a_load_survive_the_swap(monkeypatch):
+    revocations = TokenRevocationList(refresh_interval=60)
+
+    def load():
+        # Committed after the snapshot was read
+        revocations.add("user-1", 5)
+        return {}
+
+    monkeypatch.setattr(revocations, "_load", load)
+    asyncio.run(revocations.refresh())
+    assert revocations.is_revoked("user-1", 5)
+
+    monkeypatch.setattr(revocations, "_load", lambda: {"user-1": 5})
+    asyncio.run(revocations.refresh())
+    assert revocations.is_revoked("user-1", 5)
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+from app.db.session import SessionLocal
+from app.services.health_digest_service import HealthDigestService
+
+CHAT_PATH = "/api/v1/chat/assistant/"
+CONVERSATIONS_PATH = "/api/v1/chat/assistant/conversations"
+
+
+def test_chat_requires_authentication(client):
+    assert client.post(CHAT_PATH, json={"message": "Hello"}).status_code in (401, 403)
+
+
+def test_chat_is_stored_in_the_callers_conversation(client, auth_headers):
+    response = client.post(CHAT_PATH, json={"message": "Hello"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    # A fresh user sees exactly this exchange, not one conversation shared by everybody
+    conversations = client.get(CONVERSATIONS_PATH, headers=auth_headers).json()["records"]
+    assert len(conversations) == 1
+    assert conversations[0]["message_count"] == 2
+
+
+def test_search_headlines_escape_message_markup(client, auth_headers):
+    message = "<img src=x onerror=alert(1)> went running \x02 today"
+    assert client.post(CHAT_PATH, json={"message": message}, headers=auth_headers).status_code == 200
+
+    response = client.get(f"{CHAT_PATH}search", params={"q": "running"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    headline = response.json()["records"][0]["headline"]
+    assert "<mark>running</mark>" in headline
+    markup = headline.replace("<mark>", "").replace("</mark>", "")
+    assert "<" not in markup and ">" not in markup
+    assert "&gt;" in markup
+    assert "\x02" not in markup
+
+
+def test_health_digest_is_rebuilt_after_ingest(client, auth_headers):
+    user_id = client.get("/api/v1/auth/user/", headers=auth_headers).json()["id"]
+    db = SessionLocal()
+    try:
+        assert "Steps:" not in HealthDigestService(db).get_digest_text(user_id)
+
+        hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        record = {"date_hour": hour.isoformat(), "steps": 7000, "source": "apple_watch"}
+        response = client.post("/api/v1/metric/steps/bulk", json={"records": [record]}, headers=auth_headers)
+        assert response.status_code == 200, response.text
+
+        assert "Steps: 1,000/day" in HealthDigestService(db).get_digest_text(user_id)
+    finally:
+        db.close()
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+SAMPLES = "/api/v1/metric/heartrate/samples"
+START = datetime(2024, 1, 1, 7, 59, 50, tzinfo=timezone.utc)
+
+
+def upload(client, headers, start, bpm, offsets=None):
+    body = {"source": "apple_watch", "start": start.isoformat(), "bpm": bpm}
+    if offsets is not None:
+        body["offsets"] = offsets
+    response = client.post(SAMPLES, json=body, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def read(client, headers, start=START - timedelta(hours=1), end=START + timedelta(hours=2)):
+    params = {"source": "apple_watch", "start_date": start.isoformat(), "end_date": end.isoformat()}
+    response = client.get(SAMPLES, params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    first = datetime.fromisoformat(body["start"].replace("Z", "+00:00"))
+    return {first + timedelta(seconds=offset): bpm for offset, bpm in zip(body["offsets"], body["bpm"])}
+
+
+def test_samples_round_trip_across_an_hour_boundary(client, auth_headers):
+    bpm = list(range(60, 80))
+    body = upload(client, auth_headers, START, bpm)
+
+    assert body["samples_received"] == 20
+    assert [record["date_hour"] for record in body["records"]] == ["2024-01-01T07:00:00Z", "2024-01-01T08:00:00Z"]
+    assert read(client, auth_headers) == {START + timedelta(seconds=n): value for n, value in enumerate(bpm)}
+
+
+def test_uploads_merge_into_stored_hours_and_the_last_reading_wins(client, auth_headers):
+    upload(client, auth_headers, START, list(range(60, 80)))
+    moment = START + timedelta(seconds=15)
+    # Two readings in one second, a new second in a stored hour and one in a new hour
+    body = upload(client, auth_headers, moment, [100, 110, 120, 130], offsets=[0, 0.5, 10, 3600])
+
+    expected = {START + timedelta(seconds=n): 60 + n for n in range(20)}
+    expected[moment] = 110
+    expected[moment + timedelta(seconds=10)] = 120
+    expected[moment + timedelta(seconds=3600)] = 130
+    assert read(client, auth_headers) == expected
+
+    hours = {record["date_hour"]: record for record in body["records"]}
+    assert set(hours) == {"2024-01-01T08:00:00Z", "2024-01-01T09:00:00Z"}
+    eight = [value for second, value in expected.items() if second.hour == 8]
+    summary = hours["2024-01-01T08:00:00Z"]
+    assert (summary["min_hr"], summary["max_hr"], summary["heart_rate"]) == (min(eight), max(eight), 120)
+
+
+def test_large_gaps_and_drops_survive_the_delta_encoding(client, auth_headers):
+    # First and last second of an hour, and jumps in both directions
+    moment = START.replace(minute=0, second=0)
+    offsets = [0, 3599, 3600, 7199]
+    bpm = [300, 1, 250, 2]
+    upload(client, auth_headers, moment, bpm, offsets=offsets)
+
+    expected = {moment + timedelta(seconds=offset): value for offset, value in zip(offsets, bpm)}
+    assert read(client, auth_headers, moment, moment + timedelta(hours=2)) == expected
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"start_date": "2024-01-01T00:00:00Z", "end_date": "2024-01-09T00:00:00Z"},
+        {"start_date": "2024-01-02T00:00:00Z", "end_date": "2024-01-01T00:00:00Z"},
+    ],
+)
+def test_sample_windows_are_capped(client, auth_headers, params):
+    response = client.get(SAMPLES, params={"source": "apple_watch", **params}, headers=auth_headers)
+
+    assert response.status_code == 422, response.text
+
+
+def test_sample_window_defaults_to_one_day(client, auth_headers):
+    upload(client, auth_headers, START, [70, 71])
+    upload(client, auth_headers, START + timedelta(days=1, seconds=1), [80])
+
+    response = client.get(
+        SAMPLES, params={"source": "apple_watch", "start_date": START.isoformat()}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["bpm"] == [70, 71]
+    assert client.get(SAMPLES, params={"source": "apple_watch"}, headers=auth_headers).json()["bpm"] == []
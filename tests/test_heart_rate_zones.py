@@ -0,0 +1,186 @@
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.shared_cache import MarshalCodec, SharedMemoryCache
+from app.services import heart_rate_zone_service
+from app.services.heart_rate_zone_service import (
+    MAX_RANGE_DAYS,
+    MAX_SAMPLE_SECONDS,
+    HeartRateZoneService,
+    ZoneDay,
+    ZoneWorkout,
+    zone_edges,
+)
+
+DAY = date(2024, 3, 1)
+MIDNIGHT = datetime(2024, 3, 1, tzinfo=timezone.utc)
+# zone_edges(40, 60): max HR 180, zones 1-5 start at 120/132/144/156/168 BPM
+EDGES = (120, 132, 144, 156, 168)
+
+
+def at(hours: float) -> int:
+    return int((MIDNIGHT + timedelta(hours=hours)).timestamp())
+
+
+def workout(workout_id, start_hours, minutes, avg_heart_rate=None):
+    return SimpleNamespace(
+        id=workout_id,
+        workout_name=None,
+        workout_type="running",
+        date=MIDNIGHT + timedelta(hours=start_hours),
+        duration_minutes=minutes,
+        avg_heart_rate=avg_heart_rate,
+    )
+
+
+class _Repository:
+    """The three reads _bin_days makes, served from lists"""
+
+    def __init__(self, samples=(), hours=(), workouts=()):
+        self.samples, self.hours, self.workouts = samples, hours, workouts
+
+    def get_workouts_data(self, user_id, start, end):
+        return list(self.workouts)
+
+    def get_heart_rate_series(self, user_id, start, end):
+        return list(self.hours)
+
+    def get_heart_rate_samples(self, user_id, source, start, end):
+        seconds = np.array([second for second, _ in self.samples], dtype=np.int64)
+        bpm = np.array([value for _, value in self.samples], dtype=np.int64)
+        return [SimpleNamespace(decode=lambda: (seconds, bpm))] if self.samples else []
+
+
+def bin_days(first_day=DAY, last_day=DAY, **data):
+    service = HeartRateZoneService(db=None)
+    service.metrics_repository = _Repository(**data)
+    return service._bin_days("user", EDGES, first_day, last_day)
+
+
+def test_zone_edges_follow_the_heart_rate_reserve():
+    assert zone_edges(40, 60) == (180, EDGES)
+    assert zone_edges(30, 70) == (190, (130, 142, 154, 166, 178))
+
+
+def test_samples_last_until_the_next_one_up_to_a_cap():
+    samples = [(at(8), 100), (at(8) + 10, 125), (at(8) + 20, 170), (at(8) + 1000, 150)]
+
+    seconds_in_zone = bin_days(samples=samples)[DAY].seconds_in_zone
+
+    # The last sample of the range counts for one second
+    assert seconds_in_zone == [10, 10, 0, 1, 0, MAX_SAMPLE_SECONDS]
+
+
+def test_hours_without_samples_fall_back_to_the_hourly_average():
+    hours = [
+        (at(8), 150.0, None),  # Covered by samples, not counted
+        (at(10), 140.0, None),
+        (at(11), None, 160.0),  # No average: the hourly reading is used
+        (at(12), None, None),
+    ]
+
+    seconds_in_zone = bin_days(samples=[(at(8), 100)], hours=hours)[DAY].seconds_in_zone
+
+    assert seconds_in_zone == [1, 0, 3600, 0, 3600, 0]
+
+
+def test_each_day_gets_its_own_totals():
+    hours = [(at(1), 130.0, None), (at(25), 150.0, None)]
+
+    result = bin_days(last_day=DAY + timedelta(days=2), hours=hours)
+
+    assert result[DAY].seconds_in_zone == [0, 3600, 0, 0, 0, 0]
+    assert result[DAY + timedelta(days=1)].seconds_in_zone == [0, 0, 0, 3600, 0, 0]
+    assert result[DAY + timedelta(days=2)].seconds_in_zone == [0] * 6
+
+
+def test_workouts_get_the_samples_inside_them():
+    samples = [(at(8) + second, 125) for second in range(0, 120, 10)] + [(at(9), 100)]
+    workouts = [workout("w1", 8, 1), workout("w2", 18, 30, avg_heart_rate=150)]
+
+    zone_workouts = bin_days(samples=samples, workouts=workouts)[DAY].workouts
+
+    assert [zone_workout.workout_id for zone_workout in zone_workouts] == ["w1", "w2"]
+    assert zone_workouts[0].seconds_in_zone == [0, 60, 0, 0, 0, 0]
+    assert not zone_workouts[0].estimated
+    # No samples: the whole workout goes in the zone of its average
+    assert zone_workouts[1].seconds_in_zone == [0, 0, 0, 1800, 0, 0]
+    assert zone_workouts[1].estimated
+
+
+def test_a_workout_without_samples_or_average_is_not_estimated():
+    zone_workout = bin_days(workouts=[workout("w1", 8, 30)])[DAY].workouts[0]
+
+    assert zone_workout.seconds_in_zone == [0] * 6
+    assert not zone_workout.estimated
+
+
+@pytest.mark.parametrize("second, owner", [(at(8) + 100, 0), (at(8) + 400, 1), (at(8) + 800, 1), (at(8) + 1000, None)])
+def test_overlapping_workouts_give_a_sample_to_the_later_one(second, owner):
+    workouts = [workout("w1", 8, 10), workout("w2", 8 + 5 / 60, 10)]
+    seconds = np.array([second], dtype=np.int64)
+
+    zone_workouts = HeartRateZoneService._bin_workouts(EDGES, workouts, seconds, np.array([2]), np.array([5]))
+
+    totals = [zone_workout.seconds_in_zone[2] for zone_workout in zone_workouts]
+    assert totals == [5 if index == owner else 0 for index in range(2)]
+
+
+def test_a_year_of_busy_days_is_served_from_the_cache(tmp_path, monkeypatch):
+    cache = SharedMemoryCache(
+        "zones",
+        slots=64,
+        slot_size=settings.HEART_RATE_ZONE_CACHE_SLOT_BYTES,
+        codec=MarshalCodec(),
+        directory=str(tmp_path),
+    )
+    monkeypatch.setattr(heart_rate_zone_service, "_zone_cache", cache)
+    profile = SimpleNamespace(birth_date=date(1984, 1, 1))
+    profiles = SimpleNamespace(get=lambda user_id: profile)
+    monkeypatch.setattr(heart_rate_zone_service, "UserProfileRepository", lambda db: profiles)
+    monkeypatch.setattr(HeartRateZoneService, "_resting_hr", lambda self, user_id: 60)
+
+    binned = []
+
+    def busy_days(self, user_id, edges, first_day, last_day):
+        # Two workouts a day
+        binned.append((first_day, last_day))
+        days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+        return {
+            day: ZoneDay(
+                day=day,
+                seconds_in_zone=[3000, 20000, 9000, 4000, 1200, 300],
+                workouts=[
+                    ZoneWorkout(
+                        workout_id=f"metric..workouts.{day:%Y%m%d}{n:016d}",
+                        workout_name="Evening run",
+                        workout_type="running",
+                        start=MIDNIGHT,
+                        duration_minutes=45,
+                        seconds_in_zone=[60, 900, 1200, 400, 100, 20],
+                        estimated=False,
+                    )
+                    for n in range(2)
+                ],
+            )
+            for day in days
+        }
+
+    monkeypatch.setattr(HeartRateZoneService, "_bin_days", busy_days)
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=MAX_RANGE_DAYS - 1)
+
+    first = HeartRateZoneService(db=None).get_time_in_zones("user", start, end)
+    second = HeartRateZoneService(db=None).get_time_in_zones("user", start, end)
+
+    assert second.days == first.days
+    settled = end.date() - timedelta(days=settings.HEART_RATE_ZONE_SYNC_WINDOW_DAYS)
+    assert binned[1][0] == settled
+
+    HeartRateZoneService(db=None).invalidate("user")
+    HeartRateZoneService(db=None).get_time_in_zones("user", start, end)
+    assert binned[2][0] == start.date()
@@ -0,0 +1,34 @@
+from ipaddress import ip_network
+
+import pytest
+
+from app.services import auth_service
+from app.services.auth_service import get_client_ip
+
+
+class _Request:
+    def __init__(self, peer: str, forwarded: str = ""):
+        self.client = type("Client", (), {"host": peer})()
+        self.headers = {"x-forwarded-for": forwarded} if forwarded else {}
+
+
+@pytest.fixture
+def trusted_proxy(monkeypatch):
+    monkeypatch.setattr(auth_service, "_trusted_proxies", [ip_network("10.0.0.0/8")])
+
+
+def test_forwarded_header_is_ignored_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(auth_service, "_trusted_proxies", [])
+    assert get_client_ip(_Request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+
+def test_forwarded_header_from_a_trusted_proxy(trusted_proxy):
+    assert get_client_ip(_Request("10.0.0.2", "198.51.100.1")) == "198.51.100.1"
+
+
+def test_forged_entries_left_of_the_client_are_ignored(trusted_proxy):
+    assert get_client_ip(_Request("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.3")) == "198.51.100.1"
+
+
+def test_forwarded_header_from_an_untrusted_peer(trusted_proxy):
+    assert get_client_ip(_Request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
@@ -0,0 +1,119 @@
+from datetime import datetime, time, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.archive import MetricArchiver, archive_horizon
+from app.db.partitions import add_months, month_start, retention_cutoff
+from app.db.session import SessionLocal
+from app.repositories.metrics_repositories import MetricsRepository
+
+RETAIN_MONTHS = 6
+
+
+def _month_ago(months: int) -> datetime:
+    month = add_months(month_start(datetime.now(timezone.utc)), -months)
+    return datetime.combine(month.replace(day=15), time(12), tzinfo=timezone.utc)
+
+
+def test_archive_expires_at_the_partition_retention_cutoff(database, client, auth_headers):
+    kept, expired = _month_ago(RETAIN_MONTHS - 2), _month_ago(RETAIN_MONTHS + 2)
+    assert kept < archive_horizon()
+    assert expired.date() < retention_cutoff(RETAIN_MONTHS) < kept.date()
+    response = client.post(
+        "/api/v1/metric/steps/bulk",
+        json={
+            "records": [
+                {"date_hour": moment.isoformat(), "steps": 100, "source": "apple_watch"}
+                for moment in (kept, expired)
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    user_id = client.get("/api/v1/auth/user/", headers=auth_headers).json()["id"]
+
+    MetricArchiver(interval=0, retain_months=RETAIN_MONTHS).run_once()
+
+    with database.connect() as connection:
+        days = connection.execute(
+            text(
+                "SELECT a.date_day FROM activity_steps_archive a"
+                " JOIN auth_users u ON u.user_key = a.user_key WHERE u.id = :user_id"
+            ),
+            {"user_id": user_id},
+        ).scalars().all()
+    assert days == [kept.date()]
+
+
+def _strip_timestamps(record):
+    # Archived hours carry their day's created_at/updated_at
+    return {key: value for key, value in record.items() if key not in ("created_at", "updated_at")}
+
+
+def _reads(client, headers, user_id, start):
+    """Range reads, by-id reads of every record found and the daily step series"""
+    reads = {}
+    for metric in ("steps", "heartrate"):
+        response = client.get(f"/api/v1/metric/{metric}/", params={"start_date": start.isoformat()}, headers=headers)
+        assert response.status_code == 200, response.text
+        records = [_strip_timestamps(record) for record in response.json()["records"]]
+        by_id = []
+        for record in records:
+            response = client.get(f"/api/v1/metric/{metric}/{record['id']}", headers=headers)
+            assert response.status_code == 200, response.text
+            by_id.append(_strip_timestamps(response.json()))
+        reads[metric] = (records, by_id)
+    db = SessionLocal()
+    try:
+        reads["daily steps"] = MetricsRepository(db).get_daily_series(user_id, "steps", start)
+    finally:
+        db.close()
+    return reads
+
+
+def test_reads_and_deletes_are_unchanged_across_the_archive_horizon(database, client, auth_headers):
+    archived = _month_ago(settings.METRIC_ARCHIVE_AFTER_MONTHS + 1)
+    hot = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    assert archived < archive_horizon() < hot
+    moments = (archived, archived + timedelta(hours=1), hot)
+    for metric, value in (("steps", {"steps": 100}), ("heartrate", {"heart_rate": 70, "resting_hr": 55})):
+        response = client.post(
+            f"/api/v1/metric/{metric}/bulk",
+            json={"records": [{"date_hour": moment.isoformat(), "source": "apple_watch", **value} for moment in moments]},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200, response.text
+    user_id = client.get("/api/v1/auth/user/", headers=auth_headers).json()["id"]
+    start = archived - timedelta(days=1)
+    before = _reads(client, auth_headers, user_id, start)
+    assert len(before["steps"][0]) == 3
+
+    MetricArchiver(interval=0, retain_months=RETAIN_MONTHS).run_once()
+
+    with database.connect() as connection:
+        hour_masks = connection.execute(
+            text(
+                "SELECT a.hour_mask FROM activity_steps_archive a"
+                " JOIN auth_users u ON u.user_key = a.user_key WHERE u.id = :user_id"
+            ),
+            {"user_id": user_id},
+        ).scalars().all()
+    assert hour_masks == [0b11 << archived.hour]
+    assert _reads(client, auth_headers, user_id, start) == before
+
+    # Archived hours are deleted by the same ids, one at a time
+    for record in before["steps"][0][1:]:
+        response = client.delete(f"/api/v1/metric/steps/{record['id']}", headers=auth_headers)
+        assert response.status_code == 200, response.text
+        assert client.get(f"/api/v1/metric/steps/{record['id']}", headers=auth_headers).status_code == 404
+    response = client.get("/api/v1/metric/steps/", params={"start_date": start.isoformat()}, headers=auth_headers)
+    assert [record["id"] for record in response.json()["records"]] == [before["steps"][0][0]["id"]]
+    with database.connect() as connection:
+        assert not connection.execute(
+            text(
+                "SELECT count(*) FROM activity_steps_archive a"
+                " JOIN auth_users u ON u.user_key = a.user_key WHERE u.id = :user_id"
+            ),
+            {"user_id": user_id},
+        ).scalar()
@@ -0,0 +1,8 @@
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.main import app
+
+
+def test_cors_is_outermost():
+    # Responses short-circuited by the shedding/timeout middleware still get CORS headers
+    assert app.user_middleware[0].cls is CORSMiddleware
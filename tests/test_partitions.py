@@ -0,0 +1,104 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.db import partitions
+from app.db.partitions import HOURLY_PARTITIONED_TABLES, add_months, ensure_partitions, retention_cutoff
+
+FUTURE_MONTH = date(2031, 5, 1)
+FUTURE_NOW = datetime(2031, 5, 15, 12, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "month, months, expected",
+    [
+        (date(2024, 1, 1), 0, date(2024, 1, 1)),
+        (date(2024, 11, 1), 3, date(2025, 2, 1)),
+        (date(2024, 1, 1), -1, date(2023, 12, 1)),
+        (date(2024, 3, 1), -27, date(2021, 12, 1)),
+        (date(2024, 12, 1), 1, date(2025, 1, 1)),
+    ],
+)
+def test_add_months(month, months, expected):
+    assert add_months(month, months) == expected
+
+
+def test_retention_cutoff_is_the_first_month_kept():
+    assert retention_cutoff(6, datetime(2024, 3, 15, tzinfo=timezone.utc)) == date(2023, 9, 1)
+    assert retention_cutoff(0, datetime(2024, 3, 31, 23, tzinfo=timezone.utc)) == date(2024, 3, 1)
+    assert retention_cutoff(12, datetime(2024, 1, 1, tzinfo=timezone.utc)) == date(2023, 1, 1)
+
+
+@pytest.fixture
+def transaction(database, auth_headers, client):
+    """A connection inside a transaction that is rolled back, and the key of a fresh user"""
+    user_id = client.get("/api/v1/auth/user/", headers=auth_headers).json()["id"]
+    with database.connect() as connection:
+        connection.begin()
+        user_key = connection.execute(
+            text("SELECT user_key FROM auth_users WHERE id = :id"), {"id": user_id}
+        ).scalar()
+        try:
+            yield connection, user_key
+        finally:
+            connection.rollback()
+
+
+def _insert_future_rows(connection, user_key):
+    moment = datetime(2031, 5, 20, 8, tzinfo=timezone.utc)
+    connection.execute(
+        text(
+            "INSERT INTO activity_steps (user_key, date_hour, source, steps, id) "
+            "VALUES (:user_key, :moment, 'APPLE_WATCH', 100, 'metric..steps.future')"
+        ),
+        {"user_key": user_key, "moment": moment},
+    )
+    connection.execute(
+        text(
+            "INSERT INTO body_heartrate_samples (user_key, date_hour, source, sample_count, offset_deltas, bpm_deltas) "
+            "VALUES (:user_key, :moment, 'APPLE_WATCH', 1, '{0}', '{60}')"
+        ),
+        {"user_key": user_key, "moment": moment},
+    )
+
+
+def _partition_of(connection, table, user_key):
+    return connection.execute(
+        text(f"SELECT tableoid::regclass::text FROM {table} WHERE user_key = :user_key"), {"user_key": user_key}
+    ).scalar()
+
+
+def test_ensure_partitions_moves_rows_out_of_the_default_partition(transaction):
+    connection, user_key = transaction
+    _insert_future_rows(connection, user_key)
+    assert _partition_of(connection, "activity_steps", user_key) == "activity_steps_default"
+
+    created = ensure_partitions(connection, months_ahead=1, since=FUTURE_MONTH, now=FUTURE_NOW)
+
+    months = (FUTURE_MONTH, add_months(FUTURE_MONTH, 1))
+    assert set(created) == {f"{table}_p{month:%Y%m}" for table in HOURLY_PARTITIONED_TABLES for month in months}
+    assert _partition_of(connection, "activity_steps", user_key) == "activity_steps_p203105"
+    assert _partition_of(connection, "body_heartrate_samples", user_key) == "body_heartrate_samples_p203105"
+    assert connection.execute(
+        text("SELECT steps FROM activity_steps WHERE user_key = :user_key"), {"user_key": user_key}
+    ).scalar() == 100
+    assert ensure_partitions(connection, months_ahead=1, since=FUTURE_MONTH, now=FUTURE_NOW) == []
+
+
+def test_a_failing_partition_does_not_hold_back_the_others(transaction, monkeypatch):
+    connection, user_key = transaction
+    create_partition = partitions.create_partition
+
+    def failing_for_miles(connection, table, month):
+        if table == "activity_miles":
+            connection.execute(text("SELECT 1 / 0"))
+        create_partition(connection, table, month)
+
+    monkeypatch.setattr(partitions, "create_partition", failing_for_miles)
+
+    created = ensure_partitions(connection, months_ahead=0, since=FUTURE_MONTH, now=FUTURE_NOW)
+
+    assert set(created) == {f"{table}_p203105" for table in HOURLY_PARTITIONED_TABLES if table != "activity_miles"}
+    # The transaction is still usable after the failure
+    assert connection.execute(text("SELECT 1")).scalar() == 1
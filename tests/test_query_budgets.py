@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.query_budget import QUERY_BUDGETS
+
+STEPS_BULK = "/api/v1/metric/steps/bulk"
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def steps_rows(count: int, steps=100):
+    return [
+        {
+            "date_hour": (START + timedelta(hours=hour)).isoformat(),
+            "steps": steps,
+            "source": "apple_watch",
+        }
+        for hour in range(count)
+    ]
+
+
+@pytest.fixture
+def steps_headers(client, auth_headers):
+    # A first small upload warms the per-process user key and principal caches, as in steady state
+    response = client.post(
+        STEPS_BULK,
+        json={"records": steps_rows(1)},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    return auth_headers
+
+
+@pytest.mark.query_budget(QUERY_BUDGETS[("POST", STEPS_BULK)])
+def test_steps_bulk_insert_is_one_statement(client, steps_headers):
+    response = client.post(STEPS_BULK, json={"records": steps_rows(500)}, headers=steps_headers)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total_processed"] == 500
+    assert (body["created_count"], body["updated_count"]) == (499, 1)
+
+
+def steps_by_hour(response):
+    return {record["date_hour"]: record["steps"] for record in response.json()["records"]}
+
+
+def hour_key(row):
+    return row["date_hour"].replace("+00:00", "Z")
+
+
+@pytest.mark.query_budget(QUERY_BUDGETS[("POST", STEPS_BULK)])
+def test_steps_bulk_update_keeps_values_not_sent(client, steps_headers):
+    # steps_headers stored 100 at hour 0; a null there must not overwrite it
+    rows = steps_rows(500, steps=None)
+    response = client.post(STEPS_BULK, json={"records": rows}, headers=steps_headers)
+
+    assert response.status_code == 200, response.text
+    records = steps_by_hour(response)
+    assert records[hour_key(rows[0])] == 100
+    assert records[hour_key(rows[1])] is None
+
+
+@pytest.mark.query_budget(QUERY_BUDGETS[("POST", STEPS_BULK)])
+def test_steps_bulk_update_overwrites_values_sent(client, steps_headers):
+    rows = steps_rows(500, steps=None)
+    rows[0]["steps"] = 250
+    response = client.post(STEPS_BULK, json={"records": rows}, headers=steps_headers)
+
+    assert response.status_code == 200, response.text
+    assert steps_by_hour(response)[hour_key(rows[0])] == 250
@@ -0,0 +1,158 @@
+"""
+Every MetricsRepository read is served by an index.
+
+Each read runs for a user with a day of every metric kind, and the SELECTs it
+issues are EXPLAINed with the same parameters and enable_seqscan off: on tables
+this small the planner would rightly pick sequential scans, so with them
+penalised a Seq Scan on a metric table means no index can serve the query.
+"""
+
+import random
+import re
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import partial
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import SessionLocal
+from app.repositories.metrics_repositories import DAILY_SERIES, MetricsRepository
+from benchmarks import data
+
+METRIC_TABLES = {
+    "activity_steps",
+    "activity_miles",
+    "activity_workouts",
+    "body_composition",
+    "body_heartrate",
+    "body_heartrate_samples",
+    "calories_active",
+    "calories_baseline",
+    "sleep_daily",
+}
+
+# kind -> (range read, read by id, time attribute)
+KINDS = {
+    "steps": ("get_steps_data", "get_steps_data_by_id", "date_hour"),
+    "miles": ("get_miles_data", "get_miles_data_by_id", "date_hour"),
+    "heart_rate": ("get_heart_rate_data", "get_heart_rate_record", "date_hour"),
+    "active_calories": ("get_active_calories_data", "get_active_calories_record", "date_hour"),
+    "baseline_calories": ("get_baseline_calories_data", "get_baseline_calories_record", "date_hour"),
+    "body_composition": ("get_body_composition_data", "get_body_composition_record", "date_hour"),
+    "sleep_daily": ("get_sleep_daily_data", "get_sleep_daily_record", "date_day"),
+    "workouts": ("get_workouts_data", "get_workouts_data_by_id", "date"),
+}
+
+
+@contextmanager
+def capture_statements(engine) -> Iterator[List[Tuple[str, object]]]:
+    """Collect (statement, parameters) for every SELECT issued while the block runs."""
+    statements: List[Tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def metric_table(relation: Optional[str]) -> Optional[str]:
+    """The metric table a relation belongs to, counting partitions and archives as their parent."""
+    if relation in METRIC_TABLES:
+        return relation
+    parent = re.sub(r"_(p\d{6}|default|archive)$", "", relation or "")
+    return parent if parent in METRIC_TABLES else None
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@pytest.fixture
+def metrics_user(client, auth_headers):
+    """Id of a user with one day of every metric kind, a couple of days back."""
+    rng = random.Random(0)
+    day = date.today() - timedelta(days=2)
+    for kind, route, generator in data.METRIC_KINDS:
+        response = client.post(
+            route, json={"records": generator(rng, day, source="apple_watch")}, headers=auth_headers
+        )
+        assert response.status_code == 200, f"{kind}: {response.text}"
+    return client.get("/api/v1/auth/user/", headers=auth_headers).json()["id"]
+
+
+def repository_reads(repository: MetricsRepository, user_id: str) -> List[Tuple[str, Callable[[], object]]]:
+    """(name, call) for every read query, with arguments taken from the user's own rows."""
+    reads: List[Tuple[str, Callable[[], object]]] = []
+    for kind, (range_read, by_id, time_attribute) in KINDS.items():
+        range_call = getattr(repository, range_read)
+        newest = range_call(user_id)[0]
+        end = getattr(newest, time_attribute)
+        start = end - timedelta(days=7)
+        reads += [
+            (f"{range_read} (all)", partial(range_call, user_id)),
+            (f"{range_read} (7 days)", partial(range_call, user_id, start, None)),
+            (by_id, partial(getattr(repository, by_id), user_id, newest.id)),
+        ]
+        if kind == "steps":
+            reads.append(("get_steps_total", partial(repository.get_steps_total, user_id, start, end)))
+        if kind == "heart_rate":
+            hours = [end - timedelta(hours=hour) for hour in range(3)]
+            reads += [
+                ("get_heart_rate_averages", partial(repository.get_heart_rate_averages, user_id, start, end)),
+                ("get_heart_rate_series", partial(repository.get_heart_rate_series, user_id, start, end)),
+                ("get_heart_rate_by_hours", partial(repository.get_heart_rate_by_hours, user_id, newest.source, hours)),
+                (
+                    "get_heart_rate_sample_hours",
+                    partial(repository.get_heart_rate_sample_hours, user_id, newest.source, hours),
+                ),
+                ("get_heart_rate_samples", partial(repository.get_heart_rate_samples, user_id, None, start, None)),
+            ]
+        if kind == "sleep_daily":
+            reads.append(
+                ("get_sleep_minutes_average", partial(repository.get_sleep_minutes_average, user_id, start, end))
+            )
+    month_ago = data.day_start(date.today() - timedelta(days=30))
+    reads += [
+        (f"get_daily_series ({metric})", partial(repository.get_daily_series, user_id, metric, month_ago))
+        for metric in DAILY_SERIES
+    ]
+    reads.append(("get_latest_weight_record", partial(repository.get_latest_weight_record, user_id)))
+    return reads
+
+
+def test_metric_reads_use_indexes(database, metrics_user):
+    db = SessionLocal()
+    connection = database.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # Rolled back with the transaction, before the connection returns to the pool
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        explained, seq_scans = 0, []
+        for name, call in repository_reads(MetricsRepository(db), metrics_user):
+            with capture_statements(database) as statements:
+                call()
+            for statement, parameters in statements:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = cursor.fetchone()[0][0]["Plan"]
+                explained += 1
+                seq_scans += [
+                    f"{name}: Seq Scan on {node['Relation Name']}"
+                    for node in plan_nodes(plan)
+                    if node["Node Type"] == "Seq Scan" and metric_table(node.get("Relation Name"))
+                ]
+        connection.rollback()
+    finally:
+        connection.close()
+        db.close()
+
+    assert explained
+    assert not seq_scans, "\n".join(seq_scans)
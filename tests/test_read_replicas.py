@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPLICA_URL = "postgresql+psycopg2://replica@localhost/replica"
+
+
+def _replica_routing(**env) -> bool:
+    # Routing is decided at import time, so each case needs a fresh interpreter
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.db.session as s; print(s._replica_cycle is not None)"],
+        env={**os.environ, "DATABASE_REPLICA_URLS": REPLICA_URL, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()[-1] == "True"
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="No /dev/shm for the shared cache")
+def test_replicas_route_with_the_shared_cache():
+    assert _replica_routing(SHARED_CACHE_ENABLED="true", SHARED_CACHE_DIR="/dev/shm")
+
+
+def test_replicas_are_not_routed_with_a_per_process_cache():
+    assert not _replica_routing(SHARED_CACHE_ENABLED="false")
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from app.core.rid import generate_sortable_rids, parse_rid, rid_timestamp
+
+TIMESTAMP_MS = 1_700_000_000_123
+
+
+def test_sortable_rids_parse_back():
+    for rid in generate_sortable_rids("metric", "steps", 10, timestamp_ms=TIMESTAMP_MS):
+        high_level_type, resource_type, suffix = parse_rid(rid)
+        assert (high_level_type, resource_type) == ("metric", "steps")
+        assert len(suffix) == 24
+
+
+def test_sortable_rids_ascend_within_and_across_batches():
+    first = generate_sortable_rids("metric", "steps", 50, timestamp_ms=TIMESTAMP_MS)
+    second = generate_sortable_rids("metric", "steps", 50, timestamp_ms=TIMESTAMP_MS + 1)
+
+    assert first == sorted(first)
+    assert len(set(first)) == len(first)
+    assert first[-1] < second[0]
+    assert first + second == sorted(first + second)
+
+
+def test_rid_timestamp_recovers_the_millisecond():
+    rid = generate_sortable_rids("metric", "steps", 1, timestamp_ms=TIMESTAMP_MS)[0]
+
+    assert rid_timestamp(rid) == datetime.fromtimestamp(TIMESTAMP_MS / 1000, tz=timezone.utc)
+    assert round(rid_timestamp(rid).timestamp() * 1000) == TIMESTAMP_MS
+    assert rid_timestamp("metric..steps.abc123") is None
+
+
+def test_no_rids_for_an_empty_batch():
+    assert generate_sortable_rids("metric", "steps", 0) == []
+    assert generate_sortable_rids("metric", "steps", -1) == []
@@ -0,0 +1,33 @@
+import pytest
+
+from app.core.config import settings
+from app.core.shared_cache import MarshalCodec, SharedMemoryCache, shared_cache_namespace
+
+
+def _cache(directory, namespace):
+    return SharedMemoryCache(
+        "test", slots=16, slot_size=128, codec=MarshalCodec(), directory=str(directory), namespace=namespace
+    )
+
+
+def test_namespaces_do_not_share_entries(tmp_path):
+    _cache(tmp_path, "staging").set("user", 1)
+
+    assert _cache(tmp_path, "staging").get("user") == 1
+    assert _cache(tmp_path, "production").get("user") is None
+
+
+def test_namespace_defaults_to_the_database(monkeypatch):
+    monkeypatch.setattr(settings, "SHARED_CACHE_NAMESPACE", "")
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://one")
+    first = shared_cache_namespace()
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://two")
+
+    assert shared_cache_namespace() != first
+    monkeypatch.setattr(settings, "SHARED_CACHE_NAMESPACE", "staging")
+    assert shared_cache_namespace() == "staging"
+
+
+def test_namespace_must_be_a_file_name_part(tmp_path):
+    with pytest.raises(ValueError):
+        _cache(tmp_path, "../production")
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.timeouts import EXPORT, INGEST, INTERACTIVE, classify_route
+from app.main import app
+
+
+class _Request:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.scope = {"fastapi": {}}
+        self.url = type("URL", (), {"path": path})()
+
+
+def test_route_classes():
+    assert classify_route(_Request("GET", "/api/v1/metric/steps/")) == EXPORT
+    assert classify_route(_Request("GET", "/api/v1/nutrition/macros/aggregate")) == EXPORT
+    assert classify_route(_Request("POST", "/api/v1/metric/steps/bulk")) == INGEST
+    assert classify_route(_Request("GET", "/api/v1/metric/steps/abc")) == INTERACTIVE
+
+
+async def _get_then_disconnect(path: str, headers: dict, disconnect_after: float):
+    """Send a GET straight to the ASGI app and drop the connection after disconnect_after seconds."""
+    pending = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")]
+        + [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    started = time.monotonic()
+    await app(scope, receive, send)
+    return time.monotonic() - started, sent
+
+
+def test_disconnect_cancels_running_export_query(database, client, auth_headers):
+    # Warm the principal cache so the only statement left to block is the export read
+    assert client.get("/api/v1/auth/user/", headers=auth_headers).status_code == 200
+
+    with database.connect() as blocker:
+        blocker.exec_driver_sql("LOCK TABLE activity_steps IN ACCESS EXCLUSIVE MODE")
+        elapsed, sent = asyncio.run(_get_then_disconnect("/api/v1/metric/steps/", auth_headers, 1.0))
+        # The blocked read was cancelled when the client left, while the lock was still held
+        waiting = blocker.execute(
+            text(
+                "SELECT count(*) FROM pg_stat_activity"
+                " WHERE wait_event_type = 'Lock' AND query LIKE '%activity_steps%'"
+            )
+        ).scalar()
+        blocker.rollback()
+
+    assert elapsed < settings.STATEMENT_TIMEOUT_EXPORT_MS / 1000 / 2
+    assert waiting == 0
+    # Nobody is listening any more, so nothing is sent
+    assert not [message for message in sent if message["type"] == "http.response.start"]
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.trend_service import EWMA_ALPHA, EWMA_BLOCK, ewma, extend_series
+
+FIRST_DAY = date(2024, 1, 1)
+
+
+def daily_rows(count: int, seed: int = 0):
+    """A reading on most days, with gaps, oldest first"""
+    rng = np.random.default_rng(seed)
+    days = [FIRST_DAY + timedelta(days=offset) for offset in range(count) if rng.random() > 0.2]
+    return [(day, float(value)) for day, value in zip(days, rng.normal(60, 5, len(days)))]
+
+
+def assert_same_series(actual, expected):
+    np.testing.assert_array_equal(actual.days, expected.days)
+    np.testing.assert_allclose(actual.values, expected.values)
+    for name in ("rolling", "ewma", "z_scores"):
+        np.testing.assert_allclose(getattr(actual, name), getattr(expected, name), rtol=1e-9, equal_nan=True)
+
+
+def test_ewma_matches_the_recurrence():
+    values = np.random.default_rng(1).normal(60, 5, EWMA_BLOCK * 3 + 5)
+    expected, previous = [], values[0]
+    for value in values:
+        previous = (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * value
+        expected.append(previous)
+
+    np.testing.assert_allclose(ewma(values), expected, rtol=1e-9)
+
+
+def test_ewma_continues_from_a_seed():
+    values = np.random.default_rng(2).normal(60, 5, 200)
+    full = ewma(values)
+
+    np.testing.assert_allclose(ewma(values[90:], full[89]), full[90:], rtol=1e-9)
+
+
+@pytest.mark.parametrize("step, overlap", [(1, 0), (5, 3), (30, 7), (100, 40)])
+def test_incremental_extension_matches_a_full_recompute(step, overlap):
+    rows = daily_rows(400)
+    full = extend_series(None, rows, FIRST_DAY, FIRST_DAY)
+
+    series, read_to = None, 0
+    while read_to < len(rows):
+        # Each read goes back `overlap` readings, as the resync window does
+        read_from = max(read_to - overlap, 0)
+        read_to = min(read_to + step, len(rows))
+        series = extend_series(series, rows[read_from:read_to], rows[read_from][0], FIRST_DAY)
+
+    assert_same_series(series, full)
+
+
+def test_reread_days_replace_their_old_values():
+    rows = daily_rows(120)
+    revised = rows[:-20] + [(day, value + 10) for day, value in rows[-20:]]
+
+    series = extend_series(None, rows, FIRST_DAY, FIRST_DAY)
+    series = extend_series(series, revised[-20:], revised[-20][0], FIRST_DAY)
+
+    assert_same_series(series, extend_series(None, revised, FIRST_DAY, FIRST_DAY))
+
+
+def test_trimming_history_keeps_derived_values():
+    rows = daily_rows(400)
+    history_start = FIRST_DAY + timedelta(days=200)
+    full = extend_series(None, rows, FIRST_DAY, FIRST_DAY)
+
+    trimmed = extend_series(full, rows[-10:], rows[-10][0], history_start)
+
+    kept = slice(int(np.searchsorted(full.days, history_start.toordinal())), None)
+    assert trimmed.days[0] >= history_start.toordinal()
+    np.testing.assert_allclose(trimmed.rolling, full.rolling[kept], rtol=1e-9)
+    np.testing.assert_allclose(trimmed.ewma, full.ewma[kept], rtol=1e-9)
+    np.testing.assert_allclose(trimmed.z_scores, full.z_scores[kept], rtol=1e-9, equal_nan=True)